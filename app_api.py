@@ -1,11 +1,19 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict
-import joblib
-import numpy as np
+import os
+import threading
 from datetime import datetime
 
+from src.api.compact_model import load_compact_model
+from src.api.inference import predict_texts
+from src.api.responses import build_batch_payload, fast_json_response
+
 # Initialisation
 app = FastAPI(
     title="YouTube Sentiment Analysis API",
@@ -23,8 +31,52 @@ app.add_middleware(
 )
 
 # Chargement du modèle
-model = joblib.load("models/sentiment_model.joblib")
-vectorizer = joblib.load("models/vectorizer.joblib")
+# MODEL_FORMAT=compact : artefact .npy de src/models/export_model.py, sans scikit-learn
+# MODEL_MMAP=1 : tableaux NumPy mappés en mémoire, partagés entre workers
+# MODEL_LOADING=background : le port est ouvert tout de suite et le modèle chargé
+#   dans un thread (/health répond "loading" puis "ready") ; eager : chargé à l'import
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "joblib")
+MMAP_MODE = "r" if os.getenv("MODEL_MMAP", "0") == "1" else None
+MODEL_LOADING = os.getenv("MODEL_LOADING", "background")
+
+model = None
+vectorizer = None
+load_error = None
+startup_timings = {}
+
+
+def load_artifacts():
+    """Charge modèle et vectoriseur (joblib, et donc scikit-learn, importés ici seulement)."""
+    global model, vectorizer
+    start = time.perf_counter()
+    if MODEL_FORMAT == "compact":
+        loaded_model, loaded_vectorizer = load_compact_model("models/compact")
+    else:
+        import joblib
+        loaded_model = joblib.load("models/sentiment_model.joblib", mmap_mode=MMAP_MODE)
+        loaded_vectorizer = joblib.load("models/vectorizer.joblib", mmap_mode=MMAP_MODE)
+    # Échauffement : la première vraie requête ne paie pas les initialisations paresseuses
+    predict_texts(loaded_model, loaded_vectorizer, ["warmup"])
+    startup_timings["model_load_seconds"] = round(time.perf_counter() - start, 3)
+    model, vectorizer = loaded_model, loaded_vectorizer
+    print(f"Modèle chargé en {startup_timings['model_load_seconds']} s "
+          f"({startup_timings['model_load_seconds'] + startup_timings['import_seconds']:.3f} s "
+          f"depuis le début de l'import)")
+
+
+def load_artifacts_background():
+    global load_error
+    try:
+        load_artifacts()
+    except Exception as e:
+        load_error = f"{type(e).__name__}: {e}"
+        print(f"Échec du chargement du modèle : {load_error}")
+
+
+def model_status() -> str:
+    if model is not None and vectorizer is not None:
+        return "ready"
+    return "error" if load_error is not None else "loading"
 
 # Modèles Pydantic
 class CommentBatch(BaseModel):
@@ -41,9 +93,12 @@ class BatchPredictionResponse(BaseModel):
     statistics: Dict
     timestamp: str
 
-def label_to_sentiment(label: int) -> str:
-    mapping = {-1: "negative", 0: "neutral", 1: "positive"}
-    return mapping.get(label, "unknown")
+@app.on_event("startup")
+async def start_model_loading():
+    print(f"Import de l'application : {startup_timings['import_seconds']} s")
+    # Modèle déjà présent : mode eager ou chargé par le maître pre-fork (src/api/serve.py)
+    if model is None or vectorizer is None:
+        threading.Thread(target=load_artifacts_background, name="model-loader", daemon=True).start()
 
 @app.get("/")
 async def root():
@@ -55,60 +110,46 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {
-        "status": "healthy",
-        "model_loaded": True,
+    status = model_status()
+    body = {
+        "status": status,
+        "model_loaded": status == "ready",
+        "error": load_error,
+        "startup": startup_timings,
         "timestamp": datetime.now().isoformat()
     }
+    # 503 tant que le modèle n'est pas prêt : les sondes de disponibilité attendent
+    return JSONResponse(body, status_code=200 if status == "ready" else 503)
 
 @app.post("/predict_batch", response_model=BatchPredictionResponse)
 async def predict_batch(batch: CommentBatch):
+    if model is None or vectorizer is None:
+        if load_error is not None:
+            raise HTTPException(status_code=503, detail=f"Échec du chargement du modèle : {load_error}")
+        raise HTTPException(status_code=503, detail="Modèle en cours de chargement",
+                            headers={"Retry-After": "5"})
+
     try:
         valid_comments = [c.strip() for c in batch.comments if c.strip()]
         
         if not valid_comments:
             raise HTTPException(status_code=400, detail="Aucun commentaire valide")
         
-        X = vectorizer.transform(valid_comments)
-        predictions = model.predict(X)
-        probabilities = model.predict_proba(X)
-        
-        results = []
-        for text, pred, proba in zip(valid_comments, predictions, probabilities):
-            results.append(SentimentPrediction(
-                text=text[:200],
-                sentiment=label_to_sentiment(int(pred)),
-                sentiment_score=int(pred),
-                confidence=round(float(np.max(proba)), 4)
-            ))
+        predictions, confidences = predict_texts(model, vectorizer, valid_comments)
         
-        sentiment_counts = {
-            "positive": int(np.sum(predictions == 1)),
-            "neutral": int(np.sum(predictions == 0)),
-            "negative": int(np.sum(predictions == -1))
-        }
-        
-        total = len(predictions)
-        sentiment_percentages = {
-            "positive": round(sentiment_counts["positive"] / total * 100, 2),
-            "neutral": round(sentiment_counts["neutral"] / total * 100, 2),
-            "negative": round(sentiment_counts["negative"] / total * 100, 2)
-        }
-        
-        statistics = {
-            "total_comments": total,
-            "sentiment_counts": sentiment_counts,
-            "sentiment_percentages": sentiment_percentages,
-            "average_confidence": round(float(np.mean([r.confidence for r in results])), 4)
-        }
-        
-        return BatchPredictionResponse(
-            predictions=results,
-            statistics=statistics,
-            timestamp=datetime.now().isoformat()
-        )
+        response = fast_json_response(build_batch_payload(valid_comments, predictions, confidences))
+        if "first_prediction_seconds" not in startup_timings:
+            # Depuis le début de l'import : démarrage à froid complet vu par le premier client
+            startup_timings["first_prediction_seconds"] = round(time.perf_counter() - _IMPORT_START, 3)
+            print(f"Première prédiction {startup_timings['first_prediction_seconds']} s après l'import")
+        return response
         
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
+
+# Fin de l'import ; en mode eager, le modèle est chargé ici, avant l'ouverture du port
+startup_timings["import_seconds"] = round(time.perf_counter() - _IMPORT_START, 3)
+if MODEL_LOADING == "eager":
+    load_artifacts()
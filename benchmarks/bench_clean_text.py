@@ -0,0 +1,82 @@
+"""
+Débit du nettoyage de texte (lignes/s) sur le dataset Reddit brut :
+- avant : df[col].apply(clean_text) avec re.sub(motif chaîne) à chaque appel
+- clean_text avec motifs précompilés, appliqué ligne par ligne
+- clean_series : nettoyage de colonne (passes fusionnées)
+
+Vérifie aussi que les trois sorties sont identiques.
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_clean_text.py --input data/raw/reddit.csv
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "data"))
+
+from preprocess_data import clean_series, clean_text  # noqa: E402
+
+
+def clean_text_baseline(text):
+    """Implémentation d'origine de clean_text (référence « avant »)"""
+    if pd.isna(text):
+        return ""
+    text = str(text)
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#', '', text)
+    text = re.sub(r'[^\w\s.,!?\'-]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    text = text.lower()
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du nettoyage de texte")
+    parser.add_argument("--input", default="data/raw/reddit.csv")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    column = df['clean_comment' if 'clean_comment' in df.columns else 'comment']
+    print(f" {len(column)} lignes ({args.input})")
+
+    candidates = {
+        "apply(clean_text) d'origine": lambda: column.apply(clean_text_baseline),
+        "apply(clean_text) précompilé": lambda: column.apply(clean_text),
+        "clean_series": lambda: clean_series(column),
+    }
+
+    reference = candidates["apply(clean_text) d'origine"]()
+    results = []
+    for name, run in candidates.items():
+        identical = run().tolist() == reference.tolist()
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        results.append({"method": name, "seconds": round(best, 4),
+                        "rows_per_second": round(len(column) / best), "identical": identical})
+
+    baseline = results[0]["seconds"]
+    print(f"\n{'Méthode':<32}{'Temps (s)':>11}{'Lignes/s':>12}{'Gain':>8}{'Identique':>11}")
+    print("=" * 74)
+    for r in results:
+        print(f"{r['method']:<32}{r['seconds']:>11.3f}{r['rows_per_second']:>12}"
+              f"{baseline / r['seconds']:>7.2f}x{str(r['identical']):>11}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare le featuriseur à vocabulaire (TfidfVectorizer) et le hashing trick
+(HashingVectorizer + TfidfTransformer) : temps de fit, débit de transform,
+taille de l'artefact joblib et F1 pondéré sur le même split.
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_featurizers.py --bits 16 18 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.train_model import build_vectorizer, load_data, split_data  # noqa: E402
+
+
+def artifact_size(obj) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "artifact.joblib")
+        joblib.dump(obj, path)
+        return os.path.getsize(path)
+
+
+def bench(name, vectorizer, X_train, X_test, y_train, y_test, repeats):
+    start = time.perf_counter()
+    X_train_vec = vectorizer.fit_transform(X_train)
+    fit_time = time.perf_counter() - start
+
+    transform_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        X_test_vec = vectorizer.transform(X_test)
+        transform_times.append(time.perf_counter() - start)
+    transform_time = min(transform_times)
+
+    # Même classifieur que train_model(optimize=False) : seule la featurisation change
+    model = LogisticRegression(C=1.0, solver='liblinear', max_iter=500, random_state=42,
+                               class_weight='balanced')
+    model.fit(X_train_vec, y_train)
+    f1 = f1_score(y_test, model.predict(X_test_vec), average='weighted')
+
+    return {
+        "featurizer": name,
+        "n_features": int(X_train_vec.shape[1]),
+        "fit_seconds": round(fit_time, 4),
+        "transform_docs_per_second": round(len(X_test) / transform_time, 1),
+        "vectorizer_bytes": artifact_size(vectorizer),
+        "model_bytes": artifact_size(model),
+        "f1_weighted": round(f1, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vocabulaire TF-IDF vs hashing trick")
+    parser.add_argument("--data", default="data/processed/reddit_clean.parquet")
+    parser.add_argument("--bits", type=int, nargs="+", default=[16, 18, 20])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    df = load_data(args.data)
+    X_train, X_test, y_train, y_test = split_data(df)
+
+    configs = [("tfidf", build_vectorizer('tfidf'))]
+    configs += [(f"hashing-{b}", build_vectorizer('hashing', n_features_bits=b)) for b in args.bits]
+
+    results = []
+    for name, vectorizer in configs:
+        print(f"\n⏱️  {name}...")
+        results.append(bench(name, vectorizer, X_train, X_test, y_train, y_test, args.repeats))
+
+    print(f"\n{'Featuriseur':<14}{'Features':>10}{'Fit (s)':>10}{'Docs/s':>12}"
+          f"{'Vect. (Ko)':>12}{'Modèle (Ko)':>13}{'F1':>8}")
+    print("=" * 79)
+    for r in results:
+        print(f"{r['featurizer']:<14}{r['n_features']:>10}{r['fit_seconds']:>10.2f}"
+              f"{r['transform_docs_per_second']:>12.0f}{r['vectorizer_bytes'] / 1024:>12.1f}"
+              f"{r['model_bytes'] / 1024:>13.1f}{r['f1_weighted']:>8.4f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
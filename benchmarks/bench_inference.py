@@ -0,0 +1,145 @@
+"""
+Suite de benchmark de l'inférence de bout en bout (nettoyage → vectorisation →
+prédiction + confiances → réponse JSON), par taille de batch et longueur de texte.
+
+Chaque cas est mesuré après échauffement, sur des exécutions répétées, avec
+percentiles (p50/p90/p99) et détail par étape. Le résultat JSON contient les
+métadonnées (commit, versions) pour comparer deux commits :
+
+    python benchmarks/bench_inference.py --output bench_before.json
+    git checkout <autre commit>
+    python benchmarks/bench_inference.py --output bench_after.json --compare bench_before.json
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_inference.py --backend joblib --batch-sizes 1 10 100 1000 10000
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.inference_benchmark import STAGES, make_batch, measure_latency  # noqa: E402
+
+# Tranches de longueur (caractères du texte brut)
+LENGTH_BUCKETS = {"short": (0, 60), "medium": (60, 250), "long": (250, None)}
+
+
+def load_backend(backend):
+    if backend == "compact":
+        from src.api.compact_model import load_compact_model
+        return load_compact_model("models/compact")
+    import joblib
+    return joblib.load("models/sentiment_model.joblib"), joblib.load("models/vectorizer.joblib")
+
+
+def texts_by_length(path):
+    df = pd.read_csv(path)
+    texts = df["clean_comment" if "clean_comment" in df.columns else "comment"].dropna().astype(str)
+    lengths = texts.str.len()
+    buckets = {}
+    for name, (low, high) in LENGTH_BUCKETS.items():
+        mask = (lengths >= low) & (lengths < high) if high else lengths >= low
+        if mask.any():
+            buckets[name] = texts[mask].tolist()
+    buckets["mixed"] = texts.tolist()
+    return buckets
+
+
+def metadata(backend):
+    import sklearn
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "backend": backend,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Ratio des p50 par rapport à un fichier de résultats précédent (> 1 : plus lent)"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(c["lengths"], c["batch_size"]): c for c in baseline["cases"]}
+
+    print(f"\n📊 Comparaison avec {baseline_path} (commit {baseline['metadata'].get('commit')})")
+    print(f"{'Longueurs':<10}{'Batch':>7}{'p50 avant':>12}{'p50 après':>12}{'Ratio':>9}")
+    print("=" * 50)
+    for case in results["cases"]:
+        before = previous.get((case["lengths"], case["batch_size"]))
+        if before is None:
+            continue
+        ratio = case["p50_ms"] / before["p50_ms"]
+        flag = "  ⚠️" if ratio > 1.10 else ""
+        print(f"{case['lengths']:<10}{case['batch_size']:>7}{before['p50_ms']:>12.3f}"
+              f"{case['p50_ms']:>12.3f}{ratio:>8.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark d'inférence de bout en bout")
+    parser.add_argument("--data", default="data/raw/reddit.csv", help="Commentaires bruts")
+    parser.add_argument("--backend", choices=["joblib", "compact"], default="joblib")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--lengths", nargs="+", default=["short", "medium", "long", "mixed"],
+                        choices=list(LENGTH_BUCKETS) + ["mixed"])
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--min-seconds", type=float, default=0.5,
+                        help="Durée minimale de mesure par cas (petits batchs)")
+    parser.add_argument("--output", help="Fichier JSON de sortie")
+    parser.add_argument("--compare", help="Résultats JSON d'un autre commit à comparer")
+    args = parser.parse_args()
+
+    model, vectorizer = load_backend(args.backend)
+    buckets = texts_by_length(args.data)
+
+    results = {"metadata": metadata(args.backend), "cases": []}
+    print(f"\n{'Longueurs':<10}{'Batch':>7}{'Runs':>6}{'p50 (ms)':>10}{'p90 (ms)':>10}"
+          f"{'p99 (ms)':>10}{'Comm./s':>10}  " + " / ".join(STAGES) + " (p50, ms)")
+    print("=" * 110)
+    for lengths in args.lengths:
+        if lengths not in buckets:
+            continue
+        for batch_size in args.batch_sizes:
+            batch = make_batch(buckets[lengths], batch_size)
+            stats = measure_latency(model, vectorizer, batch, warmup=args.warmup,
+                                    repeats=args.repeats, min_seconds=args.min_seconds)
+            stats["lengths"] = lengths
+            stats["mean_text_length"] = round(float(np.mean([len(t) for t in batch])), 1)
+            results["cases"].append(stats)
+
+            stages = " / ".join(f"{stats['stages'][s]['p50_ms']:.2f}" for s in STAGES)
+            print(f"{lengths:<10}{batch_size:>7}{stats['runs']:>6}{stats['p50_ms']:>10.2f}"
+                  f"{stats['p90_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                  f"{stats['comments_per_second']:>10.0f}  {stages}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Passage à l'échelle du prétraitement par blocs : débit (lignes/s) et pic de
+mémoire selon le nombre de processus, sur le dataset brut répliqué N fois.
+
+Chaque configuration tourne dans un sous-processus séparé pour que les pics de
+mémoire (ru_maxrss du maître et du plus gros worker) soient mesurés isolément.
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_preprocess.py --scale 10 --workers 1 2 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+RUNNER = """
+import json, resource, sys, time
+sys.path.insert(0, {data_dir!r})
+from preprocess_data import preprocess_dataset, preprocess_dataset_chunked
+start = time.perf_counter()
+if {workers} == 0:
+    rows = len(preprocess_dataset({input!r}, {output!r}))
+else:
+    rows = preprocess_dataset_chunked({input!r}, {output!r}, chunksize={chunksize},
+                                      workers={workers})["rows_written"]
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rows": rows,
+                  "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "worker_peak_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024}}))
+"""
+
+
+def run(input_path, output_path, workers, chunksize):
+    code = RUNNER.format(data_dir=os.path.join(PROJECT_ROOT, "src", "data"),
+                         input=input_path, output=output_path,
+                         workers=workers, chunksize=chunksize)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du prétraitement par blocs")
+    parser.add_argument("--input", default="data/raw/reddit.csv")
+    parser.add_argument("--scale", type=int, default=10, help="Réplications du dataset")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    print(f" Cœurs disponibles : {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        big_input = os.path.join(tmp, "raw.csv")
+        raw = pd.read_csv(args.input)
+        for i in range(args.scale):
+            raw.to_csv(big_input, mode="a", header=(i == 0), index=False)
+        n_rows = len(raw) * args.scale
+        print(f" {n_rows} lignes ({args.input} x{args.scale})")
+
+        results = []
+        # workers=0 : preprocess_dataset en mémoire (référence)
+        for workers in [0] + args.workers:
+            stats = run(big_input, os.path.join(tmp, f"out_{workers}.csv"),
+                        workers, args.chunksize)
+            results.append({"mode": "en mémoire" if workers == 0 else f"{workers} processus",
+                            "workers": workers,
+                            "seconds": round(stats["seconds"], 3),
+                            "rows_per_second": round(n_rows / stats["seconds"]),
+                            "peak_mb": round(stats["peak_mb"], 1),
+                            "worker_peak_mb": round(stats["worker_peak_mb"], 1)})
+
+    single = next((r for r in results if r["workers"] == 1), results[0])
+    print(f"\n{'Mode':<16}{'Temps (s)':>11}{'Lignes/s':>12}{'Gain':>8}{'Pic (Mo)':>11}{'Pic worker':>12}")
+    print("=" * 70)
+    for r in results:
+        print(f"{r['mode']:<16}{r['seconds']:>11.2f}{r['rows_per_second']:>12}"
+              f"{single['seconds'] / r['seconds']:>7.2f}x{r['peak_mb']:>11.1f}"
+              f"{r['worker_peak_mb']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
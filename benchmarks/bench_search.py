@@ -0,0 +1,85 @@
+"""
+Compare les modes de recherche d'hyperparamètres de train_model sur la même
+matrice TF-IDF : temps, nombre de fits, meilleur F1 en validation croisée,
+F1 pondéré du meilleur modèle sur le test set.
+
+Pour le mode 'path', le chemin de C est aussi rejoué à froid (warm_start=False)
+pour comparer itérations et temps par valeur de C.
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_search.py --searches grid halving path
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from sklearn.metrics import f1_score
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.feature_cache import cached_fit_transform, cached_transform  # noqa: E402
+from src.models.regularization_path import WarmStartPath  # noqa: E402
+from src.models.train_model import (  # noqa: E402
+    PATH_CS, build_vectorizer, load_data, search_hyperparameters, split_data,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des modes de recherche")
+    parser.add_argument("--data", default="data/processed/reddit_clean.parquet")
+    parser.add_argument("--searches", nargs="+", default=["grid", "halving", "path"])
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--feature-cache-dir", default="data/cache/features")
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = split_data(load_data(args.data))
+    vectorizer, X_train_vec = cached_fit_transform(build_vectorizer(), X_train,
+                                                   args.feature_cache_dir)
+    X_test_vec = cached_transform(vectorizer, X_test, args.feature_cache_dir)
+
+    results = []
+    for search in args.searches:
+        print(f"\n🎯 Recherche '{search}'...")
+        searcher, report = search_hyperparameters(X_train_vec, y_train, search=search,
+                                                  n_jobs=args.n_jobs, verbose=0)
+        y_pred = searcher.best_estimator_.predict(X_test_vec)
+        report["test_f1"] = round(f1_score(y_test, y_pred, average="weighted"), 4)
+        results.append(report)
+
+    grid = next((r for r in results if r["search"] == "grid"), results[0])
+    print(f"\n{'Recherche':<11}{'Temps (s)':>11}{'Gain':>8}{'Fits':>7}{'F1 CV':>9}{'F1 test':>9}"
+          "  Meilleurs paramètres")
+    print("=" * 100)
+    for r in results:
+        print(f"{r['search']:<11}{r['seconds']:>11.1f}{grid['seconds'] / r['seconds']:>7.1f}x"
+              f"{r['n_fits']:>7}{r['best_cv_f1']:>9.4f}{r['test_f1']:>9.4f}  {r['best_params']}")
+
+    warm = next((r for r in results if r["search"] == "path"), None)
+    if warm is not None:
+        print("\n⏱️  Chemin de C à chaud vs à froid (itérations et temps cumulés sur les folds)...")
+        cold = WarmStartPath(Cs=PATH_CS, warm_start=False, n_jobs=args.n_jobs)
+        cold.fit(X_train_vec, y_train)
+        warm["cold_path"] = cold.path_
+
+        print(f"\n{'C':>8}{'Itér. chaud':>13}{'Itér. froid':>13}{'Temps chaud':>13}{'Temps froid':>13}")
+        print("=" * 60)
+        for w, c in zip(warm["path"], cold.path_):
+            print(f"{w['C']:>8}{w['n_iter']:>13}{c['n_iter']:>13}{w['seconds']:>12.2f}s{c['seconds']:>12.2f}s")
+        print(f"{'Total':>8}{sum(w['n_iter'] for w in warm['path']):>13}"
+              f"{sum(c['n_iter'] for c in cold.path_):>13}"
+              f"{sum(w['seconds'] for w in warm['path']):>12.2f}s"
+              f"{sum(c['seconds'] for c in cold.path_):>12.2f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
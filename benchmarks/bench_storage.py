@@ -0,0 +1,112 @@
+"""
+Compare le chargement du dataset prétraité en CSV, Parquet et Arrow IPC
+(avec et sans mémoire mappée) : taille du fichier, temps de chargement et
+RSS du processus, au dataset répliqué 1x, 10x et 100x.
+
+Chaque chargement tourne dans un sous-processus neuf : le RSS mesuré (pic et
+final, moins le RSS après imports) ne dépend pas des essais précédents. Chaque
+réplique reçoit un suffixe pour que les textes restent distincts (pyarrow
+dédoublonne les chaînes identiques à la conversion en pandas).
+
+Usage (depuis la racine du projet) :
+    python benchmarks/bench_storage.py --scales 1 10 100
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from src.data.storage import load_dataset, save_dataset  # noqa: E402
+
+FORMATS = [
+    ("csv", ".csv", False),
+    ("parquet", ".parquet", False),
+    ("arrow", ".arrow", False),
+    ("arrow (mmap)", ".arrow", True),
+]
+
+RUNNER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+from src.data.storage import load_dataset
+
+def status_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+baseline = status_mb("VmRSS")
+start = time.perf_counter()
+df = load_dataset({path!r}, memory_map={memory_map})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rows": len(df),
+                  "rss_mb": status_mb("VmRSS") - baseline,
+                  "peak_mb": status_mb("VmHWM") - baseline}}))
+"""
+
+
+def measure(path, memory_map):
+    code = RUNNER.format(root=PROJECT_ROOT, path=path, memory_map=memory_map)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des formats de stockage")
+    parser.add_argument("--data", default="data/processed/reddit_clean.parquet")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    base = load_dataset(args.data)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            df = pd.concat([base] + [base.assign(text=base["text"] + f" {i}")
+                                     for i in range(1, scale)], ignore_index=True)
+            paths = {}
+            for _, extension, _ in FORMATS:
+                if extension not in paths:
+                    paths[extension] = save_dataset(df, os.path.join(tmp, f"data{extension}"))
+            del df
+
+            for name, extension, memory_map in FORMATS:
+                runs = [measure(paths[extension], memory_map) for _ in range(args.repeat)]
+                best = min(runs, key=lambda r: r["seconds"])
+                results.append({
+                    "scale": scale, "format": name, "rows": best["rows"],
+                    "file_mb": round(os.path.getsize(paths[extension]) / 1024 ** 2, 1),
+                    "seconds": round(best["seconds"], 3),
+                    "rss_mb": round(best["rss_mb"], 1),
+                    "peak_mb": round(best["peak_mb"], 1),
+                })
+            for path in paths.values():
+                os.remove(path)
+
+    print(f"\n{'Échelle':<9}{'Format':<15}{'Lignes':>10}{'Fichier (Mo)':>14}"
+          f"{'Temps (s)':>11}{'RSS (Mo)':>10}{'Pic (Mo)':>10}")
+    print("=" * 79)
+    for r in results:
+        print(f"{str(r['scale']) + 'x':<9}{r['format']:<15}{r['rows']:>10}{r['file_mb']:>14.1f}"
+              f"{r['seconds']:>11.3f}{r['rss_mb']:>10.1f}{r['peak_mb']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Test de charge HTTP hors ligne de l'API (src.api.main:app ou app_api:app).
+
+Le serveur uvicorn est démarré localement, soit dans un thread du processus
+courant (--server thread), soit dans un sous-processus (--server process, qui
+évite que le client et le serveur se partagent le GIL), soit pas du tout si
+--url pointe vers un serveur déjà lancé. Des threads clients envoient ensuite
+des requêtes /predict_batch pendant --duration secondes, avec une taille de
+batch tirée selon --batch-sizes (taille:poids).
+
+Rapport : débit (requêtes/s, commentaires/s), latences p50/p95/p99/max, taux
+d'erreur par code HTTP. --stub-model remplace le modèle par un modèle linéaire
+factice : aucun fichier de modèle n'est nécessaire et le coût mesuré est celui
+du service lui-même.
+
+Usage (depuis la racine du projet) :
+    python benchmarks/load_test.py --app src.api.main:app --concurrency 16 --duration 30
+    python benchmarks/load_test.py --app app_api:app --stub-model --batch-sizes 1:0.7 100:0.3
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+import numpy as np
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+WORDS = ("great video love this amazing content best channel bad hate worst boring "
+         "terrible awful okay watch today posted nice tutorial music").split()
+
+
+# ==============================
+# Stub Model
+# ==============================
+
+class StubVectorizer:
+    """Features triviales (longueur, '!' , biais) : coût de vectorisation négligeable."""
+
+    def transform(self, texts):
+        return np.array([[len(t) / 100.0, t.count("!"), 1.0] for t in texts])
+
+
+class StubModel:
+    """Modèle linéaire à 3 classes compatible avec src.api.inference (decision_function)."""
+
+    classes_ = np.array([-1, 0, 1])
+    multi_class = "multinomial"
+    coef_ = np.array([[-1.0, -0.5, 0.2], [0.0, 0.0, 0.5], [1.0, 0.5, 0.1]])
+    intercept_ = np.zeros(3)
+
+    def decision_function(self, X):
+        return np.asarray(X) @ self.coef_.T + self.intercept_
+
+    def predict(self, X):
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
+
+
+def _stub_load(path, *args, **kwargs):
+    return StubVectorizer() if "vectorizer" in os.path.basename(str(path)) else StubModel()
+
+
+def import_app(target, stub_model=False):
+    """Importe `module:app` ; avec stub_model, aucun fichier de modèle n'est lu."""
+    module_name, _, attribute = target.partition(":")
+    if not stub_model:
+        module = importlib.import_module(module_name)
+    else:
+        # Selon l'application et le mode, le modèle est chargé à l'import ou au
+        # démarrage : on intercepte les deux chargements
+        with mock.patch("joblib.load", _stub_load), \
+                mock.patch("src.api.compact_model.load_compact_model",
+                           lambda *a, **k: (StubModel(), StubVectorizer())):
+            module = importlib.import_module(module_name)
+        if hasattr(module, "registry"):
+            from src.api.registry import ModelBundle
+            module.registry.current = ModelBundle(StubModel(), StubVectorizer(), "stub", time.time())
+        else:
+            module.model, module.vectorizer = StubModel(), StubVectorizer()
+    return getattr(module, attribute or "app")
+
+
+# ==============================
+# Server
+# ==============================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_thread_server(app, port):
+    import uvicorn
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    def stop():
+        server.should_exit = True
+        thread.join(timeout=10)
+    return stop
+
+
+def start_process_server(app_target, port, stub_model):
+    command = [sys.executable, os.path.abspath(__file__), "--serve", "--app", app_target,
+               "--port", str(port)]
+    if stub_model:
+        command.append("--stub-model")
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT)
+
+    def stop():
+        process.terminate()
+        process.wait(timeout=10)
+    return stop
+
+
+def wait_until_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Le serveur {base_url} n'est pas prêt après {timeout} s")
+
+
+# ==============================
+# Load Generation
+# ==============================
+
+def parse_distribution(items):
+    """["1:0.5", "100:0.5"] → ([1, 100], [0.5, 0.5])"""
+    sizes, weights = [], []
+    for item in items:
+        size, _, weight = item.partition(":")
+        sizes.append(int(size))
+        weights.append(float(weight or 1))
+    return sizes, weights
+
+
+def load_corpus(path):
+    if path and os.path.exists(path):
+        import pandas as pd
+        df = pd.read_csv(path)
+        column = "clean_comment" if "clean_comment" in df.columns else "comment"
+        texts = df[column].dropna().astype(str)
+        return texts[texts.str.strip().astype(bool)].tolist()
+    rng = random.Random(0)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(3, 40))) for _ in range(5000)]
+
+
+def client_worker(base_url, corpus, sizes, weights, deadline, results, seed, timeout):
+    rng = random.Random(seed)
+    session = requests.Session()
+    while time.monotonic() < deadline:
+        batch_size = rng.choices(sizes, weights)[0]
+        payload = {"comments": rng.choices(corpus, k=batch_size)}
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/predict_batch", json=payload, timeout=timeout)
+            status = response.status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        results.append((time.perf_counter() - start, status, batch_size))
+
+
+def run_load(base_url, corpus, sizes, weights, concurrency, duration, timeout=30):
+    results = []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=client_worker,
+                         args=(base_url, corpus, sizes, weights, deadline, results, i, timeout))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    latencies_ms = np.array([r[0] for r in results]) * 1000
+    statuses = Counter(str(r[1]) for r in results)
+    ok = [r for r in results if r[1] == 200]
+    total = len(results)
+    report = {
+        "requests": total,
+        "elapsed_seconds": round(elapsed, 2),
+        "requests_per_second": round(total / elapsed, 1),
+        "comments_per_second": round(sum(r[2] for r in ok) / elapsed, 1),
+        "error_rate": round(1 - len(ok) / total, 4) if total else 0.0,
+        "status_codes": dict(statuses),
+    }
+    if total:
+        for p in (50, 95, 99):
+            report[f"p{p}_ms"] = round(float(np.percentile(latencies_ms, p)), 2)
+        report["max_ms"] = round(float(latencies_ms.max()), 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge hors ligne de l'API")
+    parser.add_argument("--app", default="src.api.main:app", help="module:app à servir")
+    parser.add_argument("--url", help="Serveur déjà lancé (aucun serveur local démarré)")
+    parser.add_argument("--server", choices=["thread", "process"], default="process")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--stub-model", action="store_true",
+                        help="Modèle factice : aucun fichier de modèle requis")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0, help="Secondes non comptées")
+    parser.add_argument("--batch-sizes", nargs="+", default=["1:0.5", "10:0.3", "100:0.2"],
+                        help="Distribution des tailles de batch (taille:poids)")
+    parser.add_argument("--data", default="data/raw/reddit.csv",
+                        help="Commentaires envoyés (textes synthétiques si absent)")
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        # Mode interne de --server process : sert l'application jusqu'à SIGTERM
+        import uvicorn
+        uvicorn.run(import_app(args.app, args.stub_model), host="127.0.0.1",
+                    port=args.port, log_level="warning")
+        return
+
+    stop = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        port = args.port or free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        if args.server == "thread":
+            stop = start_thread_server(import_app(args.app, args.stub_model), port)
+        else:
+            stop = start_process_server(args.app, port, args.stub_model)
+
+    try:
+        wait_until_ready(base_url)
+        corpus = load_corpus(args.data)
+        sizes, weights = parse_distribution(args.batch_sizes)
+        print(f"🚀 {base_url} : {args.concurrency} clients, {args.duration:.0f} s, "
+              f"batchs {dict(zip(sizes, weights))}{' (modèle factice)' if args.stub_model else ''}")
+
+        if args.warmup > 0:
+            run_load(base_url, corpus, sizes, weights, args.concurrency, args.warmup)
+        results, elapsed = run_load(base_url, corpus, sizes, weights,
+                                    args.concurrency, args.duration)
+    finally:
+        if stop is not None:
+            stop()
+
+    report = summarize(results, elapsed)
+    report["config"] = {"app": args.app, "url": args.url, "server": args.server,
+                        "stub_model": args.stub_model, "concurrency": args.concurrency,
+                        "batch_sizes": dict(zip(sizes, weights))}
+
+    print(f"\n✅ {report['requests']} requêtes en {report['elapsed_seconds']} s")
+    print(f"   Débit      : {report['requests_per_second']} requêtes/s, "
+          f"{report['comments_per_second']} commentaires/s")
+    if report["requests"]:
+        print(f"   Latence    : p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, "
+              f"p99 {report['p99_ms']} ms, max {report['max_ms']} ms")
+    print(f"   Erreurs    : {report['error_rate'] * 100:.2f}% {report['status_codes']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
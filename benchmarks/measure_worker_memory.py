@@ -0,0 +1,147 @@
+"""
+Mesure la mémoire par worker : `uvicorn --workers N` (chaque worker charge son
+propre modèle) contre le mode pre-fork de src/api/serve.py (modèle chargé une
+fois dans le maître, partagé en copy-on-write), avec ou sans MODEL_MMAP=1.
+
+RSS compte les pages partagées dans chaque worker ; PSS les répartit entre les
+processus qui les partagent et USS ne compte que les pages privées. C'est la
+somme des PSS qui reflète la mémoire physique réellement consommée.
+
+Usage (Linux, depuis la racine du projet) :
+    python benchmarks/measure_worker_memory.py --app app_api:app --workers 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+# ==============================
+# /proc helpers
+# ==============================
+
+def children_of(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def cmdline(pid: int) -> str:
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        return f.read().replace(b"\x00", b" ").decode(errors="replace").strip()
+
+
+def memory_kb(pid: int) -> dict:
+    """RSS / PSS / USS en kB depuis /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss_kb": values.get("Rss", 0),
+        "pss_kb": values.get("Pss", 0),
+        "uss_kb": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+# ==============================
+# Scenarios
+# ==============================
+
+def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Le serveur {url} n'a pas démarré en {timeout}s")
+
+
+def measure(name: str, command, env_extra: dict, port: int, warmup_requests: int) -> dict:
+    env = dict(os.environ, **env_extra)
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(url)
+        # Chaque worker doit avoir servi des requêtes (pages touchées, caches remplis)
+        payload = {"comments": ["great video, loved it", "worst video ever", "posted today"] * 20}
+        for _ in range(warmup_requests):
+            requests.post(f"{url}/predict_batch", json=payload, timeout=30).raise_for_status()
+        time.sleep(0.5)
+
+        workers = [pid for pid in children_of(process.pid)
+                   if "resource_tracker" not in cmdline(pid)]
+        per_worker = [dict(pid=pid, **memory_kb(pid)) for pid in workers]
+        master = memory_kb(process.pid)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    total_pss = master["pss_kb"] + sum(w["pss_kb"] for w in per_worker)
+    return {
+        "scenario": name,
+        "master": master,
+        "workers": per_worker,
+        "avg_worker_rss_kb": round(sum(w["rss_kb"] for w in per_worker) / max(len(per_worker), 1)),
+        "avg_worker_uss_kb": round(sum(w["uss_kb"] for w in per_worker) / max(len(per_worker), 1)),
+        "total_pss_kb": total_pss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", default="app_api:app")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--warmup-requests", type=int, default=40)
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    python = sys.executable
+    scenarios = [
+        ("uvicorn --workers", [python, "-m", "uvicorn", args.app, "--port", str(args.port),
+                               "--workers", str(args.workers), "--log-level", "warning"], {}),
+        ("pre-fork", [python, "-m", "src.api.serve", args.app, "--port", str(args.port),
+                      "--workers", str(args.workers), "--log-level", "warning"], {}),
+        ("pre-fork + mmap", [python, "-m", "src.api.serve", args.app, "--port", str(args.port),
+                             "--workers", str(args.workers), "--log-level", "warning"],
+         {"MODEL_MMAP": "1"}),
+    ]
+
+    results = []
+    for name, command, env_extra in scenarios:
+        print(f" Mesure : {name}...")
+        results.append(measure(name, command, env_extra, args.port, args.warmup_requests))
+
+    print(f"\n{'Scénario':<22}{'RSS/worker':>14}{'USS/worker':>14}{'PSS total':>14}")
+    print("=" * 64)
+    for r in results:
+        print(f"{r['scenario']:<22}{r['avg_worker_rss_kb'] / 1024:>11.1f} MB"
+              f"{r['avg_worker_uss_kb'] / 1024:>11.1f} MB{r['total_pss_kb'] / 1024:>11.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Résultats sauvegardés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# batching.py
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+
+PredictFn = Callable[[List[str]], Awaitable[Tuple[np.ndarray, np.ndarray]]]
+
+
+# ==============================
+# Micro-Batcher
+# ==============================
+
+class MicroBatcher:
+    """
+    Regroupe les commentaires de requêtes concurrentes en un seul appel au modèle.
+
+    Modèle libre : le batch part à la fin de l'itération courante de la boucle
+    asyncio, sans délai (une requête isolée n'attend pas ; les requêtes arrivées
+    dans la même itération partagent l'appel). Modèle occupé : les commentaires
+    attendent la fin du batch en cours, au plus `max_wait_ms` millisecondes ou
+    jusqu'à `max_batch_size` commentaires. Un seul appel à `predict_fn`
+    (vectorize + score) est fait et les résultats sont redistribués à chaque
+    requête, dans son ordre d'origine.
+    """
+
+    def __init__(self, predict_fn: PredictFn, max_wait_ms: float = 5.0,
+                 max_batch_size: int = 512):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_count = 0
+        self._timer: Optional[asyncio.Handle] = None
+        self._tasks = set()
+        self._running = 0
+
+        self.batches = 0
+        self.requests = 0
+        self.comments = 0
+
+    async def submit(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Ajoute les textes d'une requête au prochain batch et attend ses résultats."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_count += len(texts)
+
+        if self._pending_count >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            if self._running:
+                self._timer = loop.call_later(self.max_wait, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        self._pending_count = 0
+        if not pending:
+            return
+
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: List[Tuple[List[str], asyncio.Future]]) -> None:
+        texts = [text for group, _ in pending for text in group]
+        self.batches += 1
+        self.requests += len(pending)
+        self.comments += len(texts)
+
+        self._running += 1
+        try:
+            labels, confidences = await self.predict_fn(texts)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._running -= 1
+            # Les requêtes arrivées pendant l'appel partent dès que le modèle se libère
+            if self._pending and not self._running:
+                self._flush()
+
+        start = 0
+        for group, future in pending:
+            end = start + len(group)
+            # Une requête annulée (client déconnecté) a déjà son future terminé
+            if not future.done():
+                future.set_result((labels[start:end], confidences[start:end]))
+            start = end
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "comments": self.comments,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,238 @@
+# cache.py
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+# ==============================
+# Key Helpers
+# ==============================
+
+# token_pattern par défaut de scikit-learn : les espaces ne font jamais partie d'un token
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+def collapse_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise un commentaire pour la clé de cache d'un vectoriseur "word" qui
+    met en minuscules (TfidfVectorizer par défaut) : casse et espaces multiples
+    n'ont alors aucun effet sur la prédiction.
+    """
+    return collapse_whitespace(text).lower()
+
+
+def text_normalizer(vectorizer) -> Callable[[str], str]:
+    """
+    Normalisation de clé déduite des paramètres du vectoriseur servi (ou de la
+    première étape d'un Pipeline) : ne fusionne que des textes qu'il ne peut
+    pas distinguer. Vectoriseur inconnu ou personnalisé : texte exact.
+    """
+    steps = getattr(vectorizer, "steps", None)
+    if steps:
+        vectorizer = steps[0][1]
+    pattern = getattr(vectorizer, "token_pattern", None)
+    pattern = getattr(pattern, "pattern", pattern)  # regex compilée (CompactVectorizer)
+    if (pattern != DEFAULT_TOKEN_PATTERN or getattr(vectorizer, "analyzer", "word") != "word"
+            or getattr(vectorizer, "tokenizer", None) is not None
+            or getattr(vectorizer, "preprocessor", None) is not None):
+        return str
+    return normalize_text if getattr(vectorizer, "lowercase", False) else collapse_whitespace
+
+
+def cache_key(text: str, model_version: str,
+              normalize: Callable[[str], str] = normalize_text) -> bytes:
+    """Empreinte (texte normalisé + version du modèle) sur 16 octets."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(model_version.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize(text).encode("utf-8"))
+    return digest.digest()
+
+
+# ==============================
+# Prediction Cache
+# ==============================
+
+class PredictionCache:
+    """
+    Cache LRU borné des prédictions (label, confiance), avec expiration (TTL).
+
+    La taille est limitée à la fois en nombre d'entrées et en mémoire estimée.
+    Thread-safe : peut être partagé entre les requêtes et les workers d'inférence.
+    """
+
+    def __init__(self, max_entries: int = 100_000, max_memory_mb: float = 64.0,
+                 ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+
+        # clé -> (label, confiance, date d'insertion, version du modèle)
+        self._entries: "OrderedDict[bytes, Tuple[int, float, float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key: bytes, value: Tuple[int, float, float, str]) -> int:
+        # Clé + tuple + ses éléments + emplacement dans le dictionnaire (estimation) ;
+        # la chaîne de version est partagée entre les entrées et n'est pas comptée
+        return (sys.getsizeof(key) + sys.getsizeof(value)
+                + sum(sys.getsizeof(v) for v in value[:3]) + 64)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            key, value = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(key, value)
+            self.evictions += 1
+
+    def lookup(self, keys: List[bytes]) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+        """
+        Cherche les clés dans le cache.
+
+        Renvoie (labels, confiances, indices manquants) ; les positions manquantes
+        des tableaux sont à remplir par l'appelant.
+        """
+        labels = np.zeros(len(keys), dtype=np.int64)
+        confidences = np.zeros(len(keys), dtype=np.float64)
+        missing = []
+        now = time.monotonic()
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is not None and self.ttl_seconds and now - value[2] > self.ttl_seconds:
+                    del self._entries[key]
+                    self._bytes -= self._entry_size(key, value)
+                    value = None
+                if value is None:
+                    missing.append(i)
+                    continue
+                self._entries.move_to_end(key)
+                labels[i] = value[0]
+                confidences[i] = value[1]
+
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        return labels, confidences, missing
+
+    def store(self, keys: List[bytes], labels: np.ndarray, confidences: np.ndarray,
+              model_version: str = "") -> None:
+        """Ajoute (ou rafraîchit) des prédictions puis applique l'éviction LRU."""
+        now = time.monotonic()
+        with self._lock:
+            for key, label, confidence in zip(keys, labels.tolist(), confidences.tolist()):
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._bytes -= self._entry_size(key, old)
+                value = (label, confidence, now, model_version)
+                self._entries[key] = value
+                self._bytes += self._entry_size(key, value)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def discard_version(self, model_version: str) -> int:
+        """Supprime les entrées d'une version de modèle (ex. remplacée) ; renvoie leur nombre."""
+        with self._lock:
+            stale = [(key, value) for key, value in self._entries.items()
+                     if value[3] == model_version]
+            for key, value in stale:
+                del self._entries[key]
+                self._bytes -= self._entry_size(key, value)
+        return len(stale)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# ==============================
+# Cached Inference
+# ==============================
+
+def _unique_misses(keys: List[bytes], missing: List[int]) -> List[int]:
+    """Indices à calculer : les doublons d'un même batch ne sont calculés qu'une fois."""
+    first_index = {}
+    for i in missing:
+        first_index.setdefault(keys[i], i)
+    return list(first_index.values())
+
+
+def _merge_misses(cache: PredictionCache, model_version: str, keys: List[bytes],
+                  missing: List[int], unique: List[int], labels: np.ndarray,
+                  confidences: np.ndarray, miss_labels, miss_confidences) -> None:
+    miss_labels = np.asarray(miss_labels)
+    miss_confidences = np.asarray(miss_confidences)
+    cache.store([keys[i] for i in unique], miss_labels, miss_confidences, model_version)
+
+    position = {keys[i]: j for j, i in enumerate(unique)}
+    rows = [position[keys[i]] for i in missing]
+    labels[missing] = miss_labels[rows]
+    confidences[missing] = miss_confidences[rows]
+
+
+def predict_with_cache(cache: PredictionCache, model_version: str, texts: List[str],
+                       predict_fn: Callable[[List[str]], Tuple[np.ndarray, np.ndarray]],
+                       normalize: Callable[[str], str] = normalize_text
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ne passe au modèle que les textes absents du cache, puis fusionne les
+    résultats dans l'ordre d'entrée. `normalize` doit venir de text_normalizer
+    pour le vectoriseur du modèle.
+    """
+    keys = [cache_key(text, model_version, normalize) for text in texts]
+    labels, confidences, missing = cache.lookup(keys)
+
+    if missing:
+        unique = _unique_misses(keys, missing)
+        miss_labels, miss_confidences = predict_fn([texts[i] for i in unique])
+        _merge_misses(cache, model_version, keys, missing, unique, labels, confidences,
+                      miss_labels, miss_confidences)
+
+    return labels, confidences
+
+
+async def predict_with_cache_async(
+        cache: PredictionCache, model_version: str, texts: List[str],
+        predict_fn: Callable[[List[str]], Awaitable[Tuple[np.ndarray, np.ndarray]]],
+        normalize: Callable[[str], str] = normalize_text
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Variante de predict_with_cache dont le calcul des manquants est asynchrone (pool de workers)."""
+    keys = [cache_key(text, model_version, normalize) for text in texts]
+    labels, confidences, missing = cache.lookup(keys)
+
+    if missing:
+        unique = _unique_misses(keys, missing)
+        miss_labels, miss_confidences = await predict_fn([texts[i] for i in unique])
+        _merge_misses(cache, model_version, keys, missing, unique, labels, confidences,
+                      miss_labels, miss_confidences)
+
+    return labels, confidences
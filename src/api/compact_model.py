@@ -0,0 +1,190 @@
+# compact_model.py
+"""
+Chargement et scoring de l'artefact compact exporté par src/models/export_model.py.
+
+L'artefact est un dossier de tableaux .npy (mappables en mémoire) et d'un
+manifest.json ; il reproduit TfidfVectorizer + LogisticRegression sans importer
+scikit-learn ni dé-pickler d'objets Python.
+
+Le vocabulaire est stocké comme tableau Unicode ordonné par colonne ; la table
+de hachage (dict terme → colonne) est reconstruite au chargement en quelques
+millisecondes, car une recherche par empreinte dans un tableau trié s'est
+révélée ~10x plus lente que le dict pour la transformation.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+FORMAT_NAME = "tfidf-linear"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+ARRAY_FILES = ("terms", "idf", "coef", "intercept", "classes")
+
+
+# ==============================
+# Text Helpers
+# ==============================
+
+def strip_accents_unicode(text: str) -> str:
+    """Identique à sklearn.feature_extraction.text.strip_accents_unicode."""
+    try:
+        text.encode("ASCII", errors="strict")
+        return text
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize("NFKD", text)
+        return "".join([c for c in normalized if not unicodedata.combining(c)])
+
+
+def strip_accents_ascii(text: str) -> str:
+    """Identique à sklearn.feature_extraction.text.strip_accents_ascii."""
+    return unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
+
+
+_ACCENT_FUNCTIONS = {None: None, "unicode": strip_accents_unicode, "ascii": strip_accents_ascii}
+
+
+class SparseRows(NamedTuple):
+    """Matrice TF-IDF au format COO : une entrée (ligne, colonne, valeur) par terme non nul."""
+    rows: np.ndarray
+    cols: np.ndarray
+    values: np.ndarray
+    n_rows: int
+
+
+# ==============================
+# Vectorizer
+# ==============================
+
+class CompactVectorizer:
+    """Équivalent de TfidfVectorizer.transform (analyzer='word') sans scikit-learn."""
+
+    def __init__(self, manifest: dict, terms: np.ndarray, idf: np.ndarray):
+        params = manifest["vectorizer"]
+        self.lowercase = params["lowercase"]
+        self.accent_function = _ACCENT_FUNCTIONS[params["strip_accents"]]
+        self.token_pattern = re.compile(params["token_pattern"])
+        self.min_n, self.max_n = params["ngram_range"]
+        self.sublinear_tf = params["sublinear_tf"]
+        self.norm = params["norm"]
+
+        self.n_features = int(manifest["n_features"])
+        self.vocabulary = {term: column for column, term in enumerate(terms.tolist())}
+        self.idf = idf
+
+    def analyze(self, doc: str) -> List[str]:
+        """Prétraitement, tokenisation et n-grammes, comme build_analyzer() de scikit-learn."""
+        if self.lowercase:
+            doc = doc.lower()
+        if self.accent_function is not None:
+            doc = self.accent_function(doc)
+
+        tokens = self.token_pattern.findall(doc)
+        if self.max_n == 1:
+            return tokens
+
+        min_n = self.min_n
+        ngrams = list(tokens) if min_n == 1 else []
+        if min_n == 1:
+            min_n = 2
+        n_tokens = len(tokens)
+        space_join = " ".join
+        for n in range(min_n, min(self.max_n + 1, n_tokens + 1)):
+            for i in range(n_tokens - n + 1):
+                ngrams.append(space_join(tokens[i:i + n]))
+        return ngrams
+
+    def transform(self, texts: List[str]) -> SparseRows:
+        n_docs = len(texts)
+        lookup = self.vocabulary.get
+        rows, cols = [], []
+        for i, doc in enumerate(texts):
+            for term in self.analyze(doc):
+                column = lookup(term)
+                if column is not None:
+                    rows.append(i)
+                    cols.append(column)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        # Comptage des occurrences par (document, terme)
+        keys, counts = np.unique(rows * self.n_features + cols, return_counts=True)
+        rows = keys // self.n_features
+        cols = keys % self.n_features
+        values = counts.astype(np.float64)
+
+        if self.sublinear_tf:
+            values = np.log(values) + 1
+        if self.idf is not None:
+            values *= self.idf[cols]
+        if self.norm is not None:
+            weights = values ** 2 if self.norm == "l2" else np.abs(values)
+            norms = np.bincount(rows, weights=weights, minlength=n_docs)
+            if self.norm == "l2":
+                norms = np.sqrt(norms)
+            norms[norms == 0.0] = 1.0
+            values /= norms[rows]
+
+        return SparseRows(rows, cols, values, n_docs)
+
+
+# ==============================
+# Classifier
+# ==============================
+
+class CompactClassifier:
+    """Modèle linéaire (coef_, intercept_, classes_) compatible avec src.api.inference."""
+
+    def __init__(self, manifest: dict, coef: np.ndarray, intercept: np.ndarray,
+                 classes: np.ndarray):
+        # coef est stocké transposé (n_features, n_outputs) : une ligne contiguë par terme
+        self.coef_t = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+        self.multi_class = manifest["proba_mode"]
+
+    def decision_function(self, X: SparseRows) -> np.ndarray:
+        n_outputs = self.coef_t.shape[1]
+        scores = np.empty((X.n_rows, n_outputs), dtype=np.float64)
+        contributions = self.coef_t[X.cols] * X.values[:, None]
+        for k in range(n_outputs):
+            scores[:, k] = np.bincount(X.rows, weights=contributions[:, k], minlength=X.n_rows)
+        scores += self.intercept_
+        return scores[:, 0] if n_outputs == 1 else scores
+
+
+# ==============================
+# Loading
+# ==============================
+
+def load_compact_model(directory: str, mmap: bool = True) -> Tuple[CompactClassifier, CompactVectorizer]:
+    """Charge (modèle, vectoriseur) depuis un dossier exporté, sans scikit-learn."""
+    # Lien résolu une seule fois : un export publié pendant le chargement ne
+    # mélange pas le manifest d'une version et les tableaux d'une autre
+    directory = os.path.realpath(directory)
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != FORMAT_NAME or manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Artefact incompatible : {manifest.get('format')} v{manifest.get('format_version')} "
+            f"(attendu {FORMAT_NAME} v{FORMAT_VERSION})"
+        )
+
+    mmap_mode = "r" if mmap else None
+    arrays = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in ARRAY_FILES
+    }
+    idf = arrays["idf"] if manifest["vectorizer"]["use_idf"] else None
+
+    vectorizer = CompactVectorizer(manifest, arrays["terms"], idf)
+    model = CompactClassifier(manifest, arrays["coef"], arrays["intercept"],
+                              np.asarray(arrays["classes"]))
+    return model, vectorizer
+
@@ -0,0 +1,95 @@
+# executor.py
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+# ==============================
+# Errors
+# ==============================
+
+class PoolSaturatedError(RuntimeError):
+    """La file d'attente du pool d'inférence est pleine (à traduire en HTTP 429)."""
+
+
+# ==============================
+# Inference Pool
+# ==============================
+
+class InferencePool:
+    """
+    Exécute l'inférence (CPU) hors de la boucle asyncio, sur un pool de threads
+    ou de processus, avec une profondeur de file bornée.
+
+    Au-delà de `max_queue` tâches en cours ou en attente, `run` lève
+    PoolSaturatedError au lieu d'empiler : le client reçoit un 429 immédiat et
+    /health ainsi que les petites requêtes gardent une latence faible.
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None,
+                 max_queue: int = 32, initializer: Optional[Callable[[], Any]] = None):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Mode de pool inconnu : {mode!r} (attendu 'thread' ou 'process')")
+
+        self.mode = mode
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+        if mode == "process":
+            # fork : les workers héritent du modèle déjà chargé dans le processus parent
+            context = multiprocessing.get_context("fork" if os.name == "posix" else "spawn")
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context, initializer=initializer
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Soumet `fn(*args)` au pool et attend son résultat sans bloquer la boucle."""
+        if self._in_flight >= self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(
+                f"File d'inférence pleine ({self._in_flight}/{self.max_queue} tâches)"
+            )
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Place libérée à la fin de la tâche elle-même, pas de l'attente : une
+        # requête annulée (client déconnecté) ne libère pas un worker encore occupé
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """Arrête le pool sans attendre ; `cancel_pending=False` laisse finir les tâches soumises."""
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+        }
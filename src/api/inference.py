@@ -0,0 +1,105 @@
+# inference.py
+
+from typing import Tuple
+
+import numpy as np
+
+
+# ==============================
+# Probability Helpers
+# ==============================
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    """Softmax ligne par ligne, stable numériquement."""
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
+def _ovr_proba(scores: np.ndarray) -> np.ndarray:
+    """Sigmoïde par classe puis normalisation (schéma one-vs-rest de scikit-learn)."""
+    proba = 1.0 / (1.0 + np.exp(-scores))
+    proba /= proba.sum(axis=1, keepdims=True)
+    return proba
+
+
+def proba_mode(model) -> str:
+    """
+    Détermine comment scikit-learn convertit les scores de décision en probabilités :
+    "ovr", "multinomial" ou "" si le modèle n'expose pas de decision_function linéaire.
+    """
+    if not hasattr(model, "decision_function") or not hasattr(model, "classes_"):
+        return ""
+
+    multi_class = getattr(model, "multi_class", None)
+    if multi_class is None:
+        # SGDClassifier(loss="log_loss") : sigmoïde par classe normalisée, comme l'OvR
+        if getattr(model, "loss", None) in ("log_loss", "log"):
+            return "ovr"
+        return ""
+    if multi_class == "ovr":
+        return "ovr"
+    if multi_class == "multinomial":
+        return "multinomial"
+    # "auto" (ou "deprecated" dans les versions récentes) : liblinear et le binaire restent en OvR
+    if len(model.classes_) <= 2 or getattr(model, "solver", None) == "liblinear":
+        return "ovr"
+    return "multinomial"
+
+
+def scores_to_predictions(scores: np.ndarray, classes: np.ndarray,
+                          mode: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convertit des scores de décision en (labels, confiances).
+
+    Les labels sont obtenus par argmax sur `classes` (comme `model.predict`) et la
+    confiance est la probabilité de la classe prédite, comme `model.predict_proba`.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+
+    if scores.ndim == 1:
+        # Cas binaire : scikit-learn ne renvoie qu'une colonne de scores
+        indices = (scores > 0).astype(np.intp)
+        if mode == "multinomial":
+            proba = _softmax(np.column_stack([-scores, scores]))
+        else:
+            positive = 1.0 / (1.0 + np.exp(-scores))
+            proba = np.column_stack([1.0 - positive, positive])
+    else:
+        # L'argmax se fait sur les scores bruts, exactement comme model.predict
+        indices = scores.argmax(axis=1)
+        proba = _softmax(scores.copy()) if mode == "multinomial" else _ovr_proba(scores)
+
+    labels = np.asarray(classes)[indices]
+    confidences = proba[np.arange(len(indices)), indices]
+    return labels, confidences
+
+
+# ==============================
+# Fused Inference
+# ==============================
+
+def predict_with_confidence(model, X) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule labels et confiances en un seul passage sur la matrice TF-IDF.
+
+    Remplace le couple `model.predict(X)` + `model.predict_proba(X)`, qui
+    recalculait deux fois le produit matriciel linéaire.
+    """
+    mode = proba_mode(model)
+    if mode:
+        return scores_to_predictions(model.decision_function(X), model.classes_, mode)
+
+    # Modèle non linéaire : un seul appel à predict_proba suffit aussi
+    proba = model.predict_proba(X)
+    indices = proba.argmax(axis=1)
+    labels = np.asarray(model.classes_)[indices]
+    confidences = proba[np.arange(len(indices)), indices]
+    return labels, confidences
+
+
+def predict_texts(model, vectorizer, texts) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorise une liste de textes puis renvoie (labels, confiances)."""
+    X_tfidf = vectorizer.transform(texts)
+    return predict_with_confidence(model, X_tfidf)
@@ -1,15 +1,24 @@
 # main.py
 
+import asyncio
+import hmac
 import os
-import numpy as np
+import random
+import sys
+import time
 from datetime import datetime
+from functools import partial
 from typing import List, Dict, Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response
+from fastapi.routing import APIRoute
 from pydantic import BaseModel, Field, validator
 
 import joblib
+import numpy as np
 
 # ==============================
 # Configuration & Constants
@@ -17,8 +26,87 @@ import joblib
 
 # Resolve project root: src/api/main.py → go up 2 levels
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-MODEL_PATH = os.path.join(PROJECT_ROOT, "models", "sentiment_model.joblib")
-VECTORIZER_PATH = os.path.join(PROJECT_ROOT, "models", "vectorizer.joblib")
+MODEL_DIR = os.path.join(PROJECT_ROOT, "models")
+MODEL_FILE = "sentiment_model.joblib"
+VECTORIZER_FILE = "vectorizer.joblib"
+MODEL_PATH = os.path.join(MODEL_DIR, MODEL_FILE)
+VECTORIZER_PATH = os.path.join(MODEL_DIR, VECTORIZER_FILE)
+
+# Format des artefacts : "joblib" (scikit-learn) ou "compact" (export_model.py, sans sklearn)
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "joblib")
+COMPACT_MODEL_DIR = os.path.join(MODEL_DIR, "compact")
+
+# Tableaux NumPy du modèle mappés en mémoire (partagés entre workers via le page cache)
+MODEL_MMAP = os.getenv("MODEL_MMAP", "0") == "1"
+
+# Cache des prédictions (désactivable avec PREDICTION_CACHE_ENABLED=0)
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "1") == "1"
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "100000"))
+CACHE_MAX_MEMORY_MB = float(os.getenv("CACHE_MAX_MEMORY_MB", "64"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "3600"))
+
+# Micro-batching des requêtes concurrentes (désactivable avec MICRO_BATCH_ENABLED=0)
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "1") == "1"
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5"))
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "512"))
+
+# Pool d'inférence hors boucle asyncio : "thread", "process" ou "inline" (désactivé).
+# Un pool par version servie (current, candidate) : workers et file bornée par version
+INFERENCE_POOL_MODE = os.getenv("INFERENCE_POOL_MODE", "thread")
+INFERENCE_POOL_WORKERS = int(os.getenv("INFERENCE_POOL_WORKERS", "0")) or None
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "32"))
+
+# /predict_stream : taille des chunks scorés et longueur maximale d'une ligne NDJSON
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
+# /metrics au format Prometheus (désactivable avec METRICS_ENABLED=0)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Profilage à la demande de /predict_batch (en-tête X-Profile ou ?profile= égal à
+# PROFILE_TOKEN), désactivé par défaut et sans effet tant que PROFILE_TOKEN n'est pas défini
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1" and bool(PROFILE_TOKEN)
+if os.getenv("PROFILING_ENABLED", "0") == "1" and not PROFILE_TOKEN:
+    print(" PROFILING_ENABLED=1 ignoré : PROFILE_TOKEN n'est pas défini")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(PROJECT_ROOT, "logs", "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+
+# Rechargement à chaud du modèle : surveillance des artefacts toutes les
+# MODEL_WATCH_INTERVAL secondes (0 = désactivée) et POST /admin/reload, actif
+# seulement si ADMIN_TOKEN est défini (en-tête X-Admin-Token)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Modèle candidat (ex. `train_model.py --output-dir models/candidate`), servi à
+# CANDIDATE_TRAFFIC_PERCENT % des requêtes ou sur demande (en-tête X-Model-Version)
+CANDIDATE_MODEL_DIR = os.getenv("CANDIDATE_MODEL_DIR", "")
+CANDIDATE_TRAFFIC_PERCENT = float(os.getenv("CANDIDATE_TRAFFIC_PERCENT", "0"))
+
+# Scoring fantôme : SHADOW_SAMPLE_PERCENT % des requêtes servies par "current" sont
+# rescorées par le candidat en arrière-plan (latence et accord des labels dans /metrics).
+# SHADOW_POOL_MODE=process isole le candidat du GIL du serveur (voir src/api/shadow.py)
+SHADOW_POOL_MODE = os.getenv("SHADOW_POOL_MODE", "thread")
+SHADOW_SAMPLE_PERCENT = float(os.getenv("SHADOW_SAMPLE_PERCENT", "0"))
+SHADOW_WORKERS = int(os.getenv("SHADOW_WORKERS", "1"))
+SHADOW_MAX_PENDING = int(os.getenv("SHADOW_MAX_PENDING", "4"))
+
+# Permet `from src.api...` aussi bien via uvicorn (racine) que via `python main.py`
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.api.batching import MicroBatcher  # noqa: E402
+from src.api.cache import PredictionCache, predict_with_cache_async, text_normalizer  # noqa: E402
+from src.api.compact_model import MANIFEST_FILE, load_compact_model  # noqa: E402
+from src.api.executor import InferencePool, PoolSaturatedError  # noqa: E402
+from src.api.inference import predict_with_confidence  # noqa: E402
+from src.api.metrics import CONTENT_TYPE, MetricsMiddleware, Registry, StageTimer  # noqa: E402
+from src.api.profiling import ProfileStore, SamplingProfiler  # noqa: E402
+from src.api.registry import ModelBundle, ModelRegistry  # noqa: E402
+from src.api.shadow import ShadowScorer  # noqa: E402
+from src.api.responses import build_batch_payload, fast_json_response  # noqa: E402
+from src.api.streaming import DuplexStreamingResponse, stream_predictions  # noqa: E402
 
 
 # ==============================
@@ -49,6 +137,86 @@ class BatchPredictionResponse(BaseModel):
     timestamp: str
 
 
+# ==============================
+# Metrics
+# ==============================
+
+metrics = Registry()
+http_requests = metrics.counter(
+    "sentiment_http_requests", "Requêtes HTTP par route, méthode et statut",
+    labelnames=("endpoint", "method", "status"))
+http_request_duration = metrics.histogram(
+    "sentiment_http_request_duration_seconds", "Durée des requêtes HTTP par route",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    labelnames=("endpoint",))
+stage_duration = metrics.histogram(
+    "sentiment_stage_duration_seconds",
+    "Durée par étape : validation, transform, scoring, serialization",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+    labelnames=("stage",))
+batch_size_histogram = metrics.histogram(
+    "sentiment_batch_size", "Nombre de commentaires par requête /predict_batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000))
+comment_length_histogram = metrics.histogram(
+    "sentiment_comment_length_chars", "Longueur des commentaires reçus (caractères)",
+    buckets=(10, 25, 50, 100, 200, 500, 1000, 2000, 5000))
+comments_scored = metrics.counter(
+    "sentiment_comments_scored", "Commentaires passés au modèle (hors cache)")
+model_requests = metrics.counter(
+    "sentiment_model_requests", "Requêtes /predict_batch par version de modèle",
+    labelnames=("model",))
+model_latency = metrics.histogram(
+    "sentiment_model_latency_seconds",
+    "Durée de l'inférence d'une requête (cache, micro-batch et pool compris) par version",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    labelnames=("model",))
+predictions_total = metrics.counter(
+    "sentiment_predictions", "Prédictions renvoyées par version de modèle et sentiment",
+    labelnames=("model", "sentiment"))
+prediction_confidence = metrics.histogram(
+    "sentiment_prediction_confidence", "Confiance des prédictions par version de modèle",
+    buckets=(0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99),
+    labelnames=("model",))
+shadow_latency = metrics.histogram(
+    "sentiment_shadow_stage_duration_seconds",
+    "Durée par étape du modèle candidat en scoring fantôme (comparable à sentiment_stage_duration_seconds)",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+    labelnames=("stage",))
+shadow_comparisons = metrics.counter(
+    "sentiment_shadow_comparisons", "Commentaires rescorés par le candidat, par paire de sentiments",
+    labelnames=("primary", "candidate"))
+
+stage_timer = StageTimer(stage_duration if METRICS_ENABLED else None)
+
+
+class TimedRoute(APIRoute):
+    """
+    Route qui note l'instant d'entrée dans le handler FastAPI : l'écart avec le
+    début de l'endpoint mesure la lecture du corps, le parsing JSON et la
+    validation Pydantic (étape "validation"), y compris en cas d'erreur 422.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            request.state.route_start = time.perf_counter()
+            try:
+                return await handler(request)
+            except RequestValidationError:
+                observe_validation(request)
+                raise
+
+        return timed_handler
+
+
+def observe_validation(request: Request) -> None:
+    start = getattr(request.state, "route_start", None)
+    if METRICS_ENABLED and start is not None:
+        stage_duration.observe(time.perf_counter() - start, "validation")
+        request.state.route_start = None
+
+
 # ==============================
 # FastAPI App Setup
 # ==============================
@@ -58,6 +226,7 @@ app = FastAPI(
     description="API pour analyser le sentiment des commentaires YouTube",
     version="1.0.0"
 )
+app.router.route_class = TimedRoute
 
 # CORS Middleware
 app.add_middleware(
@@ -68,9 +237,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global model & vectorizer
-model = None
-vectorizer = None
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, requests_total=http_requests,
+                       request_duration=http_request_duration, router=app.router)
+
+# Pools d'inférence (un par version) et fantôme, créés au démarrage ; les modèles
+# servis sont dans `registries`
+inference_pools: Dict[str, InferencePool] = {}
+shadow_scorer = None
+
+prediction_cache = PredictionCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    max_memory_mb=CACHE_MAX_MEMORY_MB,
+    ttl_seconds=CACHE_TTL_SECONDS,
+) if PREDICTION_CACHE_ENABLED else None
+
+profile_store = ProfileStore(PROFILE_DIR, max_files=PROFILE_MAX_FILES) if PROFILING_ENABLED else None
 
 
 # ==============================
@@ -81,27 +263,294 @@ def label_to_sentiment(label: int) -> str:
     return {-1: "negative", 0: "neutral", 1: "positive"}.get(label, "unknown")
 
 
+def artifact_version(*paths: str) -> str:
+    """Version des artefacts (chemin + taille + date de modification) : change à chaque save_model."""
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(f"{os.path.relpath(path, PROJECT_ROOT)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def current_artifact_version(model_dir: str = MODEL_DIR) -> str:
+    """Version des artefacts sur disque (lève FileNotFoundError s'ils sont absents)."""
+    if MODEL_FORMAT == "compact":
+        return artifact_version(os.path.join(model_dir, "compact", MANIFEST_FILE))
+    return artifact_version(os.path.join(model_dir, MODEL_FILE),
+                            os.path.join(model_dir, VECTORIZER_FILE))
+
+
+def load_bundle(model_dir: str = MODEL_DIR) -> ModelBundle:
+    """Charge modèle et vectoriseur depuis les artefacts de `model_dir`."""
+    # Version relevée avant la lecture : un artefact remplacé pendant le
+    # chargement aura une autre version et sera rechargé par la surveillance
+    try:
+        version = current_artifact_version(model_dir)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Artefact introuvable : {e.filename}") from e
+
+    # mmap : les tableaux du modèle restent dans le page cache, partagés entre
+    # workers pre-fork et entre versions identiques sur disque
+    if MODEL_FORMAT == "compact":
+        loaded_model, loaded_vectorizer = load_compact_model(os.path.join(model_dir, "compact"),
+                                                             mmap=True)
+    else:
+        mmap_mode = "r" if MODEL_MMAP else None
+        loaded_model = joblib.load(os.path.join(model_dir, MODEL_FILE), mmap_mode=mmap_mode)
+        loaded_vectorizer = joblib.load(os.path.join(model_dir, VECTORIZER_FILE),
+                                        mmap_mode=mmap_mode)
+    return ModelBundle(loaded_model, loaded_vectorizer, version, time.time())
+
+
+def make_inference_pool():
+    return InferencePool(
+        mode=INFERENCE_POOL_MODE,
+        max_workers=INFERENCE_POOL_WORKERS,
+        max_queue=INFERENCE_MAX_QUEUE,
+        initializer=init_inference_worker if INFERENCE_POOL_MODE == "process" else None,
+    )
+
+
+def on_model_swap(slot: str, previous: ModelBundle, bundle: ModelBundle) -> None:
+    """
+    Appelé dans la boucle asyncio juste après la publication d'un nouveau modèle
+    `slot` ; seul l'état propre à cette version est renouvelé.
+    """
+    # Les workers d'un pool de processus gardent la copie du modèle héritée au
+    # fork : nouveau pool (forké au premier appel, donc avec le nouveau modèle),
+    # l'ancien termine ses tâches déjà soumises puis s'arrête
+    pool = inference_pools.get(slot)
+    if pool is not None and pool.mode == "process":
+        inference_pools[slot] = make_inference_pool()
+        pool.shutdown(cancel_pending=False)
+    # Entrées de l'ancienne version devenues inaccessibles (clé = texte + version)
+    if prediction_cache is not None:
+        prediction_cache.discard_version(previous.version)
+    if slot == CANDIDATE and shadow_scorer is not None and shadow_scorer.mode == "process":
+        shadow_scorer.restart()
+
+
+# Versions servies : "current" (obligatoire) et "candidate" (optionnelle)
+CURRENT, CANDIDATE = "current", "candidate"
+MODEL_DIRS = {CURRENT: MODEL_DIR}
+if CANDIDATE_MODEL_DIR:
+    MODEL_DIRS[CANDIDATE] = os.path.join(PROJECT_ROOT, CANDIDATE_MODEL_DIR)
+
+registries = {
+    name: ModelRegistry(partial(load_bundle, model_dir), partial(current_artifact_version, model_dir),
+                        on_swap=partial(on_model_swap, name))
+    for name, model_dir in MODEL_DIRS.items()
+}
+registry = registries[CURRENT]
+
+
+def load_artifacts():
+    """
+    Charge les modèles dans le processus courant s'ils ne le sont pas déjà. Un
+    candidat absent ou invalide n'empêche pas le démarrage : il n'est simplement
+    pas routé (et sera chargé par la surveillance dès qu'il apparaît).
+    """
+    if registry.current is None:
+        registry.load()
+    for name, candidate in registries.items():
+        if name != CURRENT and candidate.current is None:
+            try:
+                candidate.load()
+            except Exception as e:
+                candidate.last_error = f"{type(e).__name__}: {e}"
+                print(f" Modèle {name} non chargé : {candidate.last_error}")
+
+
+def init_inference_worker():
+    """Initialiseur des workers du pool de processus (utile hors fork, ex. spawn)."""
+    load_artifacts()
+
+
+def score_texts(texts: List[str], bundle: ModelBundle = None, slot: str = CURRENT):
+    """
+    Vectorise et score `texts` (exécuté dans le pool d'inférence). Les durées
+    des deux étapes sont renvoyées avec le résultat pour être enregistrées par
+    le processus principal, y compris quand le pool est un pool de processus.
+    Sans `bundle` (pool de processus), le worker utilise sa copie du modèle `slot`.
+    """
+    bundle = bundle or registries[slot].current
+    start = time.perf_counter()
+    X_tfidf = bundle.vectorizer.transform(texts)
+    transformed = time.perf_counter()
+    labels, confidences = predict_with_confidence(bundle.model, X_tfidf)
+    return labels, confidences, (transformed - start, time.perf_counter() - transformed)
+
+
+async def score_texts_async(texts: List[str], slot: str, bundle: ModelBundle, pool,
+                            inline: bool = False):
+    if inline or pool is None:
+        labels, confidences, timings = score_texts(texts, bundle)
+    elif pool.mode == "process":
+        # Pas de modèle à sérialiser : le pool est recréé à chaque changement de modèle
+        labels, confidences, timings = await pool.run(score_texts, texts, None, slot)
+    else:
+        labels, confidences, timings = await pool.run(score_texts, texts, bundle)
+    if METRICS_ENABLED:
+        stage_duration.observe(timings[0], "transform")
+        stage_duration.observe(timings[1], "scoring")
+        comments_scored.inc(amount=len(texts))
+    return labels, confidences
+
+
+async def run_inference_async(texts: List[str], slot: str = CURRENT, inline: bool = False,
+                              use_cache: bool = True):
+    """
+    Labels et confiances de la version `slot` pour `texts` : cache d'abord (sauf
+    si `use_cache` est faux), puis pool pour les manquants (ou dans le thread
+    courant si `inline`).
+    """
+    # Modèle et pool lus ensemble, avant toute attente : un rechargement
+    # concurrent ne mélange pas deux versions dans un même appel
+    bundle, pool = registries[slot].current, inference_pools.get(slot)
+    if prediction_cache is None or not use_cache:
+        return await score_texts_async(texts, slot, bundle, pool, inline)
+
+    async def score_fn(missing: List[str]):
+        return await score_texts_async(missing, slot, bundle, pool, inline)
+    return await predict_with_cache_async(prediction_cache, bundle.version, texts, score_fn,
+                                          text_normalizer(bundle.vectorizer))
+
+
+def start_profiler(request: Request):
+    """SamplingProfiler démarré si le profilage est activé et demandé par la requête, sinon None."""
+    if not PROFILING_ENABLED:
+        return None
+    supplied = request.headers.get("x-profile") or request.query_params.get("profile") or ""
+    if not hmac.compare_digest(supplied, PROFILE_TOKEN):
+        return None
+    return SamplingProfiler(interval=PROFILE_INTERVAL_MS / 1000).start()
+
+
+def attach_profile(response: Response, profiler: SamplingProfiler) -> Response:
+    """Enregistre le profil et indique où le récupérer dans les en-têtes de la réponse."""
+    profile_id = profile_store.save(profiler.folded())
+    response.headers["X-Profile-Id"] = profile_id
+    response.headers["X-Profile-Url"] = f"/debug/profiles/{profile_id}"
+    response.headers["X-Profile-Samples"] = str(profiler.sample_count)
+    response.headers["X-Profile-Duration-Ms"] = f"{profiler.duration * 1000:.2f}"
+    return response
+
+
+def choose_model(request: Request) -> str:
+    """
+    Version qui sert la requête : celle de l'en-tête X-Model-Version si présent,
+    sinon le candidat pour CANDIDATE_TRAFFIC_PERCENT % des requêtes.
+    """
+    requested = request.headers.get("x-model-version")
+    if requested:
+        if requested not in registries or registries[requested].current is None:
+            raise HTTPException(status_code=404,
+                                detail=f"Version de modèle inconnue ou non chargée : {requested}")
+        return requested
+    if (CANDIDATE_TRAFFIC_PERCENT > 0 and CANDIDATE in registries
+            and registries[CANDIDATE].current is not None
+            and random.random() * 100 < CANDIDATE_TRAFFIC_PERCENT):
+        return CANDIDATE
+    return CURRENT
+
+
+def observe_predictions(slot: str, predictions, confidences) -> None:
+    """Distribution des sentiments et des confiances renvoyés par la version `slot`."""
+    labels, counts = np.unique(predictions, return_counts=True)
+    for label, count in zip(labels.tolist(), counts.tolist()):
+        predictions_total.inc(slot, label_to_sentiment(label), amount=count)
+    prediction_confidence.observe_many(confidences, slot)
+
+
+def record_shadow_result(primary_labels, shadow_labels, timings) -> None:
+    """Appelé après chaque scoring fantôme : latence du candidat et accord avec le principal."""
+    if not METRICS_ENABLED:
+        return
+    shadow_latency.observe(timings[0], "transform")
+    shadow_latency.observe(timings[1], "scoring")
+    pairs, counts = np.unique(np.stack([primary_labels, shadow_labels]), axis=1, return_counts=True)
+    for (primary, candidate), count in zip(pairs.T.tolist(), counts.tolist()):
+        shadow_comparisons.inc(label_to_sentiment(primary), label_to_sentiment(candidate),
+                               amount=count)
+
+
+def submit_shadow(slot: str, texts: List[str], primary_labels) -> None:
+    """Rescore éventuellement la requête avec le candidat, sans l'attendre."""
+    if shadow_scorer is None or slot != CURRENT:
+        return
+    candidate = registries[CANDIDATE].current
+    if candidate is not None:
+        # Sans cache ni micro-batch : on mesure le coût réel du candidat. En mode
+        # process, le worker utilise sa copie du candidat (rien à sérialiser)
+        bundle = None if shadow_scorer.mode == "process" else candidate
+        shadow_scorer.submit(texts, primary_labels,
+                             partial(score_texts, bundle=bundle, slot=CANDIDATE))
+
+
+# Un micro-batcher par version : un appel au modèle ne mélange jamais deux versions.
+# Le cache est consulté avant (batched_inference_async) : seuls les manquants sont mis en attente
+micro_batchers = {
+    name: MicroBatcher(
+        partial(run_inference_async, slot=name, use_cache=False),
+        max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+        max_batch_size=MICRO_BATCH_MAX_SIZE,
+    )
+    for name in registries
+} if MICRO_BATCH_ENABLED else None
+
+
+async def batched_inference_async(texts: List[str], slot: str = CURRENT):
+    """Comme run_inference_async, mais les textes absents du cache passent par le micro-batcher."""
+    batcher = micro_batchers[slot]
+    if prediction_cache is None:
+        return await batcher.submit(texts)
+    bundle = registries[slot].current
+    return await predict_with_cache_async(prediction_cache, bundle.version, texts, batcher.submit,
+                                          text_normalizer(bundle.vectorizer))
+
+
 # ==============================
 # Startup Event: Load Model
 # ==============================
 
 @app.on_event("startup")
 async def load_model():
-    global model, vectorizer
+    global shadow_scorer
     try:
-        if not os.path.exists(MODEL_PATH):
-            raise FileNotFoundError(f"Modèle introuvable : {MODEL_PATH}")
-        if not os.path.exists(VECTORIZER_PATH):
-            raise FileNotFoundError(f"Vectoriseur introuvable : {VECTORIZER_PATH}")
-
-        model = joblib.load(MODEL_PATH)
-        vectorizer = joblib.load(VECTORIZER_PATH)
+        # Déjà chargé par le maître en mode pre-fork (src/api/serve.py) : on partage sa copie
+        load_artifacts()
         print(" Modèle et vectoriseur chargés avec succès.")
     except Exception as e:
         error_msg = f" Échec du chargement du modèle : {e}"
         print(error_msg)
         raise RuntimeError(error_msg)
 
+    # Créé après le chargement : en mode "process", les workers forkés héritent du modèle
+    if INFERENCE_POOL_MODE != "inline":
+        inference_pools.update((name, make_inference_pool()) for name in registries)
+
+    if SHADOW_SAMPLE_PERCENT > 0 and CANDIDATE in registries:
+        shadow_scorer = ShadowScorer(SHADOW_SAMPLE_PERCENT, max_workers=SHADOW_WORKERS,
+                                     max_pending=SHADOW_MAX_PENDING, on_result=record_shadow_result,
+                                     mode=SHADOW_POOL_MODE)
+
+    if MODEL_WATCH_INTERVAL > 0:
+        for model_registry in registries.values():
+            model_registry.start_watching(MODEL_WATCH_INTERVAL)
+
+
+@app.on_event("shutdown")
+async def shutdown_pool():
+    global shadow_scorer
+    for model_registry in registries.values():
+        await model_registry.stop_watching()
+    for pool in inference_pools.values():
+        pool.shutdown()
+    inference_pools.clear()
+    if shadow_scorer is not None:
+        shadow_scorer.shutdown()
+        shadow_scorer = None
+
 
 # ==============================
 # Endpoints
@@ -114,24 +563,63 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health",
-        "predict": "/predict_batch"
+        "metrics": "/metrics",
+        "predict": "/predict_batch",
+        "stream": "/predict_stream"
     }
 
 
 @app.get("/health")
 async def health_check():
-    if model is None or vectorizer is None:
+    if registry.current is None:
         raise HTTPException(status_code=503, detail="Modèle non chargé")
     return {
         "status": "healthy",
         "model_loaded": True,
+        "models": {name: model_registry.stats() for name, model_registry in registries.items()},
+        "candidate_traffic_percent": CANDIDATE_TRAFFIC_PERCENT if CANDIDATE in registries else None,
+        "cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "micro_batching": ({name: batcher.stats() for name, batcher in micro_batchers.items()}
+                           if micro_batchers is not None else None),
+        "inference_pool": ({name: pool.stats() for name, pool in inference_pools.items()}
+                           or None),
+        "shadow": shadow_scorer.stats() if shadow_scorer is not None else None,
         "timestamp": datetime.now().isoformat()
     }
 
 
+@app.post("/admin/reload")
+async def reload_model(request: Request, model: str = CURRENT, force: bool = False):
+    """
+    Recharge la version `model` depuis le disque sans redémarrer : chargement et
+    échauffement en arrière-plan, puis bascule atomique. `force` recharge même
+    si la version des artefacts n'a pas changé.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("x-admin-token", ""), ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
+    if model not in registries:
+        raise HTTPException(status_code=404, detail=f"Version de modèle inconnue : {model}")
+    try:
+        return await registries[model].reload(force=force)
+    except Exception as e:
+        raise HTTPException(status_code=500,
+                            detail=f"Échec du rechargement, modèle actuel conservé : {e}")
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Compteurs et histogrammes au format texte Prometheus."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métriques désactivées")
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
 @app.post("/predict_batch", response_model=BatchPredictionResponse)
-async def predict_batch(batch: CommentBatch):
-    if model is None or vectorizer is None:
+async def predict_batch(batch: CommentBatch, request: Request):
+    observe_validation(request)
+    if registry.current is None:
         raise HTTPException(status_code=503, detail="Modèle non chargé")
 
     try:
@@ -139,50 +627,97 @@ async def predict_batch(batch: CommentBatch):
         if not valid_comments:
             raise HTTPException(status_code=400, detail="Aucun commentaire valide.")
 
-        X_tfidf = vectorizer.transform(valid_comments)
-        predictions = model.predict(X_tfidf)
-        probabilities = model.predict_proba(X_tfidf)
-
-        results = []
-        for text, pred, proba in zip(valid_comments, predictions, probabilities):
-            results.append(
-                SentimentPrediction(
-                    text=text[:200],
-                    sentiment=label_to_sentiment(int(pred)),
-                    sentiment_score=int(pred),
-                    confidence=round(float(np.max(proba)), 4)
-                )
-            )
-
-        total = len(predictions)
-        pos = int(np.sum(predictions == 1))
-        neu = int(np.sum(predictions == 0))
-        neg = int(np.sum(predictions == -1))
-
-        stats = {
-            "total_comments": total,
-            "sentiment_counts": {"positive": pos, "neutral": neu, "negative": neg},
-            "sentiment_percentages": {
-                "positive": round(pos / total * 100, 2),
-                "neutral": round(neu / total * 100, 2),
-                "negative": round(neg / total * 100, 2),
-            },
-            "average_confidence": round(float(np.mean([r.confidence for r in results])), 4)
-        }
-
-        return BatchPredictionResponse(
-            predictions=results,
-            statistics=stats,
-            timestamp=datetime.now().isoformat()
-        )
+        slot = choose_model(request)
+        if METRICS_ENABLED:
+            batch_size_histogram.observe(len(valid_comments))
+            comment_length_histogram.observe_many([len(c) for c in valid_comments])
+            model_requests.inc(slot)
+
+        profiler = start_profiler(request)
+        try:
+            # Un seul passage : scores de décision → labels + confiances (cache d'abord),
+            # regroupé avec les requêtes concurrentes par le micro-batcher
+            inference_start = time.perf_counter()
+            if profiler is not None:
+                # Requête profilée : scorée seule, sans cache (une requête répétée
+                # donnerait un profil vide) et dans le thread observé par
+                # l'échantillonneur. Le profil ne montre donc ni l'attente dans le
+                # micro-batcher ou le pool, ni la validation de la requête.
+                predictions, confidences = await run_inference_async(valid_comments, slot,
+                                                                     inline=True, use_cache=False)
+            elif micro_batchers is not None:
+                predictions, confidences = await batched_inference_async(valid_comments, slot)
+            else:
+                predictions, confidences = await run_inference_async(valid_comments, slot)
+            if METRICS_ENABLED:
+                model_latency.observe(time.perf_counter() - inference_start, slot)
+                observe_predictions(slot, predictions, confidences)
+            submit_shadow(slot, valid_comments, predictions)
+
+            # Réponse construite depuis les tableaux NumPy et renvoyée pré-sérialisée :
+            # le response_model ne sert plus qu'à la documentation OpenAPI
+            with stage_timer("serialization"):
+                response = fast_json_response(
+                    build_batch_payload(valid_comments, predictions, confidences))
+            response.headers["X-Model-Version"] = slot
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+        return attach_profile(response, profiler) if profiler is not None else response
 
     except HTTPException:
         raise
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         print(f"Erreur interne dans /predict_batch : {e}")
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'analyse : {str(e)}")
 
 
+if PROFILING_ENABLED:
+    @app.get("/debug/profiles/{profile_id}")
+    async def get_profile(profile_id: str):
+        """Profil d'une requête /predict_batch (folded stacks, pour flamegraph.pl ou speedscope)."""
+        path = profile_store.path(profile_id)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Profil introuvable")
+        return FileResponse(path, media_type="text/plain; charset=utf-8")
+
+
+async def score_stream_chunk(texts: List[str], slot: str = CURRENT):
+    """Score un chunk du flux ; un flux long attend une place dans le pool plutôt qu'un 429."""
+    while True:
+        try:
+            return await run_inference_async(texts, slot)
+        except PoolSaturatedError:
+            await asyncio.sleep(0.05)
+
+
+@app.post("/predict_stream")
+async def predict_stream(request: Request):
+    """
+    Entrée NDJSON (une chaîne JSON ou un objet {"text": ...} par ligne, corps
+    éventuellement chunké). Sortie NDJSON : une ligne par prédiction, émise
+    chunk par chunk, puis une ligne finale {"type": "summary", ...}.
+
+    Pour les très gros flux, le client doit lire la réponse pendant l'envoi
+    (full-duplex) : sinon l'écriture serveur se bloque dès que les buffers TCP
+    sont pleins, ce qui garantit justement une mémoire serveur constante.
+    """
+    if registry.current is None:
+        raise HTTPException(status_code=503, detail="Modèle non chargé")
+
+    # Tout le flux est servi par une même version
+    slot = choose_model(request)
+    return DuplexStreamingResponse(
+        stream_predictions(request.stream(), partial(score_stream_chunk, slot=slot),
+                           chunk_size=STREAM_CHUNK_SIZE, max_line_bytes=STREAM_MAX_LINE_BYTES),
+        media_type="application/x-ndjson",
+        headers={"X-Model-Version": slot},
+    )
+
+
 # ==============================
 # Local Development Entry Point
 # ==============================
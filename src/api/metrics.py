@@ -0,0 +1,240 @@
+# metrics.py
+"""
+Métriques au format texte Prometheus (exposition 0.0.4), sans dépendance externe.
+
+Compteurs et histogrammes à buckets fixes, protégés par un verrou : ils peuvent
+être mis à jour depuis la boucle asyncio comme depuis les threads du pool
+d'inférence. Une observation coûte une recherche dichotomique et deux additions ;
+observe_many traite un tableau entier (ex. longueurs des commentaires) en une
+seule opération NumPy.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+# ==============================
+# Metric Types
+# ==============================
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Compteur monotone, éventuellement étiqueté (labels)."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}_total{_format_labels(self.labelnames, labels)} {_format_value(v)}"
+                for labels, v in items]
+
+
+class Histogram:
+    """Histogramme cumulatif à buckets fixes (bornes supérieures incluses, comme Prometheus)."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._edges = np.asarray(self.buckets)
+        # Par jeu de labels : [comptes par bucket (+Inf en dernier), somme]
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, labelvalues: LabelValues) -> list:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        return series
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._get(labelvalues)
+            series[0][index] += 1
+            series[1] += value
+
+    def observe_many(self, values: Iterable[float], *labelvalues: str) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        counts = np.bincount(np.searchsorted(self._edges, values, side="left"),
+                             minlength=len(self.buckets) + 1)
+        total = float(values.sum())
+        with self._lock:
+            series = self._get(labelvalues)
+            for i, count in enumerate(counts.tolist()):
+                series[0][i] += count
+            series[1] += total
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(s[0]), s[1])) for labels, s in self._series.items())
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} "
+                             f"{cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ==============================
+# Timing Helpers
+# ==============================
+
+class StageTimer:
+    """`with timer("transform"):` observe la durée du bloc dans l'histogramme des étapes."""
+
+    def __init__(self, histogram: Optional[Histogram]):
+        self.histogram = histogram
+
+    def __call__(self, stage: str) -> "_Stage":
+        return _Stage(self.histogram, stage)
+
+
+class _Stage:
+    __slots__ = ("histogram", "stage", "start")
+
+    def __init__(self, histogram: Optional[Histogram], stage: str):
+        self.histogram = histogram
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.histogram is not None:
+            self.histogram.observe(time.perf_counter() - self.start, self.stage)
+
+
+# ==============================
+# ASGI Middleware
+# ==============================
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI pur (pas BaseHTTPMiddleware) : compte les requêtes par route,
+    méthode et statut, et mesure leur durée, sans toucher au corps des requêtes
+    ni des réponses (compatible avec /predict_stream).
+
+    L'étiquette `endpoint` est le gabarit de la route (/debug/profiles/{profile_id}),
+    jamais le chemin brut : le nombre de séries reste borné par le nombre de routes.
+    """
+
+    def __init__(self, app, requests_total: Counter, request_duration: Histogram, router=None):
+        self.app = app
+        self.requests_total = requests_total
+        self.request_duration = request_duration
+        self.router = router
+        self._paths: Dict[Any, str] = {}
+
+    def _endpoint(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        # Starlette < 0.28 ne place que "endpoint" dans le scope : gabarit retrouvé
+        # via les routes du routeur. Chemins inconnus (404, scans) regroupés.
+        endpoint = scope.get("endpoint")
+        if endpoint is None or self.router is None:
+            return "other"
+        if endpoint not in self._paths:
+            self._paths = {getattr(r, "endpoint", None): getattr(r, "path", "other")
+                           for r in self.router.routes}
+        return self._paths.get(endpoint, "other")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = self._endpoint(scope)
+            self.requests_total.inc(endpoint, scope.get("method", ""), str(status["code"]))
+            self.request_duration.observe(time.perf_counter() - start, endpoint)
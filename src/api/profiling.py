@@ -0,0 +1,129 @@
+# profiling.py
+"""
+Profilage à la demande d'une requête, par échantillonnage.
+
+Un thread échantillonneur relève toutes les `interval` secondes la pile du
+thread profilé (sys._current_frames) et compte les piles identiques. Le
+résultat est au format « folded stacks » (une ligne `f1;f2;f3 N` par pile),
+directement lisible par flamegraph.pl, speedscope ou inferno.
+
+Contrairement à cProfile, le code profilé n'est pas instrumenté : le surcoût se
+limite au thread échantillonneur, et il est nul quand aucun profil n'est demandé.
+L'échantillonneur doit obtenir le GIL : pendant du code Python pur, la période
+effective est bornée par sys.getswitchinterval() (5 ms par défaut).
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+# ==============================
+# Sampling Profiler
+# ==============================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    `with SamplingProfiler() as profiler:` échantillonne le thread courant
+    pendant le bloc ; `profiler.folded()` renvoie les piles au format folded.
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.samples[tuple(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._start
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def folded(self) -> str:
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+# ==============================
+# Profile Storage
+# ==============================
+
+class ProfileStore:
+    """Profils enregistrés sur disque (<id>.folded), limités aux `max_files` plus récents."""
+
+    def __init__(self, directory: str, max_files: int = 100):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, folded: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = uuid.uuid4().hex
+        with open(os.path.join(self.directory, f"{profile_id}.folded"), "w") as f:
+            f.write(folded)
+        self._prune()
+        return profile_id
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """Chemin du profil, ou None si l'identifiant est invalide ou inconnu."""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.folded")
+        return path if os.path.exists(path) else None
+
+    def _prune(self) -> None:
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".folded")]
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        for entry in entries[:len(entries) - self.max_files]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,163 @@
+# registry.py
+"""
+Registre du modèle servi, rechargeable à chaud.
+
+Le modèle, le vectoriseur et leur version forment un ModelBundle immuable :
+les handlers lisent `registry.current` une fois par requête et travaillent sur
+ce bundle jusqu'au bout. Un rechargement charge et échauffe le nouveau bundle
+dans un thread, puis le publie par une simple affectation : aucune requête ne
+voit de modèle à moitié chargé ni un vectoriseur d'une version avec le modèle
+d'une autre, et les requêtes en cours terminent avec l'ancien.
+
+Le rechargement est déclenché soit explicitement (reload), soit par la
+surveillance des artefacts (watch) : une nouvelle version n'est chargée que
+lorsqu'elle est restée identique sur deux relevés consécutifs, pour ne pas
+lire un fichier en cours d'écriture.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+from src.api.inference import predict_texts
+
+WARMUP_TEXTS = ("great video", "worst video ever", "posted today")
+
+
+class ModelBundle(NamedTuple):
+    model: Any
+    vectorizer: Any
+    version: str
+    loaded_at: float
+
+
+# ==============================
+# Model Registry
+# ==============================
+
+class ModelRegistry:
+    """
+    `loader()` renvoie un ModelBundle chargé depuis les artefacts ;
+    `version_fn()` renvoie la version des artefacts sur disque sans les charger.
+    `on_swap(previous, bundle)` est appelé dans la boucle asyncio juste après
+    la publication d'un nouveau bundle (ex. recréer un pool de processus).
+    """
+
+    def __init__(self, loader: Callable[[], ModelBundle], version_fn: Callable[[], str],
+                 warmup_texts: Sequence[str] = WARMUP_TEXTS,
+                 on_swap: Optional[Callable[[ModelBundle, ModelBundle], None]] = None):
+        self.loader = loader
+        self.version_fn = version_fn
+        self.warmup_texts = list(warmup_texts)
+        self.on_swap = on_swap
+        self.current: Optional[ModelBundle] = None
+
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+        self.last_reload_seconds: Optional[float] = None
+        self._failed_version: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def _prepare(self) -> ModelBundle:
+        """Charge et échauffe un bundle (hors boucle asyncio lors d'un rechargement)."""
+        bundle = self.loader()
+        # Premier transform/predict hors requêtes : pas de pic de latence après la bascule
+        predict_texts(bundle.model, bundle.vectorizer, self.warmup_texts)
+        return bundle
+
+    def _swap(self, bundle: ModelBundle) -> None:
+        previous, self.current = self.current, bundle
+        if previous is not None and self.on_swap is not None:
+            self.on_swap(previous, bundle)
+
+    def load(self) -> ModelBundle:
+        """Chargement initial, synchrone."""
+        bundle = self._prepare()
+        self._swap(bundle)
+        return bundle
+
+    async def reload(self, force: bool = False) -> dict:
+        """
+        Charge la version présente sur disque si elle diffère de la version
+        servie (ou toujours avec `force`). En cas d'échec, le modèle servi est
+        conservé et l'exception propagée.
+        """
+        async with self._lock:
+            version = self.version_fn()
+            previous = self.current
+            if not force and previous is not None and version == previous.version:
+                return {"reloaded": False, "version": version}
+
+            start = time.perf_counter()
+            try:
+                bundle = await asyncio.to_thread(self._prepare)
+            except Exception as e:
+                self.failed_reloads += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self._failed_version = version
+                raise
+
+            self._swap(bundle)
+            self.reloads += 1
+            self.last_error = None
+            self._failed_version = None
+            self.last_reload_seconds = round(time.perf_counter() - start, 3)
+            print(f" Modèle rechargé en {self.last_reload_seconds} s ({bundle.version})")
+            return {
+                "reloaded": True,
+                "version": bundle.version,
+                "previous_version": previous.version if previous is not None else None,
+                "seconds": self.last_reload_seconds,
+            }
+
+    async def _watch(self, interval: float) -> None:
+        pending = None
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                version = self.version_fn()
+            except OSError:
+                # Artefact absent le temps d'un remplacement : on attend le relevé suivant
+                pending = None
+                continue
+
+            if self.current is not None and version == self.current.version:
+                pending = None
+            elif version == self._failed_version:
+                continue
+            elif version != pending:
+                pending = version
+            else:
+                try:
+                    await self.reload()
+                except Exception as e:
+                    print(f" Échec du rechargement du modèle, version actuelle conservée : {e}")
+                pending = None
+
+    def start_watching(self, interval: float) -> None:
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    def stats(self) -> dict:
+        current = self.current
+        return {
+            "version": current.version if current is not None else None,
+            "loaded_at": datetime.fromtimestamp(current.loaded_at).isoformat() if current else None,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+            "last_reload_seconds": self.last_reload_seconds,
+            "watching": self._watch_task is not None,
+        }
@@ -0,0 +1,126 @@
+# responses.py
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur json de la bibliothèque standard
+    orjson = None
+
+
+# ==============================
+# Constants
+# ==============================
+
+# Labels pré-rendus, indexés par label + 1 (-1 → 0, 0 → 1, 1 → 2)
+SENTIMENT_NAMES = ("negative", "neutral", "positive")
+_SENTIMENT_ARRAY = np.array(SENTIMENT_NAMES + ("unknown",), dtype=object)
+
+MAX_TEXT_LENGTH = 200
+
+
+# ==============================
+# Payload Building
+# ==============================
+
+def _label_indices(labels: np.ndarray) -> np.ndarray:
+    """Convertit les labels (-1, 0, 1) en indices 0..2, 3 pour un label inconnu."""
+    indices = np.asarray(labels, dtype=np.int64) + 1
+    indices[(indices < 0) | (indices > 2)] = 3
+    return indices
+
+
+def _format_statistics(neg: int, neu: int, pos: int, total: int,
+                       average_confidence: float) -> Dict[str, Any]:
+    return {
+        "total_comments": total,
+        "sentiment_counts": {"positive": pos, "neutral": neu, "negative": neg},
+        "sentiment_percentages": {
+            "positive": round(pos / total * 100, 2) if total else 0.0,
+            "neutral": round(neu / total * 100, 2) if total else 0.0,
+            "negative": round(neg / total * 100, 2) if total else 0.0,
+        },
+        "average_confidence": round(average_confidence, 4)
+    }
+
+
+def build_statistics(labels: np.ndarray, rounded_confidences: np.ndarray) -> Dict[str, Any]:
+    """Statistiques du batch calculées avec np.bincount, sans boucle Python par commentaire."""
+    counts = np.bincount(_label_indices(labels), minlength=4)
+    neg, neu, pos = (int(c) for c in counts[:3])
+    return _format_statistics(neg, neu, pos, int(len(labels)), float(rounded_confidences.mean()))
+
+
+class RunningStatistics:
+    """Statistiques cumulées chunk par chunk (mémoire constante) pour /predict_stream."""
+
+    def __init__(self):
+        self.counts = np.zeros(4, dtype=np.int64)
+        self.confidence_sum = 0.0
+        self.total = 0
+
+    def update(self, labels: np.ndarray, rounded_confidences: np.ndarray) -> None:
+        self.counts += np.bincount(_label_indices(labels), minlength=4)
+        self.confidence_sum += float(rounded_confidences.sum())
+        self.total += int(len(labels))
+
+    def as_dict(self) -> Dict[str, Any]:
+        neg, neu, pos = (int(c) for c in self.counts[:3])
+        average = self.confidence_sum / self.total if self.total else 0.0
+        return _format_statistics(neg, neu, pos, self.total, average)
+
+
+def build_predictions(texts: List[str], labels: np.ndarray,
+                      rounded_confidences: np.ndarray) -> List[Dict[str, Any]]:
+    """Une entrée par commentaire, à partir des tableaux NumPy (labels pré-rendus)."""
+    sentiments = _SENTIMENT_ARRAY[_label_indices(labels)].tolist()
+    scores = np.asarray(labels).astype(np.int64).tolist()
+    return [
+        {"text": text[:MAX_TEXT_LENGTH], "sentiment": sentiment,
+         "sentiment_score": score, "confidence": confidence}
+        for text, sentiment, score, confidence
+        in zip(texts, sentiments, scores, rounded_confidences.tolist())
+    ]
+
+
+def build_batch_payload(texts: List[str], labels: np.ndarray,
+                        confidences: np.ndarray) -> Dict[str, Any]:
+    """
+    Construit la réponse de /predict_batch directement depuis les tableaux NumPy.
+
+    Même structure que BatchPredictionResponse, mais sans instancier un objet
+    Pydantic par commentaire.
+    """
+    labels = np.asarray(labels)
+    rounded = np.round(np.asarray(confidences, dtype=np.float64), 4)
+
+    return {
+        "predictions": build_predictions(texts, labels, rounded),
+        "statistics": build_statistics(labels, rounded),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+# ==============================
+# Serialization
+# ==============================
+
+def dumps(payload: Dict[str, Any]) -> bytes:
+    """Sérialise en JSON avec orjson si disponible."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_json_response(payload: Dict[str, Any], status_code: int = 200) -> Response:
+    """
+    Réponse JSON pré-sérialisée : FastAPI renvoie un objet Response tel quel,
+    sans revalider le payload contre le response_model.
+    """
+    return Response(content=dumps(payload), status_code=status_code,
+                    media_type="application/json")
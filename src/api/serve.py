@@ -0,0 +1,177 @@
+# serve.py
+"""
+Mode de service multi-processus avec mémoire du modèle partagée.
+
+Le processus maître importe l'application (et donc charge le modèle) une seule
+fois, gèle le ramasse-miettes, ouvre le socket puis forke N workers uvicorn.
+Les pages du modèle restent partagées en copy-on-write entre les workers au
+lieu d'être dupliquées par chaque `uvicorn --workers N`.
+
+Un worker qui s'arrête (crash, OOM killer) est reforké par le maître, qui
+conserve le modèle : la capacité est rétablie sans rechargement. Si les
+workers meurent en boucle (ex. échec au démarrage), le maître arrête tout.
+
+Usage (depuis la racine du projet) :
+    python -m src.api.serve app_api:app --workers 4 --port 7860
+    MODEL_MMAP=1 python -m src.api.serve src.api.main:app --workers 4
+"""
+
+import argparse
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from collections import deque
+from typing import Set
+
+import uvicorn
+
+
+# ==============================
+# Helpers
+# ==============================
+
+def import_app(target: str):
+    """Importe `module:attribut` (ex. "app_api:app")."""
+    module_name, _, attribute = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute or "app")
+
+
+def preload_model(app_target: str) -> None:
+    """
+    Charge le modèle dans le maître pour les applications qui le chargent au
+    démarrage (src.api.main, app_api en MODEL_LOADING=background) plutôt qu'à l'import.
+    """
+    module = importlib.import_module(app_target.partition(":")[0])
+    loader = getattr(module, "load_artifacts", None)
+    if loader is not None and getattr(module, "model", None) is None:
+        loader()
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, log_level: str) -> None:
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+    if not server.started:
+        raise RuntimeError("Échec du démarrage du worker (lifespan startup)")
+
+
+def spawn_worker(app, sock: socket.socket, log_level: str) -> int:
+    """Forke un worker uvicorn (ne revient que dans le maître) et renvoie son pid."""
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            run_worker(app, sock, log_level)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+    print(f" Worker {pid} démarré", flush=True)
+    return pid
+
+
+# ==============================
+# Pre-fork Master
+# ==============================
+
+# Au-delà de MAX_RESPAWNS relances en RESPAWN_WINDOW secondes, le maître abandonne
+MAX_RESPAWNS = 5
+RESPAWN_WINDOW = 30.0
+
+
+def serve(app_target: str, host: str = "0.0.0.0", port: int = 8000,
+          workers: int = 2, log_level: str = "info") -> None:
+    if os.name != "posix":
+        raise RuntimeError("Le mode pre-fork nécessite fork() (Linux/macOS).")
+
+    # 1. Modèle chargé une seule fois, avant le fork
+    app = import_app(app_target)
+    preload_model(app_target)
+
+    # 2. Objets existants exclus du GC : les workers n'écrivent pas dans leurs
+    #    en-têtes, ce qui évite de dupliquer les pages partagées
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(host, port)
+    print(f" Maître {os.getpid()} : {workers} workers sur http://{host}:{port}")
+
+    children: Set[int] = {spawn_worker(app, sock, log_level) for _ in range(workers)}
+    stopping = False
+    respawns = deque()
+
+    def stop(signum):
+        nonlocal stopping
+        stopping = True
+        for child in list(children):
+            try:
+                os.kill(child, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, lambda signum, _frame: stop(signum))
+    signal.signal(signal.SIGTERM, lambda signum, _frame: stop(signum))
+
+    # 3. Supervision : tout worker arrêté hors demande d'arrêt est reforké
+    crash_loop = False
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if stopping:
+            continue
+
+        now = time.monotonic()
+        while respawns and now - respawns[0] > RESPAWN_WINDOW:
+            respawns.popleft()
+        if len(respawns) >= MAX_RESPAWNS:
+            print(f" Workers arrêtés {MAX_RESPAWNS} fois en {RESPAWN_WINDOW:.0f} s : arrêt du maître")
+            crash_loop = True
+            stop(signal.SIGTERM)
+            continue
+        respawns.append(now)
+        print(f" Worker {pid} arrêté (code {os.waitstatus_to_exitcode(status)}) : relance")
+        children.add(spawn_worker(app, sock, log_level))
+
+    sock.close()
+    if crash_loop:
+        raise RuntimeError("Workers en échec répété")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Service multi-processus à modèle partagé")
+    parser.add_argument("app", nargs="?", default="app_api:app", help="module:app à servir")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    serve(args.app, host=args.host, port=args.port, workers=args.workers,
+          log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# shadow.py
+"""
+Scoring fantôme (shadow) d'un modèle candidat sur une fraction du trafic.
+
+Après la réponse du modèle principal, une requête échantillonnée est rescorée
+par le candidat sur un pool dédié, hors du chemin de la réponse : la requête
+n'attend jamais le candidat. Le pool a une file bornée ; au-delà, les
+échantillons sont abandonnés (comptés dans `dropped`) plutôt que mis en attente,
+pour que le mode fantôme ne consomme jamais plus que `max_workers` workers.
+
+En mode "thread", le vectoriseur et le modèle du candidat s'exécutent dans le
+processus du serveur et lui disputent le GIL : la réponse n'attend pas le
+candidat, mais les requêtes concurrentes ralentissent. Le mode "process" évite
+cette contention (les workers forkés héritent du candidat) ; seul le coût CPU
+reste, à prévoir sur une machine déjà saturée.
+
+Mesure (benchmarks/load_test.py, 1 cœur, concurrence 8, sans cache ni
+micro-batch, 25 % d'échantillonnage) : p50 ~38 → ~44 ms et p99 ~71 → ~85 ms,
+dans les deux modes. Sur un seul cœur, le mode "process" ne gagne rien : il
+n'apporte un gain que si des cœurs restent libres.
+"""
+
+import asyncio
+import random
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from src.api.executor import InferencePool, PoolSaturatedError
+
+# (labels, confiances, (durée transform, durée scoring)), comme score_texts de main.py
+ScoreResult = Tuple[np.ndarray, np.ndarray, Tuple[float, float]]
+
+
+class ShadowScorer:
+    """
+    `submit(texts, primary_labels, score_fn)` échantillonne la requête et, si
+    elle est retenue, appelle `score_fn(texts)` en arrière-plan puis
+    `on_result(primary_labels, shadow_labels, timings)`.
+    """
+
+    def __init__(self, sample_percent: float, max_workers: int = 1, max_pending: int = 4,
+                 on_result: Optional[Callable[[np.ndarray, np.ndarray, Tuple[float, float]],
+                                              None]] = None,
+                 mode: str = "thread"):
+        self.sample_percent = sample_percent
+        self.on_result = on_result
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pool = self._make_pool()
+
+        self.sampled = 0
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.comments = 0
+        self.agreements = 0
+        self._tasks = set()
+
+    def _make_pool(self) -> InferencePool:
+        return InferencePool(mode=self.mode, max_workers=self.max_workers,
+                             max_queue=self.max_pending)
+
+    def restart(self) -> None:
+        """
+        Nouveau pool (ex. après un rechargement du candidat : les workers d'un
+        pool de processus gardent le modèle hérité au fork) ; l'ancien termine
+        ses tâches en cours.
+        """
+        previous, self.pool = self.pool, self._make_pool()
+        previous.shutdown(cancel_pending=False)
+
+    def submit(self, texts, primary_labels: np.ndarray,
+               score_fn: Callable[[list], ScoreResult]) -> bool:
+        """Renvoie True si la requête est rescorée par le candidat."""
+        if random.random() * 100 >= self.sample_percent:
+            return False
+        self.sampled += 1
+        if self.pool.in_flight >= self.pool.max_queue:
+            self.dropped += 1
+            return False
+
+        task = asyncio.create_task(self._score(list(texts), np.asarray(primary_labels), score_fn))
+        # Référence conservée jusqu'à la fin : une tâche non référencée peut être collectée
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _score(self, texts, primary_labels: np.ndarray, score_fn) -> None:
+        try:
+            labels, _, timings = await self.pool.run(score_fn, texts)
+        except PoolSaturatedError:
+            self.dropped += 1
+            return
+        except Exception as e:
+            self.failed += 1
+            print(f" Échec du scoring fantôme : {e}")
+            return
+
+        labels = np.asarray(labels)
+        self.completed += 1
+        self.comments += len(labels)
+        self.agreements += int(np.count_nonzero(labels == primary_labels))
+        if self.on_result is not None:
+            self.on_result(primary_labels, labels, timings)
+
+    async def drain(self) -> None:
+        """Attend les scorings fantômes en cours (tests, arrêt propre)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "sample_percent": self.sample_percent,
+            "sampled": self.sampled,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "in_flight": self.pool.in_flight,
+            "agreement_rate": round(self.agreements / self.comments, 4) if self.comments else None,
+        }
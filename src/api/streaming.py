@@ -0,0 +1,138 @@
+# streaming.py
+
+import json
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+from fastapi.responses import StreamingResponse
+
+from src.api.responses import RunningStatistics, build_predictions, dumps
+
+ScoreFn = Callable[[List[str]], Awaitable[Tuple[np.ndarray, np.ndarray]]]
+
+
+# ==============================
+# NDJSON Input
+# ==============================
+
+def parse_comment_line(line: bytes) -> str:
+    """
+    Une ligne NDJSON : soit une chaîne JSON, soit un objet {"text": ...}
+    (ou {"comment": ...}).
+    """
+    value = json.loads(line)
+    if isinstance(value, dict):
+        value = value.get("text", value.get("comment"))
+    if not isinstance(value, str):
+        raise ValueError("chaîne ou objet {\"text\": ...} attendu")
+    return value
+
+
+async def iter_lines(chunks: AsyncIterator[bytes],
+                     max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """
+    Découpe un flux d'octets (corps chunké) en lignes sans garder plus d'une
+    ligne en mémoire. Une ligne plus longue que `max_line_bytes` donne None.
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        parts = (buffer + chunk).split(b"\n")
+        buffer = parts.pop()
+        for line in parts:
+            if skipping:
+                # Fin de la ligne trop longue déjà signalée
+                skipping = False
+                continue
+            yield line if len(line) <= max_line_bytes else None
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield None
+            buffer = b""
+            skipping = True
+    if buffer and not skipping:
+        yield buffer
+
+
+# ==============================
+# NDJSON Output
+# ==============================
+
+def _line(payload: dict) -> bytes:
+    return dumps(payload) + b"\n"
+
+
+async def stream_predictions(chunks: AsyncIterator[bytes], score_fn: ScoreFn,
+                             chunk_size: int = 500,
+                             max_line_bytes: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """
+    Score un flux NDJSON de commentaires par chunks de taille fixe et renvoie les
+    prédictions en NDJSON au fil de l'eau, puis une ligne finale de statistiques.
+    La mémoire reste bornée par `chunk_size`, quelle que soit la taille du flux.
+    """
+    statistics = RunningStatistics()
+    texts: List[str] = []
+    indices: List[int] = []
+    invalid_lines = 0
+    index = 0
+
+    async def flush() -> bytes:
+        labels, confidences = await score_fn(texts)
+        labels = np.asarray(labels)
+        rounded = np.round(np.asarray(confidences, dtype=np.float64), 4)
+        statistics.update(labels, rounded)
+        out = b"".join(
+            _line({"type": "prediction", "index": i, **prediction})
+            for i, prediction in zip(indices, build_predictions(texts, labels, rounded))
+        )
+        texts.clear()
+        indices.clear()
+        return out
+
+    async for raw_line in iter_lines(chunks, max_line_bytes):
+        line_index = index
+        index += 1
+        if raw_line is not None and not raw_line.strip():
+            continue
+        try:
+            if raw_line is None:
+                raise ValueError(f"ligne plus longue que {max_line_bytes} octets")
+            text = parse_comment_line(raw_line).strip()
+        except ValueError as e:
+            invalid_lines += 1
+            yield _line({"type": "error", "index": line_index, "detail": str(e)})
+            continue
+        if not text:
+            continue
+
+        texts.append(text)
+        indices.append(line_index)
+        if len(texts) >= chunk_size:
+            yield await flush()
+
+    if texts:
+        yield await flush()
+
+    yield _line({
+        "type": "summary",
+        "statistics": statistics.as_dict(),
+        "invalid_lines": invalid_lines,
+        "timestamp": datetime.now().isoformat(),
+    })
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse qui n'écoute pas `receive()` pendant l'envoi.
+
+    La réponse standard consomme les messages entrants pour détecter la
+    déconnexion, ce qui vole le corps de la requête encore en cours de lecture
+    par le générateur. Ici c'est `request.stream()` qui lit le corps (et lève
+    ClientDisconnect si le client part).
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -1,6 +1,30 @@
+import argparse
 import pandas as pd
 import re
 import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.storage import DatasetWriter, save_dataset  # noqa: E402
+
+# Motifs compilés une seule fois au chargement du module
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+MENTION_PATTERN = re.compile(r'@\w+')
+HASHTAG_PATTERN = re.compile(r'#')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,!?\'-]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# À incrémenter à chaque changement du résultat de clean_text / clean_series :
+# le cache de prétraitement incrémental est indexé par cette version
+CLEAN_TEXT_VERSION = 1
+
+# Version rapide du motif d'URL : même résultat (https\S+ est déjà couvert par http\S+)
+FAST_URL_PATTERN = re.compile(r'(?:http|www)\S+')
 
 def clean_text(text):
     """
@@ -13,19 +37,19 @@ def clean_text(text):
     text = str(text)
     
     # Supprimer les URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = URL_PATTERN.sub('', text)
     
     # Supprimer les mentions (@username)
-    text = re.sub(r'@\w+', '', text)
+    text = MENTION_PATTERN.sub('', text)
     
     # Supprimer les hashtags (garder le texte)
-    text = re.sub(r'#', '', text)
+    text = HASHTAG_PATTERN.sub('', text)
     
     # Supprimer les caractères spéciaux (garder lettres, chiffres, espaces, ponctuation basique)
-    text = re.sub(r'[^\w\s.,!?\'-]', '', text)
+    text = SPECIAL_CHARS_PATTERN.sub('', text)
     
     # Supprimer les espaces multiples
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
     
     # Supprimer les espaces en début et fin
     text = text.strip()
@@ -35,10 +59,99 @@ def clean_text(text):
     
     return text
 
+def clean_series(texts):
+    """
+    Nettoie toute une colonne, avec un résultat identique à texts.apply(clean_text).
+    
+    Deux passes de clean_text sont fusionnées sans changer le résultat :
+    - '#' fait déjà partie des caractères spéciaux supprimés ensuite
+    - re.sub(r'\\s+', ' ', t).strip() == ' '.join(t.split()) (mêmes espaces Unicode)
+    """
+    remove_urls = FAST_URL_PATTERN.sub
+    remove_mentions = MENTION_PATTERN.sub
+    remove_special = SPECIAL_CHARS_PATTERN.sub
+    
+    missing = texts.isna().to_numpy()
+    cleaned = [
+        "" if is_missing else
+        " ".join(remove_special('', remove_mentions('', remove_urls('', str(text)))).split()).lower()
+        for text, is_missing in zip(texts.tolist(), missing.tolist())
+    ]
+    return pd.Series(cleaned, index=texts.index, dtype=object)
+
+def clean_cache_path(cache_dir):
+    """Fichier de cache associé à la version courante du nettoyage"""
+    return os.path.join(cache_dir, f"clean_cache_v{CLEAN_TEXT_VERSION}.parquet")
+
+def clean_series_cached(texts, cache_dir):
+    """
+    Comme clean_series, mais réutilise les textes déjà nettoyés lors d'un run
+    précédent. Chaque texte brut est identifié par son empreinte 64 bits
+    (pd.util.hash_pandas_object) ; seuls les textes nouveaux ou modifiés sont
+    nettoyés. Le cache est réécrit avec les seules empreintes du dataset courant,
+    il ne grossit donc pas au fil des runs.
+    
+    Renvoie (textes nettoyés, nombre de textes bruts distincts trouvés en cache).
+    """
+    cache_path = clean_cache_path(cache_dir)
+    hashes = pd.util.hash_pandas_object(texts, index=False)
+    unique_hashes = hashes.drop_duplicates()
+    
+    if os.path.exists(cache_path):
+        cache = pd.read_parquet(cache_path).set_index('hash')['text']
+        cache = cache[cache.index.isin(unique_hashes.values)]
+    else:
+        cache = pd.Series(dtype=object, index=pd.Index([], dtype='uint64', name='hash'))
+    n_hits = len(cache)
+    
+    # Nettoyer uniquement les textes absents du cache (un exemplaire par empreinte)
+    missing = unique_hashes[~unique_hashes.isin(cache.index)]
+    if len(missing):
+        cleaned_missing = clean_series(texts.loc[missing.index])
+        cache = pd.concat([cache, pd.Series(cleaned_missing.values,
+                                            index=pd.Index(missing.values, name='hash'))])
+        
+        # Écriture atomique : un run interrompu laisse l'ancien cache intact
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        cache.rename('text').reset_index().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+    
+    cleaned = cache.reindex(hashes.values)
+    return pd.Series(cleaned.values, index=texts.index, dtype=object), n_hits
+
+def clean_chunk(df, text_col, label_col='category', cleaned=None):
+    """
+    Nettoie un bloc du dataset brut : textes nettoyés, lignes vides et labels
+    manquants supprimés. Renvoie uniquement les colonnes 'text' et 'label'.
+    `cleaned` permet de fournir des textes déjà nettoyés (cache incrémental).
+    """
+    df = pd.DataFrame({
+        'text': clean_series(df[text_col]) if cleaned is None else cleaned,
+        # Mapper les labels (-1, 0, 1)
+        'label': df[label_col].map({-1: -1, 0: 0, 1: 1}),
+    })
+    
+    # Supprimer les lignes vides après nettoyage et les labels manquants
+    df = df[df['text'].str.len() > 0].dropna(subset=['label'])
+    
+    # Labels entiers quel que soit le bloc (NaN éventuels déjà supprimés)
+    df['label'] = df['label'].astype('int64')
+    return df
+
+def find_text_column(input_path):
+    """Lit uniquement l'en-tête du CSV pour choisir la colonne de texte"""
+    columns = pd.read_csv(input_path, nrows=0).columns
+    return 'clean_comment' if 'clean_comment' in columns else 'comment'
+
 def preprocess_dataset(input_path='data/raw/reddit.csv', 
-                       output_path='data/processed/reddit_clean.csv'):
+                       output_path='data/processed/reddit_clean.parquet',
+                       cache_dir=None):
     """
     Prétraite le dataset complet
+    
+    Avec `cache_dir`, seuls les commentaires nouveaux ou modifiés depuis le
+    dernier run sont nettoyés (voir clean_series_cached).
     """
     print("🔧 Chargement du dataset...")
     df = pd.read_csv(input_path)
@@ -51,24 +164,13 @@ def preprocess_dataset(input_path='data/raw/reddit.csv',
     
     print(f"\n Nettoyage de la colonne '{text_col}'...")
     
-    # Nettoyer les textes
-    df['text'] = df[text_col].apply(clean_text)
-    
-    # Supprimer les lignes vides après nettoyage
-    df = df[df['text'].str.len() > 0]
-    print(f" Après suppression des textes vides : {len(df)} lignes")
-    
-    # Renommer la colonne de label en 'label'
-    df['label'] = df[label_col]
-    
-    # Mapper les labels (-1, 0, 1)
-    df['label'] = df['label'].map({-1: -1, 0: 0, 1: 1})
-    
-    # Supprimer les lignes avec labels manquants
-    df = df.dropna(subset=['label'])
-    
-    # Garder uniquement les colonnes nécessaires
-    df_clean = df[['text', 'label']].copy()
+    # Nettoyer les textes, supprimer les lignes vides et les labels manquants
+    cleaned = None
+    if cache_dir:
+        cleaned, n_hits = clean_series_cached(df[text_col], cache_dir)
+        print(f" Cache : {n_hits} textes distincts déjà nettoyés réutilisés")
+    df_clean = clean_chunk(df, text_col, label_col, cleaned)
+    print(f" Après nettoyage : {len(df_clean)} lignes")
     
     # Analyse de la distribution
     print("\n Distribution finale des labels :")
@@ -81,16 +183,94 @@ def preprocess_dataset(input_path='data/raw/reddit.csv',
     print("\n Statistiques de longueur des textes :")
     print(df_clean['text_length'].describe())
     
-    # Sauvegarder
-    os.makedirs('data/processed', exist_ok=True)
-    df_clean.drop('text_length', axis=1).to_csv(output_path, index=False)
+    # Sauvegarder (format choisi par l'extension : .parquet, .arrow ou .csv)
+    save_dataset(df_clean.drop('text_length', axis=1), output_path)
     print(f"\n Dataset nettoyé sauvegardé : {output_path}")
     print(f" Total final : {len(df_clean)} commentaires")
     
     return df_clean
 
+def preprocess_dataset_chunked(input_path='data/raw/reddit.csv',
+                               output_path='data/processed/reddit_clean.parquet',
+                               chunksize=50_000, workers=None, max_pending=None):
+    """
+    Prétraite un gros CSV par blocs de `chunksize` lignes, nettoyés en parallèle
+    sur `workers` processus (par défaut : nombre de cœurs).
+    
+    Les blocs sont écrits dans l'ordre, au fur et à mesure. Au plus `max_pending`
+    blocs (par défaut 2 par worker) sont lus et pas encore écrits : la mémoire
+    reste bornée quelle que soit la taille du fichier.
+    
+    Renvoie un résumé (lignes lues, lignes écrites, distribution des labels)
+    plutôt que le DataFrame complet.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    
+    text_col = find_text_column(input_path)
+    label_col = 'category'
+    print(f"🔧 Prétraitement par blocs de {chunksize} lignes sur {workers} processus...")
+    
+    rows_read = rows_written = n_chunks = 0
+    label_counts = pd.Series(dtype='int64')
+    
+    reader = pd.read_csv(input_path, usecols=[text_col, label_col], chunksize=chunksize)
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            DatasetWriter(output_path) as output:
+        pending = deque()
+        
+        def write_oldest():
+            nonlocal rows_written, n_chunks, label_counts
+            chunk = pending.popleft().result()
+            output.write(chunk)
+            rows_written += len(chunk)
+            n_chunks += 1
+            label_counts = label_counts.add(chunk['label'].value_counts(), fill_value=0)
+        
+        for raw_chunk in reader:
+            rows_read += len(raw_chunk)
+            pending.append(executor.submit(clean_chunk, raw_chunk, text_col, label_col))
+            if len(pending) >= max_pending:
+                write_oldest()
+        while pending:
+            write_oldest()
+    
+    label_counts = label_counts.astype('int64').sort_index()
+    print(f" Lignes lues : {rows_read} ({n_chunks} blocs)")
+    print("\n Distribution finale des labels :")
+    print(label_counts)
+    print(f"\n Dataset nettoyé sauvegardé : {output_path}")
+    print(f" Total final : {rows_written} commentaires")
+    
+    return {
+        'rows_read': rows_read,
+        'rows_written': rows_written,
+        'chunks': n_chunks,
+        'label_counts': {int(k): int(v) for k, v in label_counts.items()},
+    }
+
 if __name__ == "__main__":
-    df_clean = preprocess_dataset()
+    parser = argparse.ArgumentParser(description="Prétraitement du dataset brut")
+    parser.add_argument("--input", default="data/raw/reddit.csv")
+    parser.add_argument("--output", default="data/processed/reddit_clean.parquet",
+                        help="Fichier de sortie (.parquet, .arrow ou .csv)")
+    parser.add_argument("--chunksize", type=int, default=0,
+                        help="Lignes par bloc (0 : tout le fichier en mémoire)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus de nettoyage en mode par blocs (défaut : nombre de cœurs)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Prétraitement incrémental : ne nettoie que les commentaires "
+                             "nouveaux ou modifiés (ex. data/cache)")
+    args = parser.parse_args()
+    
+    if args.chunksize > 0 and args.cache_dir:
+        parser.error("--cache-dir n'est pas disponible en mode par blocs (--chunksize)")
     
-    print("\n Exemples de commentaires nettoyés :")
-    print(df_clean.sample(5))
\ No newline at end of file
+    if args.chunksize > 0:
+        preprocess_dataset_chunked(args.input, args.output,
+                                   chunksize=args.chunksize, workers=args.workers)
+    else:
+        df_clean = preprocess_dataset(args.input, args.output, cache_dir=args.cache_dir)
+        
+        print("\n Exemples de commentaires nettoyés :")
+        print(df_clean.sample(5))
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Lecture / écriture des datasets prétraités.
+
+Le format est choisi d'après l'extension du fichier :
+- .csv              : texte, relu et re-parsé à chaque chargement
+- .parquet          : colonnaire typé et compressé (label en int8)
+- .arrow / .feather : Arrow IPC non compressé, lisible en mémoire mappée
+                      (les colonnes pointent directement dans le fichier)
+"""
+
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow n'est nécessaire que pour les formats colonnaires
+    pa = None
+
+CSV_EXTENSIONS = ('.csv',)
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+
+def storage_format(path):
+    """Renvoie 'csv', 'parquet' ou 'arrow' selon l'extension du fichier"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return 'csv'
+    if extension in PARQUET_EXTENSIONS:
+        return 'parquet'
+    if extension in ARROW_EXTENSIONS:
+        return 'arrow'
+    raise ValueError(f"Extension non supportée : {path} (.csv, .parquet ou .arrow attendu)")
+
+
+def _require_pyarrow(path):
+    if pa is None:
+        raise ImportError(f"pyarrow est requis pour lire/écrire {path} (pip install pyarrow)")
+
+
+def _schema():
+    # Schéma typé : le label (-1, 0, 1) tient sur un octet
+    return pa.schema([('text', pa.string()), ('label', pa.int8())])
+
+
+def _to_table(df):
+    return pa.Table.from_pandas(df[['text', 'label']].astype({'label': 'int8'}),
+                                schema=_schema(), preserve_index=False)
+
+
+def save_dataset(df, path):
+    """Sauvegarde le dataset prétraité (colonnes 'text' et 'label') au format de l'extension"""
+    fmt = storage_format(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+        return path
+
+    _require_pyarrow(path)
+    table = _to_table(df)
+    if fmt == 'parquet':
+        pq.write_table(table, path, compression='zstd')
+    else:
+        # Non compressé : condition pour une lecture en mémoire mappée sans copie
+        feather.write_feather(table, path, compression='uncompressed')
+    return path
+
+
+def load_dataset(path, memory_map=False, columns=None):
+    """
+    Charge un dataset prétraité.
+
+    memory_map=True lit le fichier via mmap : pour Arrow IPC, les données restent
+    dans le cache de pages du système (partageables, non comptées deux fois) au
+    lieu d'être copiées dans le tas du processus.
+    """
+    fmt = storage_format(path)
+
+    if fmt == 'csv':
+        df = pd.read_csv(path, usecols=columns)
+        if 'label' in df.columns:
+            df['label'] = df['label'].astype('int8')
+        return df
+
+    _require_pyarrow(path)
+    if fmt == 'parquet':
+        table = pq.read_table(path, columns=columns, memory_map=memory_map)
+    else:
+        table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def iter_dataset(path, batch_size=10_000, columns=None):
+    """
+    Parcourt un dataset prétraité par blocs de `batch_size` lignes (DataFrames),
+    sans jamais charger le fichier complet en mémoire.
+    """
+    fmt = storage_format(path)
+
+    if fmt == 'csv':
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=batch_size):
+            if 'label' in chunk.columns:
+                chunk['label'] = chunk['label'].astype('int8')
+            yield chunk
+        return
+
+    _require_pyarrow(path)
+    if fmt == 'parquet':
+        batches = pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns)
+        for batch in batches:
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        # Les record batches du fichier peuvent être plus gros que batch_size : les redécouper
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size).to_pandas()
+
+
+class DatasetWriter:
+    """
+    Écriture incrémentale d'un dataset, bloc par bloc (prétraitement par blocs).
+    Le fichier est complet (en-tête CSV ou schéma Arrow) même si aucun bloc n'est écrit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = storage_format(path)
+        if self.format != 'csv':
+            _require_pyarrow(path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        if self.format == 'csv':
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+            self._header = True
+        elif self.format == 'parquet':
+            self._writer = pq.ParquetWriter(path, _schema(), compression='zstd')
+        else:
+            self._writer = pa.ipc.new_file(path, _schema())
+
+    def write(self, df):
+        if self.format == 'csv':
+            df[['text', 'label']].to_csv(self._file, index=False, header=self._header)
+            self._header = False
+        else:
+            self._writer.write_table(_to_table(df))
+
+    def close(self):
+        if self.format == 'csv':
+            if self._header:
+                self._file.write('text,label\n')
+            self._file.close()
+        else:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
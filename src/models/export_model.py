@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.api.compact_model import FORMAT_NAME, FORMAT_VERSION, MANIFEST_FILE  # noqa: E402
+from src.api.inference import proba_mode  # noqa: E402
+
+
+def _check_vectorizer(vectorizer):
+    """Vérifie que le vectoriseur est reproductible par le chargeur compact"""
+    if not hasattr(vectorizer, "vocabulary_") or not hasattr(vectorizer, "idf_"):
+        raise ValueError("Seul un TfidfVectorizer entraîné (avec vocabulaire) peut être exporté")
+
+    unsupported = []
+    if vectorizer.analyzer != "word":
+        unsupported.append(f"analyzer={vectorizer.analyzer!r}")
+    if vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        unsupported.append("tokenizer/preprocessor personnalisé")
+    if vectorizer.stop_words is not None:
+        unsupported.append("stop_words")
+    if vectorizer.strip_accents not in (None, "unicode", "ascii"):
+        unsupported.append(f"strip_accents={vectorizer.strip_accents!r}")
+    if vectorizer.binary:
+        unsupported.append("binary=True")
+    if vectorizer.norm not in (None, "l1", "l2"):
+        unsupported.append(f"norm={vectorizer.norm!r}")
+    if unsupported:
+        raise ValueError(f"Paramètres non supportés par l'export compact : {', '.join(unsupported)}")
+
+
+def _publish_directory(version_dir, output_dir):
+    """
+    Fait pointer `output_dir` (lien symbolique) vers `version_dir`, atomiquement,
+    puis supprime les versions antérieures à la précédente.
+
+    Une API peut avoir mappé en mémoire (mmap) les .npy de la version servie :
+    réécrire ces fichiers modifierait le modèle en pleine requête (voire SIGBUS
+    si le fichier raccourcit). Chaque export est donc écrit dans un nouveau
+    dossier. La version précédente est conservée jusqu'à l'export suivant : un
+    chargement qui a déjà résolu le lien vers elle, ou un worker qui la mappe
+    encore, trouve toujours ses fichiers.
+    """
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    name = os.path.basename(os.path.abspath(output_dir))
+
+    previous = _detach_current(output_dir, parent, name)
+
+    link_tmp = os.path.join(parent, f".{name}.link-{uuid.uuid4().hex}")
+    os.symlink(os.path.basename(version_dir), link_tmp)
+    os.replace(link_tmp, output_dir)
+
+    _remove_versions(parent, name, keep=(version_dir, previous))
+
+
+def _detach_current(output_dir, parent, name):
+    """
+    Dossier de la version publiée (ou None). Un ancien export en dossier réel
+    est d'abord renommé en dossier de version, jamais réécrit.
+    """
+    if os.path.islink(output_dir):
+        return os.path.realpath(output_dir)
+    if os.path.isdir(output_dir):
+        if not os.listdir(output_dir):
+            os.rmdir(output_dir)
+            return None
+        version_dir = os.path.join(parent, f".{name}.{uuid.uuid4().hex}")
+        os.rename(output_dir, version_dir)
+        return version_dir
+    return None
+
+
+def _remove_versions(parent, name, keep=()):
+    """Supprime les dossiers de version `.{name}.*` de `parent`, sauf ceux de `keep`"""
+    keep = {os.path.realpath(path) for path in keep if path}
+    for entry in os.listdir(parent):
+        path = os.path.join(parent, entry)
+        if (entry.startswith(f".{name}.") and os.path.realpath(path) not in keep
+                and os.path.isdir(path) and not os.path.islink(path)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_compact_model(output_dir='models/compact'):
+    """
+    Dépublie l'artefact compact, ex. quand le modèle entraîné ne peut pas être
+    exporté : un export plus ancien ne doit pas rester servi à côté d'un nouveau
+    modèle joblib. Comme pour un export, le dossier de la dernière version est
+    conservé (lecteurs en cours) et supprimé au prochain export ou retrait.
+    Renvoie True si un artefact publié a été retiré.
+    """
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    name = os.path.basename(os.path.abspath(output_dir))
+    if not os.path.isdir(parent):
+        return False
+
+    removed = os.path.lexists(output_dir)
+    if os.path.isfile(output_dir):
+        os.unlink(output_dir)
+        previous = None
+    else:
+        previous = _detach_current(output_dir, parent, name)
+        if os.path.islink(output_dir):
+            os.unlink(output_dir)
+    _remove_versions(parent, name, keep=(previous,))
+    if removed:
+        print(f"🗑️ Artefact compact obsolète supprimé : {output_dir}")
+    return removed
+
+
+def export_compact_model(model, vectorizer, output_dir='models/compact'):
+    """
+    Exporte TfidfVectorizer + LogisticRegression en artefact compact versionné :
+    vocabulaire, vecteur IDF et coefficients en .npy (sans pickle)
+    """
+    print(f"\n📦 Export de l'artefact compact : {output_dir}")
+    _check_vectorizer(vectorizer)
+
+    mode = proba_mode(model)
+    if not mode:
+        raise ValueError("Seuls les modèles linéaires (decision_function) peuvent être exportés")
+
+    # Vocabulaire ordonné par colonne : terms[i] est le terme de la colonne i
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    terms = terms.astype(str)
+
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    arrays = {
+        "terms": terms,
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "coef": np.ascontiguousarray(coef.T),
+        "intercept": np.asarray(model.intercept_, dtype=np.float64),
+        "classes": np.asarray(model.classes_),
+    }
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "n_features": int(len(vectorizer.idf_)),
+        "proba_mode": mode,
+        "vectorizer": {
+            "lowercase": bool(vectorizer.lowercase),
+            "strip_accents": vectorizer.strip_accents,
+            "token_pattern": vectorizer.token_pattern,
+            "ngram_range": list(vectorizer.ngram_range),
+            "sublinear_tf": bool(vectorizer.sublinear_tf),
+            "use_idf": bool(vectorizer.use_idf),
+            "norm": vectorizer.norm,
+        },
+        "classes": [c.item() for c in arrays["classes"]],
+    }
+
+    # Écrit dans un dossier neuf (.compact.<aléa>), publié ensuite par lien symbolique
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    version_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(os.path.abspath(output_dir))}.",
+                                   dir=parent)
+    for name, array in arrays.items():
+        np.save(os.path.join(version_dir, f"{name}.npy"), array, allow_pickle=False)
+    # Manifest écrit en dernier : un dossier sans manifest est un export incomplet
+    with open(os.path.join(version_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.chmod(version_dir, 0o755)
+    _publish_directory(version_dir, output_dir)
+
+    size = sum(os.path.getsize(os.path.join(output_dir, f)) for f in os.listdir(output_dir))
+    print(f"✅ Artefact compact exporté ({size / 1024:.1f} Ko, {len(terms)} termes)")
+    return output_dir
+
+
+def main():
+    """Exporte les artefacts joblib existants au format compact"""
+    model = joblib.load('models/sentiment_model.joblib')
+    vectorizer = joblib.load('models/vectorizer.joblib')
+    export_compact_model(model, vectorizer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Cache disque des matrices de features (TF-IDF / hashing) entre expériences.
+
+Une matrice est identifiée par l'empreinte des textes (contenu et ordre) et
+celle du vectoriseur : ses paramètres avant le fit ; pour un simple transform,
+la clé du fit qui l'a produit (retenue en mémoire, hors de l'estimateur), ou à
+défaut l'empreinte de son état appris. Changer uniquement les hyperparamètres
+du classifieur réutilise donc la matrice sans re-tokeniser le corpus.
+
+Le vectoriseur n'est jamais modifié : c'est l'artefact sauvegardé puis servi.
+
+Fichiers (dans cache_dir) :
+- <clé>.npz                  : matrice creuse (scipy.sparse.save_npz)
+- <clé>.vectorizer.joblib    : vectoriseur entraîné (fit_transform uniquement)
+"""
+
+import os
+import weakref
+
+import joblib
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+
+# À incrémenter si le format des fichiers du cache change
+FEATURE_CACHE_VERSION = 2
+
+# Vectoriseur entraîné ou relu par cached_fit_transform -> clé de son fit
+_fit_keys = weakref.WeakKeyDictionary()
+
+
+def texts_fingerprint(texts):
+    """Empreinte du contenu et de l'ordre des textes (indépendante de l'index pandas)"""
+    hashes = pd.util.hash_pandas_object(pd.Series(texts).reset_index(drop=True), index=False)
+    return joblib.hash(hashes.to_numpy())
+
+
+def vectorizer_fingerprint(vectorizer):
+    """
+    Empreinte du vectoriseur. Pour un vectoriseur issu de cached_fit_transform
+    dans ce processus, la clé de son fit : cela évite de hacher son état complet
+    (stop_words_ d'un TfidfVectorizer à max_features peut compter des centaines
+    de milliers de termes).
+    """
+    fit_key = _fit_keys.get(vectorizer)
+    return fit_key if fit_key is not None else joblib.hash(vectorizer)
+
+
+def cache_key(kind, texts, vectorizer):
+    """Clé = type d'opération + textes + vectoriseur (+ versions qui changent le résultat)"""
+    return joblib.hash((FEATURE_CACHE_VERSION, sklearn.__version__, kind,
+                        texts_fingerprint(texts), vectorizer_fingerprint(vectorizer)))
+
+
+def _save_npz_atomic(path, matrix):
+    tmp_path = path[:-len('.npz')] + '.tmp.npz'
+    sp.save_npz(tmp_path, matrix.tocsr(), compressed=False)
+    os.replace(tmp_path, path)
+
+
+def cached_fit_transform(vectorizer, texts, cache_dir):
+    """
+    Équivalent de vectorizer.fit_transform(texts) avec cache disque.
+    Renvoie (vectoriseur entraîné, matrice).
+    """
+    if not cache_dir:
+        return vectorizer, vectorizer.fit_transform(texts)
+
+    key = cache_key('fit_transform', texts, vectorizer)
+    matrix_path = os.path.join(cache_dir, f"{key}.npz")
+    vectorizer_path = os.path.join(cache_dir, f"{key}.vectorizer.joblib")
+
+    if os.path.exists(matrix_path) and os.path.exists(vectorizer_path):
+        print(f"♻️  Matrice de features réutilisée depuis le cache ({key[:12]})")
+        vectorizer = joblib.load(vectorizer_path)
+        _fit_keys[vectorizer] = key
+        return vectorizer, sp.load_npz(matrix_path)
+
+    matrix = vectorizer.fit_transform(texts)
+    _fit_keys[vectorizer] = key
+    os.makedirs(cache_dir, exist_ok=True)
+    # Vectoriseur écrit avant la matrice : la présence du .npz signale une entrée complète
+    joblib.dump(vectorizer, vectorizer_path)
+    _save_npz_atomic(matrix_path, matrix)
+    return vectorizer, matrix
+
+
+def cached_transform(vectorizer, texts, cache_dir):
+    """Équivalent de vectorizer.transform(texts) avec cache disque (vectoriseur déjà entraîné)"""
+    if not cache_dir:
+        return vectorizer.transform(texts)
+
+    key = cache_key('transform', texts, vectorizer)
+    matrix_path = os.path.join(cache_dir, f"{key}.npz")
+
+    if os.path.exists(matrix_path):
+        print(f"♻️  Matrice de features réutilisée depuis le cache ({key[:12]})")
+        return sp.load_npz(matrix_path)
+
+    matrix = vectorizer.transform(texts)
+    os.makedirs(cache_dir, exist_ok=True)
+    _save_npz_atomic(matrix_path, matrix)
+    return matrix
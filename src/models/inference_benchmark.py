@@ -0,0 +1,95 @@
+"""
+Mesure de la latence d'inférence de bout en bout, partagée par evaluate_model
+et benchmarks/bench_inference.py.
+
+Le scoring mesuré est celui de l'API : nettoyage (clean_series) → vectorisation
+→ labels et confiances (predict_with_confidence, équivalent de predict +
+predict_proba) → construction et sérialisation de la réponse JSON. Chaque
+mesure commence par des exécutions d'échauffement non comptées, puis répète
+l'appel et rapporte des percentiles plutôt qu'un temps unique.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.api.inference import predict_with_confidence  # noqa: E402
+from src.api.responses import build_batch_payload, dumps  # noqa: E402
+from src.data.preprocess_data import clean_series  # noqa: E402
+
+STAGES = ('clean', 'transform', 'predict', 'response')
+PERCENTILES = (50, 90, 99)
+
+
+def score_end_to_end(model, vectorizer, texts, timings=None):
+    """
+    Pipeline complet sur un batch de textes bruts ; renvoie le JSON sérialisé.
+    Si `timings` est fourni, la durée de chaque étape (ns) y est ajoutée.
+    """
+    t0 = time.perf_counter_ns()
+    cleaned = clean_series(pd.Series(texts, dtype=object)).tolist()
+    t1 = time.perf_counter_ns()
+    X = vectorizer.transform(cleaned)
+    t2 = time.perf_counter_ns()
+    labels, confidences = predict_with_confidence(model, X)
+    t3 = time.perf_counter_ns()
+    body = dumps(build_batch_payload(cleaned, labels, confidences))
+    t4 = time.perf_counter_ns()
+
+    if timings is not None:
+        for stage, start, end in zip(STAGES, (t0, t1, t2, t3), (t1, t2, t3, t4)):
+            timings.setdefault(stage, []).append(end - start)
+    return body
+
+
+def summarize(samples_ns, batch_size):
+    """Statistiques en ms (moyenne, percentiles) et débit en commentaires/s"""
+    samples_ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    stats = {
+        'mean_ms': round(float(samples_ms.mean()), 4),
+        'min_ms': round(float(samples_ms.min()), 4),
+    }
+    for p in PERCENTILES:
+        stats[f'p{p}_ms'] = round(float(np.percentile(samples_ms, p)), 4)
+    stats['comments_per_second'] = round(batch_size / (float(np.median(samples_ms)) / 1e3), 1)
+    return stats
+
+
+def measure_latency(model, vectorizer, texts, warmup=3, repeats=20, min_seconds=0.0):
+    """
+    Mesure score_end_to_end sur `texts` : `warmup` appels ignorés, puis au moins
+    `repeats` appels (et au moins `min_seconds` de mesure). Renvoie les
+    statistiques globales et par étape.
+    """
+    for _ in range(warmup):
+        score_end_to_end(model, vectorizer, texts)
+
+    totals, timings = [], {}
+    start = time.perf_counter()
+    while len(totals) < repeats or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter_ns()
+        score_end_to_end(model, vectorizer, texts, timings)
+        totals.append(time.perf_counter_ns() - t0)
+
+    result = {'batch_size': len(texts), 'runs': len(totals),
+              **summarize(totals, len(texts))}
+    result['stages'] = {
+        stage: {k: v for k, v in summarize(timings[stage], len(texts)).items()
+                if k != 'comments_per_second'}
+        for stage in STAGES
+    }
+    return result
+
+
+def make_batch(texts, batch_size, seed=0):
+    """Batch de `batch_size` textes tirés (avec remise) dans `texts`"""
+    rng = np.random.default_rng(seed)
+    texts = list(texts)
+    return [texts[i] for i in rng.integers(0, len(texts), size=batch_size)]
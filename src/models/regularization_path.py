@@ -0,0 +1,104 @@
+"""
+Chemin de régularisation à démarrage à chaud pour LogisticRegression.
+
+Les valeurs de C sont ajustées par ordre croissant sur chaque fold ; chaque fit
+part des coefficients du C précédent (warm_start=True). Une régularisation plus
+faible déplace peu la solution : les fits suivants convergent en quelques
+itérations, si bien que le coût total croît moins vite que le nombre de C.
+
+warm_start n'est pris en compte que par les solveurs lbfgs, newton-cg, sag et
+saga (liblinear l'ignore).
+"""
+
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+WARM_START_SOLVERS = ('lbfgs', 'newton-cg', 'sag', 'saga')
+
+
+class WarmStartPath:
+    """
+    Recherche de C par validation croisée le long d'un chemin à démarrage à chaud.
+
+    Expose la même interface que GridSearchCV après fit (best_params_,
+    best_score_, best_estimator_, cv_results_) ainsi que `path_` : pour chaque C,
+    F1 moyen, itérations cumulées sur les folds et temps de fit.
+    """
+
+    def __init__(self, estimator=None, Cs=(0.01, 0.1, 1.0, 10.0, 100.0), cv=5,
+                 warm_start=True, scoring_average='weighted', n_jobs=None):
+        self.estimator = estimator if estimator is not None else LogisticRegression(
+            solver='saga', max_iter=500, random_state=42, class_weight='balanced')
+        self.Cs = sorted(Cs)
+        self.cv = cv
+        self.warm_start = warm_start
+        self.scoring_average = scoring_average
+        self.n_jobs = n_jobs
+
+        solver = self.estimator.get_params()['solver']
+        if warm_start and solver not in WARM_START_SOLVERS:
+            raise ValueError(f"Le solveur {solver!r} ignore warm_start "
+                             f"(utiliser l'un de {WARM_START_SOLVERS})")
+
+    def _new_estimator(self):
+        return clone(self.estimator).set_params(warm_start=self.warm_start)
+
+    def _fit_path(self, estimator, X, y, Cs, on_fit):
+        """Ajuste `estimator` pour chaque C (croissant) ; on_fit(i, estimator, secondes)"""
+        for i, C in enumerate(Cs):
+            estimator.set_params(C=C)
+            start = time.perf_counter()
+            estimator.fit(X, y)
+            on_fit(i, estimator, time.perf_counter() - start)
+        return estimator
+
+    def _fit_fold(self, X, y, train_idx, val_idx):
+        """Chemin complet sur un fold : (F1 par C, itérations par C, secondes par C)"""
+        n_Cs = len(self.Cs)
+        scores, iterations, seconds = np.zeros(n_Cs), np.zeros(n_Cs, dtype=np.int64), np.zeros(n_Cs)
+        X_val, y_val = X[val_idx], y[val_idx]
+
+        def record(i, estimator, elapsed):
+            iterations[i] = int(np.max(estimator.n_iter_))
+            seconds[i] = elapsed
+            scores[i] = f1_score(y_val, estimator.predict(X_val), average=self.scoring_average)
+
+        self._fit_path(self._new_estimator(), X[train_idx], y[train_idx], self.Cs, record)
+        return scores, iterations, seconds
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        # Les folds sont indépendants (parallélisables) ; le chemin, lui, est séquentiel
+        folds = StratifiedKFold(n_splits=self.cv).split(np.zeros(len(y)), y)
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(self._fit_fold)(X, y, train_idx, val_idx) for train_idx, val_idx in folds
+        )
+        scores = np.array([r[0] for r in results])
+        iterations = np.sum([r[1] for r in results], axis=0)
+        seconds = np.sum([r[2] for r in results], axis=0)
+
+        mean_scores = scores.mean(axis=0)
+        best = int(np.argmax(mean_scores))
+        self.best_params_ = {'C': self.Cs[best]}
+        self.best_score_ = float(mean_scores[best])
+        self.cv_results_ = {
+            'params': [{'C': C} for C in self.Cs],
+            'mean_test_score': mean_scores,
+            'std_test_score': scores.std(axis=0),
+        }
+        self.path_ = [
+            {'C': C, 'cv_f1': round(float(mean_scores[i]), 4),
+             'n_iter': int(iterations[i]), 'seconds': round(float(seconds[i]), 3)}
+            for i, C in enumerate(self.Cs)
+        ]
+
+        # Modèle final sur tout le train set, lui aussi le long du chemin jusqu'au meilleur C
+        self.best_estimator_ = self._fit_path(self._new_estimator(), X, y,
+                                              self.Cs[:best + 1], lambda *args: None)
+        return self
@@ -0,0 +1,199 @@
+"""
+Entraînement incrémental (out-of-core) du modèle de sentiment.
+
+Le dataset prétraité est lu par mini-batchs depuis le disque, vectorisé par un
+HashingVectorizer (sans état, aucun vocabulaire à apprendre) et appris par un
+SGDClassifier(loss='log_loss') via partial_fit : la mémoire dépend de la taille
+des mini-batchs, pas de celle du corpus.
+
+Un checkpoint (modèle + vectoriseur + compteurs) est sauvegardé régulièrement ;
+--resume reprend depuis ce checkpoint pour intégrer de nouveaux commentaires
+labellisés sans réentraîner depuis zéro.
+
+Usage (depuis la racine du projet) :
+    python src/models/train_incremental.py --data data/processed/reddit_clean.parquet
+    python src/models/train_incremental.py --data data/processed/new_comments.parquet --resume
+
+Le modèle obtenu est servi par l'API comme version candidate :
+    CANDIDATE_MODEL_DIR=models/incremental uvicorn src.api.main:app
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.storage import iter_dataset  # noqa: E402
+
+CLASSES = np.array([-1, 0, 1])
+CHECKPOINT_VERSION = 1
+
+
+def build_hashing_vectorizer(n_features_bits=20):
+    """Featuriseur sans état : mêmes n-grammes que le TF-IDF, normalisation L2 par document"""
+    return HashingVectorizer(
+        n_features=2 ** n_features_bits,
+        ngram_range=(1, 2),
+        strip_accents='unicode',
+        alternate_sign=False,
+        norm='l2'
+    )
+
+
+def build_sgd_model(alpha=1e-5, random_state=42):
+    return SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)
+
+
+def is_holdout(texts, test_percent):
+    """
+    Split train/test déterministe et sans état : un commentaire est dans le test
+    set si l'empreinte de son texte tombe dans les `test_percent` premiers
+    pourcents. Le même commentaire reste du même côté d'un run à l'autre.
+    """
+    buckets = pd.util.hash_pandas_object(texts, index=False).to_numpy() % 100
+    return buckets < test_percent
+
+
+# ==============================
+# Checkpoints
+# ==============================
+
+def save_checkpoint(state, path):
+    """Écriture atomique : un entraînement interrompu laisse le checkpoint précédent intact"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    state = joblib.load(path)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint incompatible : {path} (version {state.get('version')})")
+    return state
+
+
+# ==============================
+# Training
+# ==============================
+
+def train_incremental(data_path, checkpoint_path='models/incremental/checkpoint.joblib',
+                      resume=False, batch_size=10_000, epochs=1, test_percent=20,
+                      n_features_bits=20, alpha=1e-5, checkpoint_every=10):
+    """
+    Entraîne (ou continue d'entraîner) le modèle par mini-batchs lus depuis le disque.
+    Renvoie l'état final : modèle, vectoriseur et compteurs.
+    """
+    if resume and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path)
+        print(f"📂 Reprise depuis {checkpoint_path} "
+              f"({state['rows_seen']} commentaires déjà appris)")
+    else:
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'model': build_sgd_model(alpha),
+            'vectorizer': build_hashing_vectorizer(n_features_bits),
+            'rows_seen': 0,
+            'batches_seen': 0,
+        }
+    model, vectorizer = state['model'], state['vectorizer']
+
+    print(f"\n🚀 Entraînement incrémental : batchs de {batch_size}, {epochs} époque(s)")
+    start = time.perf_counter()
+    for epoch in range(1, epochs + 1):
+        rows_epoch = 0
+        for batch in iter_dataset(data_path, batch_size=batch_size, columns=['text', 'label']):
+            batch = batch[~is_holdout(batch['text'], test_percent)]
+            if batch.empty:
+                continue
+
+            X = vectorizer.transform(batch['text'])
+            model.partial_fit(X, batch['label'].to_numpy(), classes=CLASSES)
+
+            rows_epoch += len(batch)
+            state['rows_seen'] += len(batch)
+            state['batches_seen'] += 1
+            if state['batches_seen'] % checkpoint_every == 0:
+                save_checkpoint(state, checkpoint_path)
+
+        print(f"✅ Époque {epoch}/{epochs} : {rows_epoch} commentaires "
+              f"({time.perf_counter() - start:.1f} s)")
+
+    save_checkpoint(state, checkpoint_path)
+    print(f"💾 Checkpoint sauvegardé : {checkpoint_path}")
+    return state
+
+
+def evaluate_incremental(model, vectorizer, data_path, batch_size=10_000, test_percent=20):
+    """Évalue sur le test set (même split par empreinte), lu lui aussi par mini-batchs"""
+    y_true, y_pred = [], []
+    for batch in iter_dataset(data_path, batch_size=batch_size, columns=['text', 'label']):
+        batch = batch[is_holdout(batch['text'], test_percent)]
+        if batch.empty:
+            continue
+        y_true.append(batch['label'].to_numpy())
+        y_pred.append(model.predict(vectorizer.transform(batch['text'])))
+
+    if not y_true:
+        print("⚠️  Test set vide : évaluation ignorée")
+        return None, None
+
+    y_true, y_pred = np.concatenate(y_true), np.concatenate(y_pred)
+    accuracy = accuracy_score(y_true, y_pred)
+    f1_weighted = f1_score(y_true, y_pred, average='weighted')
+    print(f"\n🎯 Accuracy : {accuracy:.4f} ({accuracy*100:.2f}%) sur {len(y_true)} commentaires")
+    print(f"🎯 F1-Score (weighted) : {f1_weighted:.4f}")
+    return accuracy, f1_weighted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement incrémental (partial_fit)")
+    parser.add_argument('--data', default='data/processed/reddit_clean.parquet',
+                        help="Dataset prétraité (.parquet, .arrow ou .csv)")
+    parser.add_argument('--checkpoint', default='models/incremental/checkpoint.joblib')
+    parser.add_argument('--resume', action='store_true',
+                        help="Continuer l'entraînement depuis le checkpoint existant "
+                             "(featuriseur et alpha repris du checkpoint)")
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--test-percent', type=int, default=20)
+    parser.add_argument('--n-features-bits', type=int, default=20)
+    parser.add_argument('--alpha', type=float, default=1e-5)
+    parser.add_argument('--output-dir', default='models/incremental',
+                        help="Dossier du modèle et du vectoriseur (CANDIDATE_MODEL_DIR de l'API)")
+    args = parser.parse_args()
+
+    state = train_incremental(
+        args.data, args.checkpoint, resume=args.resume, batch_size=args.batch_size,
+        epochs=args.epochs, test_percent=args.test_percent,
+        n_features_bits=args.n_features_bits, alpha=args.alpha
+    )
+    evaluate_incremental(state['model'], state['vectorizer'], args.data,
+                         batch_size=args.batch_size, test_percent=args.test_percent)
+
+    # Même format et mêmes noms que train_model.save_model : l'API le sert comme
+    # candidat avec CANDIDATE_MODEL_DIR=<output-dir> (MODEL_PATH / VECTORIZER_PATH
+    # de l'API sont fixes : models/). Écriture atomique, l'API peut surveiller le dossier
+    os.makedirs(args.output_dir, exist_ok=True)
+    model_path = os.path.join(args.output_dir, 'sentiment_model.joblib')
+    vectorizer_path = os.path.join(args.output_dir, 'vectorizer.joblib')
+    for obj, path in ((state['vectorizer'], vectorizer_path), (state['model'], model_path)):
+        joblib.dump(obj, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    print(f"✅ Modèle sauvegardé : {model_path}")
+    print(f"✅ Vectoriseur sauvegardé : {vectorizer_path}")
+
+
+if __name__ == "__main__":
+    main()
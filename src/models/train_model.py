@@ -1,19 +1,30 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, GridSearchCV, HalvingGridSearchCV
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, f1_score
 import joblib
 import os
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 import time
 
-def load_data(path='data/processed/reddit_clean.csv'):
-    """Charge les données prétraitées"""
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.storage import load_dataset  # noqa: E402
+from src.models.export_model import export_compact_model, remove_compact_model  # noqa: E402
+from src.models.feature_cache import cached_fit_transform, cached_transform  # noqa: E402
+from src.models.inference_benchmark import make_batch, measure_latency  # noqa: E402
+from src.models.regularization_path import WarmStartPath  # noqa: E402
+
+def load_data(path='data/processed/reddit_clean.parquet', memory_map=False):
+    """Charge les données prétraitées (.parquet, .arrow ou .csv selon l'extension)"""
     print("📂 Chargement des données...")
-    df = pd.read_csv(path)
+    df = load_dataset(path, memory_map=memory_map)
     print(f"✅ {len(df)} commentaires chargés")
     return df
 
@@ -33,39 +44,120 @@ def split_data(df, test_size=0.2, random_state=42):
     
     return X_train, X_test, y_train, y_test
 
-def train_model(X_train, y_train, optimize=True):
-    """Entraîne le modèle avec TF-IDF + Logistic Regression"""
-    
-    print("\n🔧 Création du vectoriseur TF-IDF...")
-    vectorizer = TfidfVectorizer(
-        max_features=5000,
-        ngram_range=(1, 2),
-        min_df=2,
-        max_df=0.8,
-        strip_accents='unicode'
-    )
+def build_vectorizer(featurizer='tfidf', n_features_bits=18):
+    """
+    Construit le featuriseur :
+    - 'tfidf'   : TfidfVectorizer à vocabulaire (5000 termes les plus fréquents)
+    - 'hashing' : HashingVectorizer + TfidfTransformer, sans vocabulaire, mémoire
+                  constante (2**n_features_bits colonnes)
+    """
+    if featurizer == 'tfidf':
+        return TfidfVectorizer(
+            max_features=5000,
+            ngram_range=(1, 2),
+            min_df=2,
+            max_df=0.8,
+            strip_accents='unicode'
+        )
+    if featurizer == 'hashing':
+        return make_pipeline(
+            HashingVectorizer(
+                n_features=2 ** n_features_bits,
+                ngram_range=(1, 2),
+                strip_accents='unicode',
+                alternate_sign=False,
+                norm=None
+            ),
+            TfidfTransformer()
+        )
+    raise ValueError(f"Featuriseur inconnu : {featurizer!r} (attendu 'tfidf' ou 'hashing')")
+
+PARAM_GRID = {
+    'C': [0.1, 1.0, 10.0],
+    'solver': ['liblinear', 'saga'],
+    'max_iter': [200, 500]
+}
+
+# Valeurs de C du chemin à démarrage à chaud (mode 'path'), par ordre croissant
+PATH_CS = [0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0]
+
+def search_hyperparameters(X_train_tfidf, y_train, search='grid', cv=5, n_jobs=-1, verbose=1):
+    """
+    Recherche des hyperparamètres de la régression logistique sur PARAM_GRID :
+    - 'grid'    : GridSearchCV exhaustif (12 configurations x cv folds)
+    - 'halving' : HalvingGridSearchCV, toutes les configurations sur un petit
+                  échantillon puis seul le meilleur tiers sur 3x plus de données,
+                  jusqu'au train set complet
+    - 'path'    : chemin de régularisation sur PATH_CS (saga, warm_start), chaque
+                  C repartant des coefficients du précédent (voir WarmStartPath)
+    Renvoie (recherche entraînée, rapport : temps, meilleur F1 CV, nombre de fits).
+    """
+    model = LogisticRegression(random_state=42, class_weight='balanced')
+    if search == 'grid':
+        searcher = GridSearchCV(
+            model, PARAM_GRID, cv=cv, scoring='f1_weighted', n_jobs=n_jobs, verbose=verbose
+        )
+    elif search == 'halving':
+        searcher = HalvingGridSearchCV(
+            model, PARAM_GRID, cv=cv, scoring='f1_weighted', factor=3,
+            resource='n_samples', random_state=42, n_jobs=n_jobs, verbose=verbose
+        )
+    elif search == 'path':
+        searcher = WarmStartPath(
+            LogisticRegression(solver='saga', max_iter=500, random_state=42,
+                               class_weight='balanced'),
+            Cs=PATH_CS, cv=cv, n_jobs=n_jobs
+        )
+    else:
+        raise ValueError(f"Recherche inconnue : {search!r} (attendu 'grid', 'halving' ou 'path')")
+    
+    start = time.perf_counter()
+    searcher.fit(X_train_tfidf, y_train)
+    elapsed = time.perf_counter() - start
+    
+    report = {
+        'search': search,
+        'seconds': round(elapsed, 2),
+        'best_cv_f1': round(float(searcher.best_score_), 4),
+        'best_params': searcher.best_params_,
+        'n_fits': int(len(searcher.cv_results_['params']) * cv),
+    }
+    if search == 'path':
+        # Itérations et temps cumulés sur les folds, par valeur de C
+        report['path'] = searcher.path_
+    return searcher, report
+
+def train_model(X_train, y_train, optimize=True, featurizer='tfidf', n_features_bits=18,
+                feature_cache_dir=None, search='grid'):
+    """
+    Entraîne le modèle avec TF-IDF (ou hashing + TF-IDF) + Logistic Regression
+    
+    Avec `feature_cache_dir`, la matrice TF-IDF (et le vectoriseur entraîné) est
+    réutilisée tant que les données et les paramètres du vectoriseur ne changent pas.
+    """
+    
+    if featurizer == 'hashing':
+        print(f"\n🔧 Création du vectoriseur Hashing + TF-IDF (2^{n_features_bits} features)...")
+    else:
+        print("\n🔧 Création du vectoriseur TF-IDF...")
+    vectorizer = build_vectorizer(featurizer, n_features_bits)
     
     print("🔄 Transformation des textes en vecteurs TF-IDF...")
-    X_train_tfidf = vectorizer.fit_transform(X_train)
+    vectorizer, X_train_tfidf = cached_fit_transform(vectorizer, X_train, feature_cache_dir)
     print(f"✅ Matrice TF-IDF : {X_train_tfidf.shape}")
     
     if optimize:
-        print("\n🎯 Optimisation des hyperparamètres avec GridSearchCV...")
-        param_grid = {
-            'C': [0.1, 1.0, 10.0],
-            'solver': ['liblinear', 'saga'],
-            'max_iter': [200, 500]
-        }
-        
-        model = LogisticRegression(random_state=42, class_weight='balanced')
-        grid_search = GridSearchCV(
-            model, param_grid, cv=5, scoring='f1_weighted', n_jobs=-1, verbose=1
-        )
-        
-        grid_search.fit(X_train_tfidf, y_train)
+        name = {'grid': 'GridSearchCV', 'halving': 'HalvingGridSearchCV',
+                'path': 'un chemin de régularisation (warm start)'}.get(search, search)
+        print(f"\n🎯 Optimisation des hyperparamètres avec {name}...")
+        grid_search, report = search_hyperparameters(X_train_tfidf, y_train, search=search)
         
         print(f"\n✅ Meilleurs paramètres : {grid_search.best_params_}")
         print(f"✅ Meilleur score F1 (CV) : {grid_search.best_score_:.4f}")
+        print(f"⏱️  Temps de recherche : {report['seconds']:.1f} s ({report['n_fits']} fits)")
+        for step in report.get('path', []):
+            print(f"   C={step['C']:<6} F1 CV={step['cv_f1']:.4f}  "
+                  f"{step['n_iter']:>5} itérations  {step['seconds']:.2f} s")
         
         model = grid_search.best_estimator_
     else:
@@ -83,14 +175,14 @@ def train_model(X_train, y_train, optimize=True):
     
     return model, vectorizer
 
-def evaluate_model(model, vectorizer, X_test, y_test):
+def evaluate_model(model, vectorizer, X_test, y_test, feature_cache_dir=None):
     """Évalue le modèle sur le test set"""
     
     print("\n📈 ÉVALUATION DU MODÈLE")
     print("="*60)
     
     # Transformation
-    X_test_tfidf = vectorizer.transform(X_test)
+    X_test_tfidf = cached_transform(vectorizer, X_test, feature_cache_dir)
     
     # Prédictions
     y_pred = model.predict(X_test_tfidf)
@@ -125,18 +217,14 @@ def evaluate_model(model, vectorizer, X_test, y_test):
     plt.savefig('logs/confusion_matrix.png', dpi=300, bbox_inches='tight')
     print("\n✅ Matrice de confusion sauvegardée : logs/confusion_matrix.png")
     
-    # Test de vitesse
-    print("\n⏱️  Test de performance (temps d'inférence)...")
-    batch_size = 50
-    X_batch = X_test[:batch_size]
-    X_batch_tfidf = vectorizer.transform(X_batch)
-    
-    start_time = time.time()
-    _ = model.predict(X_batch_tfidf)
-    inference_time = (time.time() - start_time) * 1000  # en ms
-    
-    print(f"✅ Temps d'inférence pour {batch_size} commentaires : {inference_time:.2f} ms")
-    print(f"✅ Temps moyen par commentaire : {inference_time/batch_size:.2f} ms")
+    # Test de vitesse : pipeline complet, échauffement et répétitions
+    # (suite complète : benchmarks/bench_inference.py)
+    print("\n⏱️  Test de performance (nettoyage → vectorisation → prédiction → JSON)...")
+    for batch_size in (1, 50, 1000):
+        batch = make_batch(X_test, batch_size)
+        stats = measure_latency(model, vectorizer, batch, warmup=3, repeats=20)
+        print(f"✅ Batch de {batch_size:>4} : p50 {stats['p50_ms']:.2f} ms, "
+              f"p99 {stats['p99_ms']:.2f} ms ({stats['comments_per_second']:.0f} commentaires/s)")
     
     return accuracy, f1_weighted
 
@@ -145,15 +233,19 @@ def save_model(model, vectorizer, model_path='models/sentiment_model.joblib',
     """Sauvegarde le modèle et le vectoriseur"""
     
     print("\n💾 Sauvegarde du modèle...")
-    os.makedirs('models', exist_ok=True)
+    os.makedirs(os.path.dirname(model_path) or '.', exist_ok=True)
     
-    joblib.dump(model, model_path)
-    joblib.dump(vectorizer, vectorizer_path)
+    # Écriture dans un fichier temporaire puis os.replace : une API qui surveille
+    # models/ (rechargement à chaud) ne lit jamais un fichier à moitié écrit
+    for obj, path in ((vectorizer, vectorizer_path), (model, model_path)):
+        joblib.dump(obj, path + '.tmp')
+        os.replace(path + '.tmp', path)
     
     print(f"✅ Modèle sauvegardé : {model_path}")
     print(f"✅ Vectoriseur sauvegardé : {vectorizer_path}")
 
-def main():
+def main(featurizer='tfidf', n_features_bits=18, feature_cache_dir=None,
+         search='grid', output_dir='models'):
     """Pipeline complet d'entraînement"""
     
     print("🚀 DÉMARRAGE DE L'ENTRAÎNEMENT DU MODÈLE")
@@ -166,17 +258,48 @@ def main():
     X_train, X_test, y_train, y_test = split_data(df)
     
     # 3. Entraîner le modèle
-    model, vectorizer = train_model(X_train, y_train, optimize=True)
+    model, vectorizer = train_model(X_train, y_train, optimize=True,
+                                    featurizer=featurizer, n_features_bits=n_features_bits,
+                                    feature_cache_dir=feature_cache_dir, search=search)
     
     # 4. Évaluer le modèle
-    accuracy, f1 = evaluate_model(model, vectorizer, X_test, y_test)
+    accuracy, f1 = evaluate_model(model, vectorizer, X_test, y_test,
+                                  feature_cache_dir=feature_cache_dir)
     
     # 5. Sauvegarder le modèle
-    save_model(model, vectorizer)
+    save_model(model, vectorizer,
+               model_path=os.path.join(output_dir, 'sentiment_model.joblib'),
+               vectorizer_path=os.path.join(output_dir, 'vectorizer.joblib'))
+    
+    # 6. Exporter l'artefact compact (chargement rapide, sans scikit-learn) ;
+    #    non exportable en hashing : l'export précédent, devenu obsolète, est supprimé
+    compact_dir = os.path.join(output_dir, 'compact')
+    if featurizer == 'tfidf':
+        export_compact_model(model, vectorizer, output_dir=compact_dir)
+    else:
+        remove_compact_model(compact_dir)
     
     print("\n✅ ENTRAÎNEMENT TERMINÉ AVEC SUCCÈS !")
     print(f"📊 Accuracy finale : {accuracy:.4f}")
     print(f"📊 F1-Score finale : {f1:.4f}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Entraînement du modèle de sentiment")
+    parser.add_argument('--featurizer', choices=['tfidf', 'hashing'], default='tfidf',
+                        help="Vocabulaire TF-IDF ou hashing trick (mémoire constante)")
+    parser.add_argument('--n-features-bits', type=int, default=18,
+                        help="Nombre de features du hashing : 2**bits")
+    parser.add_argument('--feature-cache-dir', default=None,
+                        help="Cache des matrices de features entre expériences, désactivé par "
+                             "défaut (ex. data/cache/features ; sans éviction : à vider à la main)")
+    parser.add_argument('--search', choices=['grid', 'halving', 'path'], default='grid',
+                        help="Recherche exhaustive, successive halving ou chemin de C à chaud")
+    parser.add_argument('--output-dir', default='models',
+                        help="Dossier des artefacts (ex. models/candidate : modèle candidat de l'API)")
+    args = parser.parse_args()
+    
+    main(featurizer=args.featurizer, n_features_bits=args.n_features_bits,
+         feature_cache_dir=args.feature_cache_dir, search=args.search,
+         output_dir=args.output_dir)
\ No newline at end of file
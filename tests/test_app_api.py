@@ -0,0 +1,50 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import app_api
+
+
+def wait_for_status(client, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/health")
+        if response.json()["status"] in statuses or time.monotonic() > deadline:
+            return response
+        time.sleep(0.01)
+
+
+# ---------------------------------------------------
+# TEST — BACKGROUND LOADING: PORT UP, 503 UNTIL READY
+# ---------------------------------------------------
+def test_missing_model_is_reported_by_health(tmp_path, monkeypatch):
+    # Pas de dossier models/ ici : l'import réussit, le chargement échoue
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_api, "model", None)
+    monkeypatch.setattr(app_api, "vectorizer", None)
+    monkeypatch.setattr(app_api, "load_error", None)
+
+    with TestClient(app_api.app) as client:
+        health = wait_for_status(client, {"error"})
+        prediction = client.post("/predict_batch", json={"comments": ["great video"]})
+
+    assert health.status_code == 503
+    assert "FileNotFoundError" in health.json()["error"]
+    assert prediction.status_code == 503
+
+
+def test_health_is_ready_once_model_is_set(monkeypatch):
+    monkeypatch.setattr(app_api, "load_error", None)
+    monkeypatch.setattr(app_api, "load_artifacts_background", lambda: None)
+    monkeypatch.setattr(app_api, "model", None)
+    monkeypatch.setattr(app_api, "vectorizer", None)
+
+    with TestClient(app_api.app) as client:
+        assert client.get("/health").json()["status"] == "loading"
+        monkeypatch.setattr(app_api, "model", object())
+        monkeypatch.setattr(app_api, "vectorizer", object())
+        health = client.get("/health")
+
+    assert health.status_code == 200
+    assert health.json()["status"] == "ready"
+    assert "import_seconds" in health.json()["startup"]
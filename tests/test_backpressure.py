@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import httpx
+import numpy as np
+
+import src.api.main as api
+from src.api.executor import InferencePool, PoolSaturatedError
+from src.api.registry import ModelBundle
+
+
+class GatedVectorizer:
+    """transform bloque tant que `gate` est fermé ("slow"), échoue sur "boom"."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+
+    def transform(self, texts):
+        if texts[0].startswith("slow"):
+            self.gate.wait(5)
+        if texts[0].startswith("boom"):
+            raise RuntimeError("échec du vectoriseur")
+        return np.ones((len(texts), 1))
+
+
+class ConstantModel:
+    classes_ = np.array([-1, 0, 1])
+    multi_class = "multinomial"
+    coef_ = np.array([[0.0], [0.0], [1.0]])
+    intercept_ = np.zeros(3)
+
+    def decision_function(self, X):
+        return np.asarray(X) @ self.coef_.T + self.intercept_
+
+
+# ---------------------------------------------------
+# TEST — FULL QUEUE → 429, IN-FLIGHT COUNTER RECOVERS
+# ---------------------------------------------------
+def test_full_inference_queue_returns_429(monkeypatch):
+    vectorizer = GatedVectorizer()
+    pool = InferencePool(mode="thread", max_workers=1, max_queue=2)
+    monkeypatch.setattr(api.registry, "current", ModelBundle(ConstantModel(), vectorizer, "t", 0.0))
+    monkeypatch.setattr(api, "inference_pools", {api.CURRENT: pool})
+    monkeypatch.setattr(api, "prediction_cache", None)
+    monkeypatch.setattr(api, "micro_batchers", None)
+
+    async def scenario():
+        async with httpx.AsyncClient(app=api.app, base_url="http://test") as client:
+            def post(text):
+                return client.post("/predict_batch", json={"comments": [text]})
+
+            slow = [asyncio.create_task(post(f"slow {i}")) for i in range(pool.max_queue)]
+            while pool.in_flight < pool.max_queue:
+                await asyncio.sleep(0.01)
+
+            rejected = await post("one more")
+            vectorizer.gate.set()
+            completed = await asyncio.gather(*slow)
+            in_flight_after_success = pool.in_flight
+
+            failed = await post("boom")
+            return rejected, completed, in_flight_after_success, failed
+
+    try:
+        rejected, completed, in_flight_after_success, failed = asyncio.run(scenario())
+    finally:
+        vectorizer.gate.set()
+        pool.shutdown()
+
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "1"
+    assert [r.status_code for r in completed] == [200, 200]
+    assert in_flight_after_success == 0
+    assert failed.status_code == 500
+    assert pool.in_flight == 0
+    assert pool.rejected == 1
+
+
+# ---------------------------------------------------
+# TEST — A CANCELLED REQUEST KEEPS ITS SLOT UNTIL THE JOB ENDS
+# ---------------------------------------------------
+def test_cancelled_request_holds_slot_until_job_finishes():
+    gate = threading.Event()
+    started = threading.Event()
+    pool = InferencePool(mode="thread", max_workers=1, max_queue=1)
+
+    def blocking_job():
+        started.set()
+        gate.wait(5)
+        return "done"
+
+    async def scenario():
+        request = asyncio.ensure_future(pool.run(blocking_job))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        request.cancel()
+        await asyncio.gather(request, return_exceptions=True)
+
+        # Le job tourne toujours : la file reste pleine
+        in_flight_after_cancel = pool.in_flight
+        try:
+            await pool.run(blocking_job)
+            rejected = False
+        except PoolSaturatedError:
+            rejected = True
+
+        gate.set()
+        while pool.in_flight:
+            await asyncio.sleep(0.001)
+        return in_flight_after_cancel, rejected
+
+    in_flight_after_cancel, rejected = asyncio.run(scenario())
+    pool.shutdown()
+
+    assert in_flight_after_cancel == 1
+    assert rejected
+    assert pool.in_flight == 0
@@ -0,0 +1,71 @@
+import asyncio
+
+import numpy as np
+
+from src.api.batching import MicroBatcher
+
+
+# ---------------------------------------------------
+# TEST — CONCURRENT REQUESTS SHARE ONE MODEL CALL
+# ---------------------------------------------------
+def test_concurrent_requests_are_coalesced():
+    calls = []
+
+    async def predict(texts):
+        calls.append(len(texts))
+        return np.array([len(t) for t in texts]), np.ones(len(texts))
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=20, max_batch_size=100)
+        return await asyncio.gather(*[
+            batcher.submit(["x" * i] * i) for i in range(1, 6)
+        ])
+
+    results = asyncio.run(scenario())
+
+    assert calls == [15]
+    for i, (labels, _) in enumerate(results, start=1):
+        assert labels.tolist() == [i] * i
+
+
+# ---------------------------------------------------
+# TEST — AN ISOLATED REQUEST DOES NOT WAIT FOR THE TIMER
+# ---------------------------------------------------
+def test_idle_batcher_flushes_without_waiting():
+    async def predict(texts):
+        return np.zeros(len(texts)), np.ones(len(texts))
+
+    async def scenario():
+        batcher = MicroBatcher(predict, max_wait_ms=10_000, max_batch_size=100)
+        return await asyncio.wait_for(batcher.submit(["x"]), timeout=1)
+
+    labels, _ = asyncio.run(scenario())
+    assert labels.tolist() == [0]
+
+
+# ---------------------------------------------------
+# TEST — REQUESTS ARRIVING DURING A MODEL CALL SHARE THE NEXT ONE
+# ---------------------------------------------------
+def test_requests_queue_while_model_is_busy():
+    calls = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def predict(texts):
+            calls.append(len(texts))
+            if len(calls) == 1:
+                await release.wait()
+            return np.zeros(len(texts)), np.ones(len(texts))
+
+        batcher = MicroBatcher(predict, max_wait_ms=10_000, max_batch_size=100)
+        first = asyncio.ensure_future(batcher.submit(["a"]))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(batcher.submit(["b", "c"])) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, *others), timeout=1)
+
+    asyncio.run(scenario())
+    assert calls == [1, 6]
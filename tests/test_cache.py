@@ -0,0 +1,70 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import make_pipeline
+
+from src.api.cache import PredictionCache, cache_key, predict_with_cache, text_normalizer
+
+
+def fake_predict(calls):
+    def predict(texts):
+        calls.append(list(texts))
+        labels = np.array([1 if "good" in t else -1 for t in texts])
+        return labels, np.full(len(texts), 0.9)
+    return predict
+
+
+# ---------------------------------------------------
+# TEST — ONLY MISSES REACH THE MODEL, ORDER IS KEPT
+# ---------------------------------------------------
+def test_predict_with_cache_merges_in_input_order():
+    cache = PredictionCache(max_entries=100)
+    calls = []
+
+    predict_with_cache(cache, "v1", ["good", "bad"], fake_predict(calls))
+    labels, _ = predict_with_cache(cache, "v1", ["bad", "new good", "GOOD ", "new good"],
+                                   fake_predict(calls))
+
+    assert labels.tolist() == [-1, 1, 1, 1]
+    assert calls == [["good", "bad"], ["new good"]]
+    assert cache.stats()["hits"] == 2
+
+
+# ---------------------------------------------------
+# TEST — LRU EVICTION AND MODEL VERSIONING
+# ---------------------------------------------------
+def test_lru_eviction_and_version_in_key():
+    cache = PredictionCache(max_entries=2)
+    keys = [cache_key(t, "v1") for t in ["a", "b", "c"]]
+
+    cache.store(keys[:2], np.array([1, 0]), np.array([0.5, 0.6]))
+    cache.lookup([keys[0]])  # "a" devient le plus récent
+    cache.store(keys[2:], np.array([-1]), np.array([0.7]))
+
+    _, _, missing = cache.lookup(keys)
+    assert missing == [1]
+    assert cache.evictions == 1
+    assert cache_key("a", "v1") != cache_key("a", "v2")
+
+
+# ---------------------------------------------------
+# TEST — KEY NORMALIZATION FOLLOWS THE VECTORIZER
+# ---------------------------------------------------
+def test_text_normalizer_follows_vectorizer_settings():
+    default = text_normalizer(TfidfVectorizer())
+    case_sensitive = text_normalizer(TfidfVectorizer(lowercase=False))
+    hashing = text_normalizer(make_pipeline(HashingVectorizer(), TfidfTransformer()))
+    custom = text_normalizer(TfidfVectorizer(token_pattern=r"\S+"))
+
+    assert default("  Bad   video ") == default("bad video")
+    assert hashing("Bad  video") == hashing("bad video")
+    assert case_sensitive("Bad  video") == case_sensitive("Bad video")
+    assert case_sensitive("Bad video") != case_sensitive("bad video")
+    assert custom("Bad  video") == "Bad  video"
+    # Vectoriseur inconnu : aucune normalisation
+    assert text_normalizer(object())("Bad  video") == "Bad  video"
+
+    cache = PredictionCache(max_entries=100)
+    calls = []
+    for text in ("Bad", "bad"):
+        predict_with_cache(cache, "v1", [text], fake_predict(calls), case_sensitive)
+    assert calls == [["Bad"], ["bad"]]
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.api.compact_model import load_compact_model
+from src.api.inference import predict_texts
+from src.models.export_model import export_compact_model, remove_compact_model
+
+TEXTS = [
+    "great video love it", "amazing content best channel", "nice work awesome",
+    "bad video hate it", "terrible content worst channel", "boring and awful",
+    "video posted today", "watch the channel", "okay the video",
+] * 5
+LABELS = [1, 1, 1, -1, -1, -1, 0, 0, 0] * 5
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+NEW_TEXTS = ["Love this CHANNEL", "worst video ever", "Café déjà vu", "", "the the the video"]
+
+
+# ---------------------------------------------------
+# TEST — COMPACT ARTIFACT SCORES LIKE SKLEARN
+# ---------------------------------------------------
+def test_compact_artifact_matches_sklearn(tmp_path):
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), strip_accents="unicode", sublinear_tf=True)
+    model = LogisticRegression(C=10.0, solver="liblinear", random_state=42)
+    model.fit(vectorizer.fit_transform(TEXTS), LABELS)
+
+    export_compact_model(model, vectorizer, output_dir=str(tmp_path))
+    compact_model, compact_vectorizer = load_compact_model(str(tmp_path))
+
+    expected_labels, expected_confidences = predict_texts(model, vectorizer, NEW_TEXTS)
+    labels, confidences = predict_texts(compact_model, compact_vectorizer, NEW_TEXTS)
+
+    np.testing.assert_array_equal(labels, expected_labels)
+    np.testing.assert_allclose(confidences, expected_confidences, rtol=1e-12)
+
+
+def test_compact_loader_does_not_import_sklearn():
+    code = "import sys, src.api.compact_model; print('sklearn' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=PROJECT_ROOT, check=True)
+    assert result.stdout.strip() == "False"
+
+
+# ---------------------------------------------------
+# TEST — RE-EXPORT NEVER REWRITES MAPPED FILES
+# ---------------------------------------------------
+def test_reexport_leaves_mapped_arrays_untouched(tmp_path):
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression().fit(vectorizer.fit_transform(TEXTS), LABELS)
+    output_dir = str(tmp_path / "compact")
+
+    export_compact_model(model, vectorizer, output_dir=output_dir)
+    served_model, _ = load_compact_model(output_dir, mmap=True)
+    served_coef = np.array(served_model.coef_t)
+    served_dir = os.path.realpath(output_dir)
+
+    other = LogisticRegression(C=0.01).fit(vectorizer.transform(TEXTS), LABELS)
+    export_compact_model(other, vectorizer, output_dir=output_dir)
+
+    # Le modèle déjà chargé (mappé) est inchangé, le nouveau est publié via le lien
+    np.testing.assert_array_equal(served_model.coef_t, served_coef)
+    reloaded, _ = load_compact_model(output_dir)
+    assert not np.array_equal(reloaded.coef_t, served_coef)
+    assert os.path.islink(output_dir)
+    # Version précédente conservée : un chargement qui a déjà résolu le lien aboutit
+    previous_model, _ = load_compact_model(served_dir)
+    np.testing.assert_array_equal(previous_model.coef_t, served_coef)
+
+    # Au-delà, seules la version publiée et la précédente restent sur disque
+    export_compact_model(model, vectorizer, output_dir=output_dir)
+    versions = [e for e in os.listdir(tmp_path) if e.startswith(".compact.")]
+    assert len(versions) == 2
+    assert not os.path.exists(served_dir)
+
+
+def test_remove_compact_model_clears_link_and_versions(tmp_path):
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression().fit(vectorizer.fit_transform(TEXTS), LABELS)
+    output_dir = str(tmp_path / "compact")
+    export_compact_model(model, vectorizer, output_dir=output_dir)
+
+    assert remove_compact_model(output_dir)
+    assert not os.path.lexists(output_dir)
+    # Dernière version conservée pour les lecteurs en cours, supprimée au retrait suivant
+    assert len(os.listdir(tmp_path)) == 1
+    assert not remove_compact_model(output_dir)
+    assert os.listdir(tmp_path) == []
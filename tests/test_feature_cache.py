@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import src.models.feature_cache as feature_cache  # noqa: E402
+
+TEXTS = pd.Series(["great video love it", "bad video hate it", "video posted today",
+                   "love the channel", "hate the channel"] * 4)
+
+
+def build():
+    return TfidfVectorizer(ngram_range=(1, 2), max_features=8)
+
+
+# ---------------------------------------------------
+# TEST — CACHED MATRICES ARE REUSED AND IDENTICAL
+# ---------------------------------------------------
+def test_fit_transform_and_transform_hit_the_cache(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    vectorizer, X = feature_cache.cached_fit_transform(build(), TEXTS, cache_dir)
+    X_test = feature_cache.cached_transform(vectorizer, TEXTS[:3], cache_dir)
+
+    # Un second run ne doit plus appeler fit_transform / transform
+    def fail(*args, **kwargs):
+        raise AssertionError("featurisation recalculée")
+    monkeypatch.setattr(TfidfVectorizer, "fit_transform", fail)
+    monkeypatch.setattr(TfidfVectorizer, "transform", fail)
+
+    reindexed = TEXTS.set_axis(range(100, 100 + len(TEXTS)))
+    cached_vectorizer, cached_X = feature_cache.cached_fit_transform(build(), reindexed, cache_dir)
+    cached_X_test = feature_cache.cached_transform(cached_vectorizer, TEXTS[:3], cache_dir)
+
+    assert (cached_X != X).nnz == 0
+    assert (cached_X_test != X_test).nnz == 0
+    assert cached_vectorizer.vocabulary_ == vectorizer.vocabulary_
+
+
+def test_changed_data_or_params_miss_the_cache(tmp_path):
+    base = feature_cache.cache_key("fit_transform", TEXTS, build())
+
+    assert feature_cache.cache_key("fit_transform", TEXTS[::-1], build()) != base
+    assert feature_cache.cache_key("fit_transform", TEXTS,
+                                   TfidfVectorizer(ngram_range=(1, 1), max_features=8)) != base
+
+
+# ---------------------------------------------------
+# TEST — THE SHIPPED VECTORIZER IS NOT MODIFIED
+# ---------------------------------------------------
+def test_cache_leaves_fitted_vectorizer_untouched(tmp_path):
+    expected = build().fit(TEXTS)
+    vectorizer, _ = feature_cache.cached_fit_transform(build(), TEXTS, str(tmp_path))
+
+    assert vectorizer.__dict__.keys() == expected.__dict__.keys()
+    assert vectorizer.stop_words_ == expected.stop_words_
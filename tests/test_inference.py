@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from src.api.inference import predict_texts
+
+TEXTS = [
+    "great video love it", "amazing content best channel", "nice work awesome",
+    "bad video hate it", "terrible content worst channel", "boring and awful",
+    "video posted today", "watch the channel", "okay the video",
+] * 5
+LABELS = [1, 1, 1, -1, -1, -1, 0, 0, 0] * 5
+NEW_TEXTS = ["love this channel", "worst video ever", "today", "unknown words only"]
+
+
+# ---------------------------------------------------
+# TEST — FUSED INFERENCE MATCHES predict + predict_proba
+# ---------------------------------------------------
+@pytest.mark.parametrize("params, n_classes", [
+    ({"solver": "liblinear", "C": 10.0}, 3),
+    ({"solver": "lbfgs", "C": 1.0}, 3),
+    ({"solver": "liblinear", "C": 1.0}, 2),
+    ({"solver": "lbfgs", "C": 1.0}, 2),
+])
+def test_predict_texts_matches_sklearn(params, n_classes):
+    texts = [t for t, y in zip(TEXTS, LABELS) if n_classes == 3 or y != 0]
+    labels = [y for y in LABELS if n_classes == 3 or y != 0]
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+    model = LogisticRegression(random_state=42, **params)
+    model.fit(vectorizer.fit_transform(texts), labels)
+
+    predictions, confidences = predict_texts(model, vectorizer, NEW_TEXTS)
+
+    X = vectorizer.transform(NEW_TEXTS)
+    np.testing.assert_array_equal(predictions, model.predict(X))
+    np.testing.assert_allclose(confidences, model.predict_proba(X).max(axis=1), rtol=1e-10)
+
+
+@pytest.mark.parametrize("n_classes", [3, 2])
+def test_predict_texts_matches_sgd_log_loss(n_classes):
+    texts = [t for t, y in zip(TEXTS, LABELS) if n_classes == 3 or y != 0]
+    labels = [y for y in LABELS if n_classes == 3 or y != 0]
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+    model = SGDClassifier(loss="log_loss", random_state=42)
+    model.fit(vectorizer.fit_transform(texts), labels)
+
+    predictions, confidences = predict_texts(model, vectorizer, NEW_TEXTS)
+
+    X = vectorizer.transform(NEW_TEXTS)
+    np.testing.assert_array_equal(predictions, model.predict(X))
+    np.testing.assert_allclose(confidences, model.predict_proba(X).max(axis=1), rtol=1e-10)
@@ -0,0 +1,33 @@
+import json
+import os
+import sys
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.inference_benchmark import (  # noqa: E402
+    STAGES, make_batch, measure_latency, score_end_to_end,
+)
+
+TEXTS = ["Great video!! https://youtu.be/x", "bad @user video", "video posted today"] * 3
+LABELS = [1, -1, 0] * 3
+
+
+# ---------------------------------------------------
+# TEST — END-TO-END LATENCY MEASUREMENT
+# ---------------------------------------------------
+def test_measure_latency_reports_percentiles_and_stages():
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression().fit(vectorizer.fit_transform(TEXTS), LABELS)
+    batch = make_batch(TEXTS, 7)
+
+    stats = measure_latency(model, vectorizer, batch, warmup=1, repeats=5)
+
+    assert stats["batch_size"] == 7 and stats["runs"] >= 5
+    assert stats["p50_ms"] <= stats["p90_ms"] <= stats["p99_ms"]
+    assert set(stats["stages"]) == set(STAGES)
+
+    payload = json.loads(score_end_to_end(model, vectorizer, batch))
+    assert payload["statistics"]["total_comments"] == 7
@@ -0,0 +1,71 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api.metrics import MetricsMiddleware, Registry
+
+
+# ---------------------------------------------------
+# TEST — HISTOGRAM BUCKETS AND TEXT FORMAT
+# ---------------------------------------------------
+def test_histogram_render_is_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latence", buckets=(0.1, 1.0),
+                                   labelnames=("stage",))
+    histogram.observe(0.05, "transform")
+    histogram.observe(0.1, "transform")   # borne supérieure incluse
+    histogram.observe_many([0.5, 2.0], "transform")
+
+    text = registry.render().decode()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{stage="transform",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{stage="transform",le="1"} 3' in text
+    assert 'latency_seconds_bucket{stage="transform",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{stage="transform"} 4' in text
+    assert 'latency_seconds_sum{stage="transform"} 2.65' in text
+
+
+def test_counter_render():
+    registry = Registry()
+    counter = registry.counter("comments", "Commentaires", labelnames=("model",))
+    counter.inc("v1", amount=3)
+    counter.inc("v1")
+
+    assert 'comments_total{model="v1"} 4' in registry.render().decode()
+
+
+# ---------------------------------------------------
+# TEST — MIDDLEWARE COUNTS REQUESTS PER ROUTE
+# ---------------------------------------------------
+def test_middleware_labels_routes_and_statuses():
+    registry = Registry()
+    requests_total = registry.counter("requests", "Requêtes",
+                                      labelnames=("endpoint", "method", "status"))
+    duration = registry.histogram("duration_seconds", "Durée", buckets=(0.1, 1.0),
+                                  labelnames=("endpoint",))
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, requests_total=requests_total,
+                       request_duration=duration, router=app.router)
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        raise HTTPException(status_code=404)
+
+    with TestClient(app) as client:
+        client.get("/ok")
+        client.get("/ok")
+        client.get("/does-not-exist")
+        for i in range(5):
+            client.get(f"/items/{i}")
+
+    assert requests_total.value("/ok", "GET", "200") == 2
+    # Les chemins inconnus ou paramétrés ne créent pas une série par URL
+    assert requests_total.value("other", "GET", "404") == 1
+    assert requests_total.value("/items/{item_id}", "GET", "404") == 5
+    assert len(requests_total.render()) == 3
+    assert duration.count("/ok") == 2
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+import src.api.main as api
+from src.api.registry import ModelBundle
+
+TEXTS = [
+    "great video love it", "amazing content best channel", "nice work awesome",
+    "bad video hate it", "terrible content worst channel", "boring and awful",
+    "video posted today", "watch the channel", "okay the video",
+] * 5
+LABELS = [1, 1, 1, -1, -1, -1, 0, 0, 0] * 5
+
+COMMENTS = ["  Great video, love it  ", "worst channel ever", "posted today",
+            "", "bad " * 80, "Love this CHANNEL"]
+
+
+@pytest.fixture
+def fitted(monkeypatch):
+    vectorizer = TfidfVectorizer()
+    model = LogisticRegression(C=10.0, random_state=42).fit(vectorizer.fit_transform(TEXTS), LABELS)
+    monkeypatch.setattr(api.registry, "current", ModelBundle(model, vectorizer, "test", 0.0))
+    monkeypatch.setattr(api, "prediction_cache", None)
+    monkeypatch.setattr(api, "inference_pools", {})
+    monkeypatch.setattr(api, "micro_batchers", None)
+    return model, vectorizer
+
+
+def pydantic_reference(model, vectorizer, comments):
+    """Réponse telle que construite avant build_batch_payload (un objet Pydantic par commentaire)."""
+    valid = [c.strip() for c in comments if c.strip()]
+    X = vectorizer.transform(valid)
+    predictions = model.predict(X)
+    probabilities = model.predict_proba(X)
+
+    results = [
+        api.SentimentPrediction(
+            text=text[:200],
+            sentiment={-1: "negative", 0: "neutral", 1: "positive"}[int(pred)],
+            sentiment_score=int(pred),
+            confidence=round(float(np.max(proba)), 4),
+        )
+        for text, pred, proba in zip(valid, predictions, probabilities)
+    ]
+    total = len(predictions)
+    pos, neu, neg = (int(np.sum(predictions == label)) for label in (1, 0, -1))
+    statistics = {
+        "total_comments": total,
+        "sentiment_counts": {"positive": pos, "neutral": neu, "negative": neg},
+        "sentiment_percentages": {
+            "positive": round(pos / total * 100, 2),
+            "neutral": round(neu / total * 100, 2),
+            "negative": round(neg / total * 100, 2),
+        },
+        "average_confidence": round(float(np.mean([r.confidence for r in results])), 4),
+    }
+    response = api.BatchPredictionResponse(predictions=results, statistics=statistics,
+                                           timestamp="")
+    return response.model_dump(mode="json")
+
+
+# ---------------------------------------------------
+# TEST — FAST PAYLOAD MATCHES THE PYDANTIC RESPONSE
+# ---------------------------------------------------
+def test_predict_batch_matches_pydantic_response(fitted):
+    model, vectorizer = fitted
+
+    response = TestClient(api.app).post("/predict_batch", json={"comments": COMMENTS})
+
+    assert response.status_code == 200
+    body = response.json()
+    expected = pydantic_reference(model, vectorizer, COMMENTS)
+    assert body.keys() == expected.keys()
+    assert isinstance(body.pop("timestamp"), str)
+    expected.pop("timestamp")
+    assert body == expected
+    # Le payload reste valide pour le response_model documenté
+    api.BatchPredictionResponse(timestamp="", **body)
+
+    confidences = [p["confidence"] for p in body["predictions"]]
+    assert confidences == [round(c, 4) for c in confidences]
+    assert len(body["predictions"][3]["text"]) == 200
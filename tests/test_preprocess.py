@@ -0,0 +1,93 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "data"))
+
+from preprocess_data import (  # noqa: E402
+    clean_series, clean_text, preprocess_dataset, preprocess_dataset_chunked,
+)
+
+SAMPLES = [
+    "Check https://youtu.be/abc and www.site.com NOW!!",
+    "a@bhttp://x.com @user #Great #video",
+    "#@tag @#tag http#x",
+    "Café  naïve\x1c\x1ftabs\tand\nnewlines   ",
+    "emoji 😀 and symbols $%^&*() l'été co-op ... ?",
+    "İstanbul ΣΊΣΥΦΟΣ",
+    "",
+    "   ",
+    None,
+    np.nan,
+    42,
+    3.5,
+]
+
+
+# ---------------------------------------------------
+# TEST — COLUMN CLEANING IS IDENTICAL TO clean_text
+# ---------------------------------------------------
+def test_clean_series_matches_clean_text():
+    series = pd.Series(SAMPLES, index=range(10, 10 + len(SAMPLES)), dtype=object)
+
+    expected = series.apply(clean_text)
+    result = clean_series(series)
+
+    assert result.index.equals(expected.index)
+    assert result.tolist() == expected.tolist()
+
+
+def test_clean_series_matches_on_every_unicode_whitespace():
+    spaces = [chr(c) for c in range(0x110000) if chr(c).isspace()]
+    series = pd.Series([f"a{s}b{s}{s}c{s}" for s in spaces])
+
+    assert clean_series(series).tolist() == series.apply(clean_text).tolist()
+
+
+# ---------------------------------------------------
+# TEST — CHUNKED PREPROCESSING GIVES THE SAME FILE
+# ---------------------------------------------------
+def test_chunked_preprocessing_matches_full_run(tmp_path):
+    raw = pd.DataFrame({
+        "clean_comment": (SAMPLES * 5)[:50],
+        "category": ([1, 0, -1, 2, None] * 10),
+    })
+    input_path = tmp_path / "raw.csv"
+    raw.to_csv(input_path, index=False)
+
+    preprocess_dataset(str(input_path), str(tmp_path / "full.csv"))
+    summary = preprocess_dataset_chunked(str(input_path), str(tmp_path / "chunked.csv"),
+                                         chunksize=7, workers=2, max_pending=2)
+
+    full = (tmp_path / "full.csv").read_text()
+    assert (tmp_path / "chunked.csv").read_text() == full
+    assert summary["rows_read"] == 50
+    assert summary["chunks"] == 8
+    assert summary["rows_written"] == len(pd.read_csv(tmp_path / "full.csv"))
+
+
+# ---------------------------------------------------
+# TEST — INCREMENTAL CACHE ONLY CLEANS NEW TEXTS
+# ---------------------------------------------------
+def test_cached_cleaning_reuses_previous_run(tmp_path, monkeypatch):
+    import preprocess_data
+
+    series = pd.Series(SAMPLES + ["a", "a"], dtype=object)
+    first, hits = preprocess_data.clean_series_cached(series, str(tmp_path))
+    assert hits == 0
+    assert first.tolist() == series.apply(clean_text).tolist()
+
+    seen = []
+    original = preprocess_data.clean_series
+    monkeypatch.setattr(preprocess_data, "clean_series",
+                        lambda texts: seen.extend(texts.tolist()) or original(texts))
+
+    grown = pd.concat([series, pd.Series(["New #comment", "a"], dtype=object)],
+                      ignore_index=True)
+    second, hits = preprocess_data.clean_series_cached(grown, str(tmp_path))
+
+    assert seen == ["New #comment"]
+    assert hits == len(pd.util.hash_pandas_object(series, index=False).unique())
+    assert second.tolist() == grown.apply(clean_text).tolist()
@@ -0,0 +1,42 @@
+import os
+import time
+
+from src.api.profiling import ProfileStore, SamplingProfiler
+
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+# ---------------------------------------------------
+# TEST — SAMPLES POINT AT THE PROFILED FUNCTION
+# ---------------------------------------------------
+def test_sampling_profiler_captures_hot_function():
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy_loop(0.2)
+
+    assert profiler.sample_count > 0
+    lines = profiler.folded().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "busy_loop (test_profiling.py" in stack
+    assert int(count) > 0
+
+
+# ---------------------------------------------------
+# TEST — STORE KEEPS THE MOST RECENT PROFILES
+# ---------------------------------------------------
+def test_profile_store_prunes_and_validates_ids(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2)
+    ids = []
+    for i in range(3):
+        ids.append(store.save(f"main;work {i}\n"))
+        os.utime(tmp_path / f"{ids[-1]}.folded", ns=(i * 10**9, i * 10**9))
+
+    assert store.path(ids[0]) is None
+    with open(store.path(ids[2])) as f:
+        assert f.read() == "main;work 2\n"
+    assert store.path("../../etc/passwd") is None
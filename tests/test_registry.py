@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.api.registry import ModelBundle, ModelRegistry
+
+TEXTS = ["great video love it", "bad video hate it", "video posted today"] * 3
+LABELS = [1, -1, 0] * 3
+
+
+class FakeArtifacts:
+    """Artefacts simulés : `version` change quand on « sauvegarde » un modèle."""
+
+    def __init__(self):
+        self.version = "v1"
+        self.loads = 0
+        self.broken = False
+
+    def load(self):
+        self.loads += 1
+        if self.broken:
+            raise ValueError("fichier corrompu")
+        vectorizer = TfidfVectorizer()
+        model = LogisticRegression().fit(vectorizer.fit_transform(TEXTS), LABELS)
+        return ModelBundle(model, vectorizer, self.version, time.time())
+
+
+# ---------------------------------------------------
+# TEST — RELOAD SWAPS, FAILURE KEEPS THE SERVED MODEL
+# ---------------------------------------------------
+def test_reload_swaps_only_on_new_version():
+    artifacts = FakeArtifacts()
+    swaps = []
+    registry = ModelRegistry(artifacts.load, lambda: artifacts.version,
+                             on_swap=lambda previous, bundle: swaps.append(
+                                 (previous.version, bundle.version)))
+    registry.load()
+    first = registry.current
+
+    assert asyncio.run(registry.reload())["reloaded"] is False
+    assert registry.current is first
+
+    artifacts.version = "v2"
+    assert asyncio.run(registry.reload())["version"] == "v2"
+    assert swaps == [("v1", "v2")]
+
+    artifacts.version, artifacts.broken = "v3", True
+    with pytest.raises(ValueError):
+        asyncio.run(registry.reload())
+    assert registry.current.version == "v2"
+    assert registry.stats()["failed_reloads"] == 1
+
+
+# ---------------------------------------------------
+# TEST — WATCHER WAITS FOR A STABLE VERSION
+# ---------------------------------------------------
+def test_watcher_reloads_new_stable_version():
+    artifacts = FakeArtifacts()
+    registry = ModelRegistry(artifacts.load, lambda: artifacts.version)
+    registry.load()
+
+    async def scenario():
+        registry.start_watching(0.01)
+        artifacts.version = "v2"
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if registry.current.version == "v2":
+                break
+        await registry.stop_watching()
+
+    asyncio.run(scenario())
+
+    assert registry.current.version == "v2"
+    assert artifacts.loads == 2
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.regularization_path import WarmStartPath  # noqa: E402
+
+TEXTS = ["great video love it", "amazing content best channel", "nice work awesome",
+         "bad video hate it", "terrible content worst channel", "boring and awful",
+         "video posted today", "watch the channel", "okay the video"] * 4
+LABELS = np.array([1, 1, 1, -1, -1, -1, 0, 0, 0] * 4)
+
+
+# ---------------------------------------------------
+# TEST — WARM-STARTED C PATH
+# ---------------------------------------------------
+def test_path_records_every_c_and_refits_best():
+    X = TfidfVectorizer().fit_transform(TEXTS)
+    estimator = LogisticRegression(solver="lbfgs", max_iter=1000, random_state=42)
+
+    search = WarmStartPath(estimator, Cs=[10.0, 0.1, 1.0], cv=3).fit(X, LABELS)
+
+    assert [step["C"] for step in search.path_] == [0.1, 1.0, 10.0]
+    assert all(step["n_iter"] > 0 for step in search.path_)
+    assert search.best_params_["C"] == search.path_[
+        int(np.argmax(search.cv_results_["mean_test_score"]))]["C"]
+    assert search.best_estimator_.C == search.best_params_["C"]
+    np.testing.assert_array_equal(search.best_estimator_.predict(X), LABELS)
+
+
+def test_liblinear_is_rejected_because_it_ignores_warm_start():
+    with pytest.raises(ValueError):
+        WarmStartPath(LogisticRegression(solver="liblinear"))
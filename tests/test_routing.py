@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+import src.api.main as api
+from src.api.cache import PredictionCache, cache_key
+from src.api.registry import ModelBundle, ModelRegistry
+
+
+class FakeRequest:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+def make_registry(loaded=True):
+    registry = ModelRegistry(loader=None, version_fn=None)
+    registry.current = ModelBundle(None, None, "v1", 0.0) if loaded else None
+    return registry
+
+
+@pytest.fixture
+def two_versions(monkeypatch):
+    registries = {api.CURRENT: make_registry(), api.CANDIDATE: make_registry()}
+    monkeypatch.setattr(api, "registries", registries)
+    return registries
+
+
+# ---------------------------------------------------
+# TEST — HEADER FIRST, THEN TRAFFIC PERCENTAGE
+# ---------------------------------------------------
+def test_choose_model_routes_by_header_and_percentage(two_versions, monkeypatch):
+    monkeypatch.setattr(api, "CANDIDATE_TRAFFIC_PERCENT", 100.0)
+    assert api.choose_model(FakeRequest()) == api.CANDIDATE
+    assert api.choose_model(FakeRequest({"x-model-version": "current"})) == api.CURRENT
+
+    monkeypatch.setattr(api, "CANDIDATE_TRAFFIC_PERCENT", 0.0)
+    assert api.choose_model(FakeRequest()) == api.CURRENT
+
+    with pytest.raises(HTTPException) as excinfo:
+        api.choose_model(FakeRequest({"x-model-version": "v9"}))
+    assert excinfo.value.status_code == 404
+
+
+def test_unloaded_candidate_gets_no_traffic(two_versions, monkeypatch):
+    two_versions[api.CANDIDATE].current = None
+    monkeypatch.setattr(api, "CANDIDATE_TRAFFIC_PERCENT", 100.0)
+
+    assert api.choose_model(FakeRequest()) == api.CURRENT
+
+
+# ---------------------------------------------------
+# TEST — A SWAP ONLY RESETS THE STATE OF ITS OWN VERSION
+# ---------------------------------------------------
+class FakePool:
+    mode = "process"
+
+    def __init__(self):
+        self.shut_down = False
+
+    def shutdown(self, cancel_pending=True):
+        self.shut_down = True
+
+
+class FakeShadowScorer:
+    mode = "process"
+    restarts = 0
+
+    def restart(self):
+        self.restarts += 1
+
+
+def test_model_swap_is_scoped_to_its_slot(monkeypatch):
+    cache = PredictionCache()
+    for version in ("current-v1", "candidate-v1"):
+        keys = [cache_key("great video", version)]
+        cache.store(keys, np.array([1]), np.array([0.9]), version)
+    pools = {api.CURRENT: FakePool(), api.CANDIDATE: FakePool()}
+    current_pool = pools[api.CURRENT]
+    shadow = FakeShadowScorer()
+    monkeypatch.setattr(api, "prediction_cache", cache)
+    monkeypatch.setattr(api, "inference_pools", pools)
+    monkeypatch.setattr(api, "shadow_scorer", shadow)
+    monkeypatch.setattr(api, "make_inference_pool", FakePool)
+
+    api.on_model_swap(api.CANDIDATE, ModelBundle(None, None, "candidate-v1", 0.0),
+                      ModelBundle(None, None, "candidate-v2", 0.0))
+
+    assert pools[api.CURRENT] is current_pool and not current_pool.shut_down
+    assert pools[api.CANDIDATE] is not current_pool
+    assert shadow.restarts == 1
+    _, _, missing = cache.lookup([cache_key("great video", "current-v1"),
+                                  cache_key("great video", "candidate-v1")])
+    assert missing == [1]
+
+    api.on_model_swap(api.CURRENT, ModelBundle(None, None, "current-v1", 0.0),
+                      ModelBundle(None, None, "current-v2", 0.0))
+
+    assert current_pool.shut_down
+    assert shadow.restarts == 1
+    assert len(cache) == 0
@@ -0,0 +1,87 @@
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+STUB_APP = '''
+import os
+from fastapi import FastAPI
+
+app = FastAPI()
+
+
+@app.get("/health")
+def health():
+    return {"status": "healthy", "pid": os.getpid()}
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def healthy(url):
+    try:
+        return httpx.get(f"{url}/health", timeout=1).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+# ---------------------------------------------------
+# TEST — PRE-FORK MASTER SERVES AND RESPAWNS A DEAD WORKER
+# ---------------------------------------------------
+@pytest.mark.skipif(os.name != "posix", reason="fork() requis")
+def test_master_respawns_crashed_worker(tmp_path):
+    (tmp_path / "stub_app.py").write_text(STUB_APP)
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path), PROJECT_ROOT]))
+    master = subprocess.Popen(
+        [sys.executable, "-m", "src.api.serve", "stub_app:app", "--workers", "2",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    started = []
+
+    def read_output():
+        for line in master.stdout:
+            match = re.search(r"Worker (\d+) démarré", line)
+            if match:
+                started.append(int(match.group(1)))
+
+    threading.Thread(target=read_output, daemon=True).start()
+    try:
+        assert wait_for(lambda: len(started) == 2 and healthy(url))
+
+        os.kill(started[0], signal.SIGKILL)
+
+        assert wait_for(lambda: len(started) == 3)
+        assert started[2] not in started[:2]
+        assert wait_for(lambda: healthy(url))
+        pids = {httpx.get(f"{url}/health", timeout=1).json()["pid"] for _ in range(20)}
+        assert started[0] not in pids
+    finally:
+        master.send_signal(signal.SIGTERM)
+        returncode = master.wait(timeout=20)
+
+    assert returncode == 0
@@ -0,0 +1,77 @@
+import asyncio
+
+import numpy as np
+
+from src.api.shadow import ShadowScorer
+
+
+def candidate_score(texts):
+    """Candidat factice : positif si "great" apparaît, négatif sinon."""
+    labels = np.array([1 if "great" in t else -1 for t in texts])
+    return labels, np.ones(len(texts)), (0.001, 0.002)
+
+
+# ---------------------------------------------------
+# TEST — AGREEMENT IS RECORDED OFF THE RESPONSE PATH
+# ---------------------------------------------------
+def test_shadow_scorer_records_agreement():
+    results = []
+
+    async def scenario():
+        scorer = ShadowScorer(100, on_result=lambda *args: results.append(args))
+        submitted = scorer.submit(["great video", "bad video", "great"],
+                                  np.array([1, 1, 1]), candidate_score)
+        await scorer.drain()
+        scorer.shutdown()
+        return submitted, scorer.stats()
+
+    submitted, stats = asyncio.run(scenario())
+
+    assert submitted
+    assert stats["completed"] == 1
+    assert stats["agreement_rate"] == round(2 / 3, 4)
+    primary, shadow, timings = results[0]
+    assert shadow.tolist() == [1, -1, 1]
+    assert timings == (0.001, 0.002)
+
+
+# ---------------------------------------------------
+# TEST — SAMPLING AND BOUNDED QUEUE
+# ---------------------------------------------------
+def test_shadow_scorer_samples_and_drops_when_full():
+    async def scenario():
+        unsampled = ShadowScorer(0)
+        saturated = ShadowScorer(100, max_pending=0)
+        submitted = (unsampled.submit(["x"], np.array([1]), candidate_score),
+                     saturated.submit(["x"], np.array([1]), candidate_score))
+        unsampled.shutdown()
+        saturated.shutdown()
+        return submitted, unsampled.stats(), saturated.stats()
+
+    submitted, unsampled, saturated = asyncio.run(scenario())
+
+    assert submitted == (False, False)
+    assert unsampled["sampled"] == 0
+    assert saturated["sampled"] == 1 and saturated["dropped"] == 1
+
+
+# ---------------------------------------------------
+# TEST — PROCESS MODE
+# ---------------------------------------------------
+def test_shadow_scorer_process_mode_and_restart():
+    async def scenario():
+        scorer = ShadowScorer(sample_percent=100, mode="process")
+        scorer.submit(["great video"], np.array([1]), candidate_score)
+        await scorer.drain()
+        # Après un rechargement du candidat, les nouveaux workers sont utilisés
+        scorer.restart()
+        scorer.submit(["bad video"], np.array([-1]), candidate_score)
+        await scorer.drain()
+        scorer.shutdown()
+        return scorer.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["mode"] == "process"
+    assert stats["completed"] == 2
+    assert stats["agreement_rate"] == 1.0
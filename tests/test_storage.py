@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.data.storage import (  # noqa: E402
+    DatasetWriter, iter_dataset, load_dataset, save_dataset, storage_format,
+)
+
+DF = pd.DataFrame({
+    "text": ["great video", "l'été, co-op !", "bof", "😀 emoji"],
+    "label": [1, 0, -1, 1],
+})
+
+
+# ---------------------------------------------------
+# TEST — ROUND TRIP FOR EVERY FORMAT
+# ---------------------------------------------------
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet", "data.arrow"])
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_round_trip_keeps_text_and_int8_labels(tmp_path, name, memory_map):
+    path = str(tmp_path / name)
+    save_dataset(DF, path)
+
+    loaded = load_dataset(path, memory_map=memory_map)
+
+    assert loaded["label"].dtype == "int8"
+    assert loaded["text"].tolist() == DF["text"].tolist()
+    assert loaded["label"].tolist() == DF["label"].tolist()
+
+
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet", "data.arrow"])
+def test_writer_appends_chunks_and_handles_empty_output(tmp_path, name):
+    path = str(tmp_path / name)
+    with DatasetWriter(path) as writer:
+        writer.write(DF.iloc[:2])
+        writer.write(DF.iloc[2:])
+    assert load_dataset(path)["text"].tolist() == DF["text"].tolist()
+
+    empty = str(tmp_path / f"empty_{name}")
+    DatasetWriter(empty).close()
+    assert len(load_dataset(empty)) == 0
+
+
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet", "data.arrow"])
+def test_iter_dataset_yields_bounded_batches(tmp_path, name):
+    path = str(tmp_path / name)
+    save_dataset(DF, path)
+
+    batches = list(iter_dataset(path, batch_size=3))
+
+    assert [len(b) for b in batches] == [3, 1]
+    assert pd.concat(batches)["text"].tolist() == DF["text"].tolist()
+    assert all(b["label"].dtype == "int8" for b in batches)
+
+
+def test_unknown_extension_is_rejected():
+    with pytest.raises(ValueError):
+        storage_format("data.json")
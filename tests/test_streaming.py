@@ -0,0 +1,114 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import src.api.main as api
+from src.api.registry import ModelBundle
+
+
+class KeywordVectorizer:
+    """Features : présence de "great", de "bad", biais."""
+
+    def transform(self, texts):
+        return np.array([["great" in t, "bad" in t, 1.0] for t in texts], dtype=np.float64)
+
+
+class KeywordModel:
+    """great → positif, bad → négatif, sinon neutre (compatible predict_with_confidence)."""
+
+    classes_ = np.array([-1, 0, 1])
+    multi_class = "multinomial"
+    coef_ = np.array([[0.0, 3.0, 0.0], [0.0, 0.0, 1.0], [3.0, 0.0, 0.0]])
+    intercept_ = np.zeros(3)
+
+    def decision_function(self, X):
+        return np.asarray(X) @ self.coef_.T + self.intercept_
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api.registry, "current",
+                        ModelBundle(KeywordModel(), KeywordVectorizer(), "test", 0.0))
+    monkeypatch.setattr(api, "prediction_cache", None)
+    monkeypatch.setattr(api, "inference_pools", {})
+    # Pas de `with` : pas d'événement startup, le modèle factice reste en place
+    return TestClient(api.app)
+
+
+def post_stream(client, lines):
+    body = "".join(line + "\n" for line in lines)
+    response = client.post("/predict_stream", content=body,
+                           headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+# ---------------------------------------------------
+# TEST — BOTH LINE FORMS, SUMMARY STATISTICS
+# ---------------------------------------------------
+def test_stream_accepts_strings_and_objects(client):
+    records = post_stream(client, [
+        json.dumps("great video"),
+        json.dumps({"text": "bad video"}),
+        json.dumps({"text": "posted today"}),
+    ])
+
+    predictions = [r for r in records if r["type"] == "prediction"]
+    assert [(p["index"], p["sentiment"]) for p in predictions] == [
+        (0, "positive"), (1, "negative"), (2, "neutral")]
+    assert predictions[1]["text"] == "bad video"
+
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert summary["invalid_lines"] == 0
+    assert summary["statistics"]["total_comments"] == 3
+    assert summary["statistics"]["sentiment_counts"] == {"positive": 1, "neutral": 1, "negative": 1}
+
+
+# ---------------------------------------------------
+# TEST — CHUNKS OF STREAM_CHUNK_SIZE
+# ---------------------------------------------------
+@pytest.mark.parametrize("n_lines, expected_calls", [(3, [3]), (4, [3, 1]), (6, [3, 3])])
+def test_stream_scores_by_chunk(client, monkeypatch, n_lines, expected_calls):
+    calls = []
+    run_inference = api.run_inference_async
+
+    async def recording_inference(texts, *args, **kwargs):
+        calls.append(len(texts))
+        return await run_inference(texts, *args, **kwargs)
+
+    monkeypatch.setattr(api, "STREAM_CHUNK_SIZE", 3)
+    monkeypatch.setattr(api, "run_inference_async", recording_inference)
+
+    records = post_stream(client, [json.dumps(f"great {i}") for i in range(n_lines)])
+
+    assert calls == expected_calls
+    assert [r["index"] for r in records if r["type"] == "prediction"] == list(range(n_lines))
+    assert records[-1]["statistics"]["total_comments"] == n_lines
+
+
+# ---------------------------------------------------
+# TEST — INVALID AND OVERSIZED LINES
+# ---------------------------------------------------
+def test_stream_reports_invalid_and_oversized_lines(client, monkeypatch):
+    monkeypatch.setattr(api, "STREAM_MAX_LINE_BYTES", 32)
+
+    records = post_stream(client, [
+        json.dumps("great video"),
+        "{not json",
+        json.dumps({"other": 1}),
+        json.dumps("bad " * 20),
+        "",
+        json.dumps({"text": "bad video"}),
+    ])
+
+    errors = [r for r in records if r["type"] == "error"]
+    assert [e["index"] for e in errors] == [1, 2, 3]
+    assert "32 octets" in errors[2]["detail"]
+    assert [r["index"] for r in records if r["type"] == "prediction"] == [0, 5]
+
+    summary = records[-1]
+    assert summary["invalid_lines"] == 3
+    assert summary["statistics"]["total_comments"] == 2
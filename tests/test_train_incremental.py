@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.api.inference import predict_texts  # noqa: E402
+from src.data.storage import save_dataset  # noqa: E402
+from src.models.train_incremental import train_incremental  # noqa: E402
+
+TEXTS = ["great video love it", "amazing content best channel",
+         "bad video hate it", "terrible content worst channel",
+         "video posted today", "watch the channel"]
+LABELS = [1, 1, -1, -1, 0, 0]
+
+
+# ---------------------------------------------------
+# TEST — PARTIAL_FIT TRAINING, CHECKPOINT AND RESUME
+# ---------------------------------------------------
+def test_train_then_resume_from_checkpoint(tmp_path):
+    data = str(tmp_path / "data.parquet")
+    save_dataset(pd.DataFrame({
+        "text": [f"{t} {i}" for i in range(20) for t in TEXTS],
+        "label": LABELS * 20,
+    }), data)
+    checkpoint = str(tmp_path / "checkpoint.joblib")
+
+    state = train_incremental(data, checkpoint, batch_size=16, epochs=2,
+                              test_percent=0, n_features_bits=12, checkpoint_every=2)
+    assert state["rows_seen"] == 240
+    assert os.path.exists(checkpoint)
+
+    resumed = train_incremental(data, checkpoint, resume=True, batch_size=64,
+                                test_percent=0)
+    assert resumed["rows_seen"] == 360
+    assert resumed["vectorizer"].n_features == 2 ** 12
+
+    labels, confidences = predict_texts(resumed["model"], resumed["vectorizer"],
+                                        ["love this video", "worst channel ever"])
+    np.testing.assert_array_equal(labels, [1, -1])
+    assert np.all((confidences > 1 / 3) & (confidences <= 1))
@@ -0,0 +1,64 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+import src.models.train_model as train_model
+from src.api.inference import predict_texts
+from src.models.export_model import export_compact_model
+
+TEXTS = [
+    "great video love it", "amazing content best channel", "nice work awesome",
+    "bad video hate it", "terrible content worst channel", "boring and awful",
+    "video posted today", "watch the channel", "okay the video",
+] * 10
+LABELS = [1, 1, 1, -1, -1, -1, 0, 0, 0] * 10
+SMALL_GRID = {'C': [1.0, 10.0], 'solver': ['liblinear'], 'max_iter': [200]}
+
+
+# ---------------------------------------------------
+# TEST — HASHING TRAINING PREDICTS AND UNPUBLISHES THE COMPACT EXPORT
+# ---------------------------------------------------
+def test_main_with_hashing_removes_stale_compact_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_dir = str(tmp_path / "models")
+    compact_dir = os.path.join(output_dir, "compact")
+
+    # Export compact d'un entraînement TF-IDF précédent
+    vectorizer = TfidfVectorizer()
+    stale = LogisticRegression().fit(vectorizer.fit_transform(TEXTS), LABELS)
+    export_compact_model(stale, vectorizer, output_dir=compact_dir)
+
+    monkeypatch.setattr(train_model, "load_data",
+                        lambda *args, **kwargs: pd.DataFrame({"text": TEXTS, "label": LABELS}))
+    monkeypatch.setattr(train_model, "PARAM_GRID", SMALL_GRID)
+    train_model.main(featurizer="hashing", n_features_bits=10, output_dir=output_dir)
+
+    assert not os.path.lexists(compact_dir)
+    model = joblib.load(os.path.join(output_dir, "sentiment_model.joblib"))
+    vectorizer = joblib.load(os.path.join(output_dir, "vectorizer.joblib"))
+    labels, confidences = predict_texts(model, vectorizer, ["great video", "worst channel"])
+    assert labels.tolist() == [1, -1]
+    assert np.all((confidences > 0) & (confidences <= 1))
+
+
+# ---------------------------------------------------
+# TEST — SUCCESSIVE HALVING RETURNS A FITTED BEST ESTIMATOR
+# ---------------------------------------------------
+def test_halving_search_returns_fitted_best_estimator(monkeypatch):
+    monkeypatch.setattr(train_model, "PARAM_GRID",
+                        {'C': [0.1, 1.0, 10.0], 'solver': ['liblinear'], 'max_iter': [200]})
+    X = TfidfVectorizer().fit_transform(TEXTS)
+
+    searcher, report = train_model.search_hyperparameters(X, np.array(LABELS), search='halving',
+                                                          cv=3, n_jobs=1, verbose=0)
+
+    assert report['search'] == 'halving'
+    assert report['best_params']['C'] in (0.1, 1.0, 10.0)
+    assert searcher.n_iterations_ >= 2
+    best = searcher.best_estimator_
+    assert best.C == report['best_params']['C']
+    assert best.predict(X[:3]).tolist() == [1, 1, 1]